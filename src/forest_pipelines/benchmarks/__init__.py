@@ -0,0 +1,2 @@
+# src/forest_pipelines/benchmarks/__init__.py
+# Synthetic inputs and stage benchmarks for the report pipeline (python -m forest_pipelines.benchmarks).
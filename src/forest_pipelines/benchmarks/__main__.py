@@ -0,0 +1,102 @@
+"""python -m forest_pipelines.benchmarks - mede o build do report BDQueimadas com dados sintéticos."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from forest_pipelines.benchmarks.report_build import (
+    DEFAULT_MAX_REGRESSION,
+    compare_to_baseline,
+    format_stage_table,
+    run_report_build_benchmark,
+)
+from forest_pipelines.benchmarks.synthetic_focos import SyntheticFocosSpec
+from forest_pipelines.reports.builders.bdqueimadas_incremental import (
+    DEFAULT_FOCOS_CHUNK_ROWS,
+    FOCOS_CSV_ENCODINGS,
+    FOCOS_CSV_ENGINES,
+)
+from forest_pipelines.utils.json_codec import read_json, write_json
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    defaults = SyntheticFocosSpec()
+    parser = argparse.ArgumentParser(
+        prog="python -m forest_pipelines.benchmarks",
+        description="Gera focos sintéticos e mede tempo/memória por estágio do report bdqueimadas_overview.",
+    )
+    parser.add_argument("--rows-per-year", type=int, default=defaults.rows_per_year, help="Linhas por ZIP anual.")
+    parser.add_argument("--years", type=int, default=defaults.years, help="Quantidade de ZIPs anuais.")
+    parser.add_argument(
+        "--mensal-rows", type=int, default=defaults.mensal_rows_per_month, help="Linhas por CSV mensal."
+    )
+    parser.add_argument("--mensal-months", type=int, default=None, help="CSVs mensais (padrão: meses fechados).")
+    parser.add_argument("--satellites", type=int, default=defaults.satellites, help="Satélites nos CSVs mensais.")
+    parser.add_argument("--encoding", choices=FOCOS_CSV_ENCODINGS, default=defaults.encoding)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--engine", choices=FOCOS_CSV_ENGINES, default=None, help="Padrão: FP_FOCOS_CSV_ENGINE.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_FOCOS_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1, help="Processos do build incremental.")
+    parser.add_argument("--no-trace-memory", action="store_true", help="Desliga o tracemalloc (tempos mais fiéis).")
+    parser.add_argument("--config-path", default="configs/app.yml")
+    parser.add_argument("--work-dir", type=Path, default=None, help="Padrão: diretório temporário descartado.")
+    parser.add_argument("--out", type=Path, default=None, help="Grava o resultado em JSON.")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de uma execução anterior.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help="Fração de piora tolerada por estágio contra --baseline (padrão: 0.25).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    spec = SyntheticFocosSpec(
+        rows_per_year=args.rows_per_year,
+        years=args.years,
+        mensal_rows_per_month=args.mensal_rows,
+        satellites=args.satellites,
+        encoding=args.encoding,
+        seed=args.seed,
+        mensal_months=args.mensal_months,
+    )
+    kwargs = {
+        "config_path": args.config_path,
+        "engine": args.engine,
+        "chunk_rows": args.chunk_rows,
+        "build_workers": args.workers,
+        "trace_memory": not args.no_trace_memory,
+    }
+    if args.work_dir is not None:
+        result = run_report_build_benchmark(args.work_dir, spec, **kwargs)
+    else:
+        with tempfile.TemporaryDirectory(prefix="fp-bench-") as tmp:
+            result = run_report_build_benchmark(Path(tmp), spec, **kwargs)
+
+    inputs = result["inputs"]
+    print(
+        f"Entradas: {inputs['annual_files']} ZIP(s) anuais ({inputs['annual_rows']} linhas), "
+        f"{inputs['mensal_files']} CSV(s) mensais ({inputs['mensal_rows']} linhas), "
+        f"engine={result['engine']}"
+    )
+    print(format_stage_table(result))
+    if args.out is not None:
+        write_json(args.out, result, pretty=True)
+        print(f"Resultado: {args.out}")
+
+    if args.baseline is not None:
+        regressions = compare_to_baseline(result, read_json(args.baseline), max_regression=args.max_regression)
+        if regressions:
+            print("Regressões acima do limite:", *regressions, sep="\n  ", file=sys.stderr)
+            return 1
+        print(f"Sem regressões acima de {args.max_regression:.0%} contra {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,289 @@
+# src/forest_pipelines/benchmarks/report_build.py
+"""Stage benchmark of the BDQueimadas overview report on synthetic data.
+
+Stages, each timed on its own (with the previous stage's output held in memory):
+
+- ``read``: projected CSV chunks of every ZIP/monthly CSV (satellite filter included)
+- ``normalize``: datetime parsing and label normalization of those chunks
+- ``aggregate``: folding the chunks into ``FocosCounts`` and year payloads
+- ``consolidate``: ``consolidate_year_payloads`` over the annual payloads
+- ``assemble``: ``build_package`` with warm caches (LLM off, no downloads)
+- ``serialize``: JSON encoding of every document ``publish_report_package`` writes
+
+``end_to_end`` is a cold ``build_package`` (empty storage), run before ``assemble``.
+Peak memory is the tracemalloc peak of the stage (Python, numpy and pandas
+allocations; Arrow's own pool is reported separately) and slows the stages
+down, so compare runs with the same ``trace_memory`` setting.
+"""
+from __future__ import annotations
+
+import dataclasses
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import pyarrow as pa
+
+try:  # pragma: no cover - depende da plataforma
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+from forest_pipelines.benchmarks.synthetic_focos import SyntheticFocosSpec, write_synthetic_focos
+from forest_pipelines.reports.builders.bdqueimadas_incremental import (
+    COUNT_CUBE_KEY,
+    DEFAULT_FOCOS_CHUNK_ROWS,
+    INPE_REFERENCE_SATELLITE,
+    FocosCounts,
+    consolidate_year_payloads,
+    resolve_focos_csv_engine,
+    year_payload_from_counts,
+    _datetime_dayfirst_for_column,
+    _extract_year_from_name,
+    _focos_csv_layout,
+    _normalize_raw_focos_frame,
+    _raw_focos_frames,
+    _sniff_focos_encoding,
+)
+from forest_pipelines.reports.builders.bdqueimadas_overview import (
+    DEFAULT_BIOME_CANDIDATES,
+    DEFAULT_DATETIME_CANDIDATES,
+    DEFAULT_SATELLITE_CANDIDATES,
+    DEFAULT_STATE_CANDIDATES,
+    build_package,
+    _merge_candidates,
+)
+from forest_pipelines.reports.definitions.base import load_report_cfg
+from forest_pipelines.settings import load_settings
+from forest_pipelines.storage.json_publish import json_dumps_bytes
+from forest_pipelines.storage.local_storage import LocalStorage
+
+REPORT_ID = "bdqueimadas_overview"
+BENCHMARK_STAGES: tuple[str, ...] = ("read", "normalize", "aggregate", "consolidate", "assemble", "serialize")
+#estágios mais rápidos que isso ficam fora da checagem de regressão (ruído de medição)
+DEFAULT_MIN_COMPARABLE_SECONDS = 0.05
+DEFAULT_MAX_REGRESSION = 0.25
+
+
+def _max_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #ru_maxrss vem em KiB no Linux e em bytes no macOS
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+@contextmanager
+def _measure(results: dict[str, Any], name: str, *, trace_memory: bool) -> Iterator[dict[str, Any]]:
+    detail: dict[str, Any] = {}
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield detail
+    finally:
+        seconds = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "peak_traced_bytes": peak,
+            "max_rss_bytes": _max_rss_bytes(),
+            "arrow_allocated_bytes": pa.total_allocated_bytes(),
+            **detail,
+        }
+
+
+def _benchmark_settings(config_path: str, work_dir: Path) -> Any:
+    settings = load_settings(config_path)
+    return dataclasses.replace(
+        settings,
+        data_dir=work_dir / "data",
+        storage_backend="local",
+        local_storage_dir=work_dir / "storage",
+    )
+
+
+def run_report_build_benchmark(
+    work_dir: Path,
+    spec: SyntheticFocosSpec,
+    *,
+    config_path: str = "configs/app.yml",
+    engine: str | None = None,
+    chunk_rows: int = DEFAULT_FOCOS_CHUNK_ROWS,
+    build_workers: int | None = 1,
+    trace_memory: bool = True,
+    logger: Any = None,
+) -> dict[str, Any]:
+    """Generate synthetic inputs under ``work_dir`` and time every stage of the report build."""
+    logger = logger or logging.getLogger("forest_pipelines.benchmarks")
+    work_dir = Path(work_dir)
+    settings = _benchmark_settings(config_path, work_dir)
+    cfg = load_report_cfg(settings.reports_dir, REPORT_ID)
+    engine = resolve_focos_csv_engine(engine)
+    datetime_candidates = _merge_candidates(cfg.columns.datetime_candidates, DEFAULT_DATETIME_CANDIDATES)
+    state_candidates = _merge_candidates(cfg.columns.state_candidates, DEFAULT_STATE_CANDIDATES)
+    biome_candidates = _merge_candidates(cfg.columns.biome_candidates, DEFAULT_BIOME_CANDIDATES)
+
+    started = time.perf_counter()
+    inputs = write_synthetic_focos(settings.data_dir / cfg.dataset.local_relative_dir, spec)
+    generate_seconds = time.perf_counter() - started
+
+    sources: list[tuple[Path, Any]] = []
+    for path in [*inputs["zip_files"], *inputs["mensal_files"]]:
+        is_mensal = path.suffix.lower() == ".csv"
+        layout = _focos_csv_layout(
+            path,
+            datetime_candidates,
+            state_candidates,
+            biome_candidates,
+            satellite_candidates=DEFAULT_SATELLITE_CANDIDATES if is_mensal else None,
+            reference_satellite=INPE_REFERENCE_SATELLITE if is_mensal else None,
+        )
+        sources.append((path, layout))
+
+    stages: dict[str, Any] = {}
+    with _measure(stages, "read", trace_memory=trace_memory) as detail:
+        raw = {
+            path: list(
+                _raw_focos_frames(
+                    layout,
+                    engine=engine,
+                    encoding=_sniff_focos_encoding(layout),
+                    reference_satellite=INPE_REFERENCE_SATELLITE if layout.satellite_column else None,
+                    chunk_rows=chunk_rows,
+                )
+            )
+            for path, layout in sources
+        }
+        detail["rows"] = sum(len(frame) for frames in raw.values() for frame in frames)
+
+    with _measure(stages, "normalize", trace_memory=trace_memory) as detail:
+        normalized = {
+            path: [
+                _normalize_raw_focos_frame(
+                    frame,
+                    layout,
+                    dayfirst=_datetime_dayfirst_for_column(layout.columns["datetime"]),
+                )
+                for frame in raw.pop(path)
+            ]
+            for path, layout in sources
+        }
+        detail["rows"] = sum(len(frame) for frames in normalized.values() for frame in frames)
+
+    with _measure(stages, "aggregate", trace_memory=trace_memory) as detail:
+        year_payloads: list[dict[str, Any]] = []
+        for path, layout in sources:
+            counts = FocosCounts()
+            for frame in normalized.pop(path):
+                counts.add(frame)
+            if path.suffix.lower() != ".zip":
+                continue
+            payload = year_payload_from_counts(
+                counts,
+                detected_columns=layout.columns,
+                file_name=path.name,
+                file_size_bytes=int(path.stat().st_size),
+                inferred_year=_extract_year_from_name(path.name),
+            )
+            payload[COUNT_CUBE_KEY] = counts
+            year_payloads.append(payload)
+        detail["files"] = len(sources)
+
+    with _measure(stages, "consolidate", trace_memory=trace_memory) as detail:
+        consolidated = consolidate_year_payloads(year_payloads)
+        detail["rows"] = int(consolidated["total_rows_processed"])
+    del year_payloads, consolidated
+
+    storage = LocalStorage(root=settings.local_storage_dir / settings.supabase_bucket_open_data, logger=logger)
+    build_kwargs = {
+        "settings": settings,
+        "storage": storage,
+        "logger": logger,
+        "skip_llm": True,
+        "skip_mensal_download": True,
+        "reference_month_mode": "previous",
+        "build_workers": build_workers,
+    }
+    with _measure(stages, "end_to_end", trace_memory=trace_memory) as detail:
+        build_package(**build_kwargs)
+    with _measure(stages, "assemble", trace_memory=trace_memory) as detail:
+        package = build_package(**build_kwargs)
+        detail["cache"] = package["meta"]["cache"]
+
+    with _measure(stages, "serialize", trace_memory=trace_memory) as detail:
+        documents = [
+            package["generated_report"],
+            package["live_report"],
+            *(item["payload"] for item in package.get("auxiliary_json") or []),
+        ]
+        detail["bytes"] = sum(len(json_dumps_bytes(document)) for document in documents)
+        detail["documents"] = len(documents)
+
+    return {
+        "spec": dataclasses.asdict(spec),
+        "engine": engine,
+        "chunk_rows": chunk_rows,
+        "build_workers": build_workers,
+        "trace_memory": trace_memory,
+        "inputs": {
+            "annual_files": len(inputs["zip_files"]),
+            "mensal_files": len(inputs["mensal_files"]),
+            "annual_rows": inputs["annual_rows"],
+            "mensal_rows": inputs["mensal_rows"],
+            "mensal_reference_rows": inputs["mensal_reference_rows"],
+            "bytes_on_disk": inputs["bytes_on_disk"],
+            "generate_seconds": round(generate_seconds, 4),
+        },
+        "stages": {name: stages[name] for name in (*BENCHMARK_STAGES, "end_to_end")},
+    }
+
+
+def compare_to_baseline(
+    result: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    max_regression: float = DEFAULT_MAX_REGRESSION,
+    min_seconds: float = DEFAULT_MIN_COMPARABLE_SECONDS,
+) -> list[str]:
+    """Stages slower than ``baseline`` by more than ``max_regression`` (fraction), as messages."""
+    regressions: list[str] = []
+    for name, stage in (result.get("stages") or {}).items():
+        previous = (baseline.get("stages") or {}).get(name)
+        if not isinstance(previous, dict) or previous.get("seconds") is None:
+            continue
+        before, now = float(previous["seconds"]), float(stage["seconds"])
+        if max(before, now) < min_seconds:
+            continue
+        if now > before * (1 + max_regression):
+            regressions.append(f"{name}: {before:.3f}s -> {now:.3f}s")
+    return regressions
+
+
+def format_stage_table(result: dict[str, Any]) -> str:
+    lines = [f"{'estágio':<12} {'tempo (s)':>10} {'pico traced (MiB)':>18} {'max RSS (MiB)':>14}"]
+    for name, stage in result["stages"].items():
+        peak, rss = stage.get("peak_traced_bytes"), stage.get("max_rss_bytes")
+        peak_label = f"{peak / 2**20:.1f}" if peak is not None else "-"
+        rss_label = f"{rss / 2**20:.1f}" if rss is not None else "-"
+        lines.append(f"{name:<12} {stage['seconds']:>10.3f} {peak_label:>18} {rss_label:>14}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BENCHMARK_STAGES",
+    "DEFAULT_MAX_REGRESSION",
+    "DEFAULT_MIN_COMPARABLE_SECONDS",
+    "compare_to_baseline",
+    "format_stage_table",
+    "run_report_build_benchmark",
+]
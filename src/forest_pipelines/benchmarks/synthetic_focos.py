@@ -0,0 +1,217 @@
+# src/forest_pipelines/benchmarks/synthetic_focos.py
+"""Synthetic BDQueimadas inputs shaped like the INPE dumps.
+
+Writes ``focos_br_ref_YYYY.zip`` (annual, reference satellite only, column
+``data_pas``) and ``focos_mensal_br_YYYYMM.csv`` (monthly, every satellite,
+column ``data_hora_gmt``) with accented state/biome labels, so a report build
+can be measured without downloading real data. Output is deterministic for a
+given spec.
+"""
+from __future__ import annotations
+
+import io
+import zipfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from forest_pipelines.reports.builders.bdqueimadas_incremental import (
+    FOCOS_CSV_ENCODINGS,
+    INPE_REFERENCE_SATELLITE,
+)
+
+SYNTHETIC_STATES: tuple[str, ...] = (
+    "ACRE", "ALAGOAS", "AMAPÁ", "AMAZONAS", "BAHIA", "CEARÁ", "DISTRITO FEDERAL",
+    "ESPÍRITO SANTO", "GOIÁS", "MARANHÃO", "MATO GROSSO", "MATO GROSSO DO SUL",
+    "MINAS GERAIS", "PARÁ", "PARAÍBA", "PARANÁ", "PERNAMBUCO", "PIAUÍ",
+    "RIO DE JANEIRO", "RIO GRANDE DO NORTE", "RIO GRANDE DO SUL", "RONDÔNIA",
+    "RORAIMA", "SANTA CATARINA", "SÃO PAULO", "SERGIPE", "TOCANTINS",
+)  # fmt: skip
+SYNTHETIC_BIOMES: tuple[str, ...] = ("Amazônia", "Cerrado", "Caatinga", "Mata Atlântica", "Pantanal", "Pampa")
+#o satélite de referência vem sempre primeiro; os demais só aparecem nos CSVs mensais
+SYNTHETIC_SATELLITES: tuple[str, ...] = (
+    INPE_REFERENCE_SATELLITE, "NOAA-20", "NPP-375", "GOES-16", "TERRA_M-T", "NOAA-21", "METOP-C", "MSG-03",
+)
+
+_ANNUAL_COLUMNS = ["foco_id", "lat", "lon", "data_pas", "pais", "estado", "municipio", "bioma"]
+_MENSAL_COLUMNS = [
+    "id", "lat", "lon", "data_hora_gmt", "satelite", "municipio", "estado", "pais",
+    "numero_dias_sem_chuva", "precipitacao", "risco_fogo", "bioma", "frp",
+]  # fmt: skip
+
+
+@dataclass(frozen=True)
+class SyntheticFocosSpec:
+    """Scale of the synthetic dataset.
+
+    ``end_year`` is the last annual ZIP (default: previous calendar year) and
+    ``mensal_months`` the monthly CSVs of ``end_year + 1`` (default: months
+    already closed today), matching what the report expects mid-year.
+    """
+
+    rows_per_year: int = 200_000
+    years: int = 3
+    mensal_rows_per_month: int = 20_000
+    satellites: int = 4
+    encoding: str = "utf-8"
+    seed: int = 0
+    end_year: int | None = None
+    mensal_months: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.encoding not in FOCOS_CSV_ENCODINGS:
+            raise ValueError(f"Encoding inválido: {self.encoding!r}. Use um de {FOCOS_CSV_ENCODINGS}.")
+        if not 1 <= self.satellites <= len(SYNTHETIC_SATELLITES):
+            raise ValueError(f"satellites deve estar entre 1 e {len(SYNTHETIC_SATELLITES)}.")
+        if self.years < 1:
+            raise ValueError("years deve ser >= 1.")
+
+    def resolved_end_year(self) -> int:
+        return self.end_year if self.end_year is not None else date.today().year - 1
+
+    def resolved_mensal_months(self) -> int:
+        if self.mensal_months is not None:
+            return max(0, min(12, self.mensal_months))
+        return date.today().month - 1 if self.end_year is None else 12
+
+
+def _random_focos(
+    rng: np.random.Generator,
+    rows: int,
+    start: np.datetime64,
+    end: np.datetime64,
+) -> dict[str, np.ndarray]:
+    #estados e biomas com pesos desiguais, como na base real (poucos estados concentram os focos)
+    state_weights = rng.pareto(1.5, len(SYNTHETIC_STATES)) + 0.05
+    biome_weights = np.array([0.45, 0.30, 0.12, 0.08, 0.04, 0.01])
+    seconds = int((end - start) / np.timedelta64(1, "s"))
+    stamps = start + rng.integers(0, seconds, rows).astype("timedelta64[s]")
+    return {
+        "stamp": np.char.replace(np.datetime_as_string(stamps, unit="s"), "T", " "),
+        "state": np.asarray(SYNTHETIC_STATES, dtype=object)[
+            rng.choice(len(SYNTHETIC_STATES), rows, p=state_weights / state_weights.sum())
+        ],
+        "biome": np.asarray(SYNTHETIC_BIOMES, dtype=object)[rng.choice(len(SYNTHETIC_BIOMES), rows, p=biome_weights)],
+        "lat": np.round(rng.uniform(-33.7, 5.2, rows), 5),
+        "lon": np.round(rng.uniform(-73.9, -34.8, rows), 5),
+    }
+
+
+def _csv_bytes(frame: pd.DataFrame, encoding: str) -> bytes:
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False)
+    return buffer.getvalue().encode(encoding)
+
+
+def write_annual_zip(path: Path, year: int, rows: int, *, rng: np.random.Generator, encoding: str) -> int:
+    focos = _random_focos(rng, rows, np.datetime64(f"{year}-01-01"), np.datetime64(f"{year + 1}-01-01"))
+    frame = pd.DataFrame(
+        {
+            "foco_id": np.arange(rows),
+            "lat": focos["lat"],
+            "lon": focos["lon"],
+            "data_pas": focos["stamp"],
+            "pais": "Brasil",
+            "estado": focos["state"],
+            "municipio": "MUNICÍPIO SINTÉTICO",
+            "bioma": focos["biome"],
+        },
+        columns=_ANNUAL_COLUMNS,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{path.stem}.csv", _csv_bytes(frame, encoding))
+    return rows
+
+
+def write_mensal_csv(
+    path: Path,
+    year: int,
+    month: int,
+    rows: int,
+    *,
+    rng: np.random.Generator,
+    encoding: str,
+    satellites: int,
+) -> int:
+    """Monthly CSV; returns how many rows belong to the reference satellite."""
+    start = np.datetime64(f"{year}-{month:02d}-01")
+    end = np.datetime64(f"{year + month // 12}-{month % 12 + 1:02d}-01")
+    focos = _random_focos(rng, rows, start, end)
+    #metade das linhas no satélite de referência, o resto dividido entre os demais
+    sat_weights = np.array([1.0] + [1.0 / max(1, satellites - 1)] * (satellites - 1))
+    sat_codes = rng.choice(satellites, rows, p=sat_weights / sat_weights.sum())
+    frame = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "lat": focos["lat"],
+            "lon": focos["lon"],
+            "data_hora_gmt": focos["stamp"],
+            "satelite": np.asarray(SYNTHETIC_SATELLITES[:satellites], dtype=object)[sat_codes],
+            "municipio": "MUNICÍPIO SINTÉTICO",
+            "estado": focos["state"],
+            "pais": "Brasil",
+            "numero_dias_sem_chuva": rng.integers(0, 60, rows),
+            "precipitacao": np.round(rng.exponential(2.0, rows), 1),
+            "risco_fogo": np.round(rng.uniform(0, 1, rows), 2),
+            "bioma": focos["biome"],
+            "frp": np.round(rng.gamma(2.0, 15.0, rows), 1),
+        },
+        columns=_MENSAL_COLUMNS,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_csv_bytes(frame, encoding))
+    return int((sat_codes == 0).sum())
+
+
+def write_synthetic_focos(base_dir: Path, spec: SyntheticFocosSpec) -> dict[str, Any]:
+    """Write the annual ZIPs under ``base_dir`` and the monthly CSVs under ``base_dir/mensal``."""
+    rng = np.random.default_rng(spec.seed)
+    end_year = spec.resolved_end_year()
+    zip_files: list[Path] = []
+    mensal_files: list[Path] = []
+    annual_rows = 0
+    mensal_reference_rows = 0
+
+    for year in range(end_year - spec.years + 1, end_year + 1):
+        path = Path(base_dir) / f"focos_br_ref_{year}.zip"
+        annual_rows += write_annual_zip(path, year, spec.rows_per_year, rng=rng, encoding=spec.encoding)
+        zip_files.append(path)
+
+    mensal_year = end_year + 1
+    for month in range(1, spec.resolved_mensal_months() + 1):
+        path = Path(base_dir) / "mensal" / f"focos_mensal_br_{mensal_year}{month:02d}.csv"
+        mensal_reference_rows += write_mensal_csv(
+            path,
+            mensal_year,
+            month,
+            spec.mensal_rows_per_month,
+            rng=rng,
+            encoding=spec.encoding,
+            satellites=spec.satellites,
+        )
+        mensal_files.append(path)
+
+    return {
+        "zip_files": zip_files,
+        "mensal_files": mensal_files,
+        "annual_rows": annual_rows,
+        "mensal_rows": spec.mensal_rows_per_month * len(mensal_files),
+        "mensal_reference_rows": mensal_reference_rows,
+        "bytes_on_disk": sum(p.stat().st_size for p in [*zip_files, *mensal_files]),
+    }
+
+
+__all__ = [
+    "SYNTHETIC_BIOMES",
+    "SYNTHETIC_SATELLITES",
+    "SYNTHETIC_STATES",
+    "SyntheticFocosSpec",
+    "write_annual_zip",
+    "write_mensal_csv",
+    "write_synthetic_focos",
+]
@@ -5,22 +5,46 @@ The portal fetches two catalog envelopes from Supabase Storage:
 - catalog/open_data_catalog.json - all visible open-data datasets from the base YAML
 - catalog/reports_catalog.json - all visible reports
 
+plus catalog/open_data_cards.json and catalog/open_data_search_index.json,
+derived from the first one (see catalog.search_index) so the portal can load a
+small index first and fetch full entries lazily.
+
+All of them are also written under catalog/versions/<id>/ and referenced by the
+small catalog/current.json pointer, which is uploaded last so readers that
+follow it always get a consistent set.
+
 This module is the sole producer of those files.
 """
 from __future__ import annotations
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Iterable
 
 import yaml
 
+from forest_pipelines.catalog.build_cache import CatalogBuildCache, fingerprint
+from forest_pipelines.catalog.search_index import build_card_envelope, build_search_index
+from forest_pipelines.storage.batch import upload_jobs
+from forest_pipelines.storage.json_publish import json_upload_jobs
+from forest_pipelines.storage.staged_publish import (
+    DEFAULT_KEEP_VERSIONS,
+    StagedJson,
+    collect_expired_versions,
+    load_pointer,
+    next_version_history,
+    versioned_upload_jobs,
+)
+
 #schema 1.2: adds compact bilingual card fields and report card metadata.
 CATALOG_SCHEMA_VERSION = "1.2"
+CATALOG_POINTER_SCHEMA_VERSION = "1.0"
 DEFAULT_CATALOG_BUCKET_PREFIX = "catalog"
 MAX_REPORT_EXCERPT_CHARS = 260
+DEFAULT_CATALOG_FETCH_WORKERS = 16
 
 ManifestLoader = Callable[[str], dict[str, Any] | None]
 
@@ -29,10 +53,6 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _to_bytes(payload: dict[str, Any]) -> bytes:
-    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
-
-
 def _load_yaml(path: Path) -> dict[str, Any]:
     if not path.is_file():
         raise FileNotFoundError(f"Catalog config not found: {path}")
@@ -60,6 +80,47 @@ def _parse_iso_or_none(value: str | None) -> str | None:
         return None
 
 
+def prefetch_loader(
+    loader: ManifestLoader,
+    paths: Iterable[Any],
+    *,
+    max_workers: int = DEFAULT_CATALOG_FETCH_WORKERS,
+) -> ManifestLoader:
+    """Call ``loader`` for every path on a bounded pool and serve the results from memory.
+
+    Exceptions are kept and re-raised on lookup, so enrichment records the same
+    warnings it would have produced loading serially. Unknown paths fall through
+    to ``loader``.
+    """
+    unique = list(dict.fromkeys(str(p) for p in paths if p))
+    results: dict[str, tuple[bool, Any]] = {}
+
+    def _fetch(path: str) -> tuple[bool, Any]:
+        try:
+            return True, loader(path)
+        except Exception as exc:  # noqa: BLE001
+            return False, exc
+
+    workers = max(1, min(int(max_workers), len(unique) or 1))
+    if workers == 1:
+        for path in unique:
+            results[path] = _fetch(path)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, outcome in zip(unique, pool.map(_fetch, unique)):
+                results[path] = outcome
+
+    def _load(path: str) -> dict[str, Any] | None:
+        if path not in results:
+            return loader(path)
+        ok, value = results[path]
+        if not ok:
+            raise value
+        return value
+
+    return _load
+
+
 def _enrich_with_manifest(
     entry: dict[str, Any],
     manifest_loader: ManifestLoader | None,
@@ -101,6 +162,53 @@ def _enrich_with_manifest(
                 entry["last_release_iso"] = last_release
 
 
+def _manifest_signature(manifest: dict[str, Any]) -> dict[str, Any]:
+    #só os campos que _enrich_with_manifest lê entram na chave do cache
+    meta = manifest.get("meta") if isinstance(manifest.get("meta"), dict) else {}
+    return {"generated_at": manifest.get("generated_at"), "release": meta.get("release")}
+
+
+def _report_signature(report_doc: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: report_doc.get(key)
+        for key in ("generated_at", "coverage", "analysis", "summary")
+    }
+
+
+def _cached_entry(
+    namespace: str,
+    raw: dict[str, Any],
+    *,
+    doc_path: Any,
+    loader: ManifestLoader | None,
+    signature: Callable[[dict[str, Any]], dict[str, Any]],
+    build: Callable[[], dict[str, Any]],
+    build_cache: CatalogBuildCache | None,
+    warnings_bucket: list[str],
+) -> dict[str, Any]:
+    """Reuse the cached entry when the YAML entry and the loaded document are unchanged."""
+    if build_cache is None or loader is None or not doc_path:
+        return build()
+    try:
+        doc = loader(str(doc_path))
+    except Exception:  # noqa: BLE001
+        doc = None
+    if not isinstance(doc, dict):
+        return build()
+
+    entry_id = str(raw.get("id") or doc_path)
+    key = fingerprint(raw, signature(doc))
+    cached = build_cache.get_entry(namespace, entry_id, key)
+    if cached is not None:
+        return cached
+
+    warnings_before = len(warnings_bucket)
+    entry = build()
+    if len(warnings_bucket) == warnings_before:
+        build_cache.put_entry(namespace, entry_id, key, entry)
+    return entry
+
+
 def _dataset_entry_from_base(
     raw: dict[str, Any],
     *,
@@ -172,25 +280,45 @@ def build_open_data_catalog(
     base_config_path: Path,
     warnings_bucket: list[str],
     manifest_loader: ManifestLoader | None = None,
+    max_workers: int = DEFAULT_CATALOG_FETCH_WORKERS,
+    build_cache: CatalogBuildCache | None = None,
 ) -> dict[str, Any]:
     """Assemble the open-data catalog envelope.
 
     manifest_loader is optional. When provided, base entries are enriched with
     generated_at (and last_release_iso when present) so the portal can render
-    the dataset list without N browser fetches.
+    the dataset list without N browser fetches. All manifests are fetched up
+    front on ``max_workers`` threads, then entries are enriched from memory.
+    With ``build_cache``, unchanged entries are reused and an unchanged envelope
+    keeps its previous generated_at (identical bytes, so the upload is skipped).
     """
     base_cfg = _load_yaml(base_config_path)
     base_list = base_cfg.get("datasets") or []
+    if manifest_loader is not None:
+        manifest_loader = prefetch_loader(
+            manifest_loader,
+            (d.get("manifest_path") for d in base_list if isinstance(d, dict)),
+            max_workers=max_workers,
+        )
     datasets: list[dict[str, Any]] = [
-        _dataset_entry_from_base(
+        _cached_entry(
+            "open_data",
             d,
-            manifest_loader=manifest_loader,
+            doc_path=d.get("manifest_path") if isinstance(d, dict) else None,
+            loader=manifest_loader,
+            signature=_manifest_signature,
+            build=lambda d=d: _dataset_entry_from_base(
+                d,
+                manifest_loader=manifest_loader,
+                warnings_bucket=warnings_bucket,
+            ),
+            build_cache=build_cache,
             warnings_bucket=warnings_bucket,
         )
         for d in base_list
     ]
 
-    return {
+    envelope = {
         "schema_version": CATALOG_SCHEMA_VERSION,
         "catalog_id": "open_data_catalog",
         "generated_at": _now_iso(),
@@ -198,6 +326,9 @@ def build_open_data_catalog(
         "warnings": list(warnings_bucket),
         "datasets": datasets,
     }
+    if build_cache is not None:
+        build_cache.stabilize_generated_at("open_data_catalog", envelope)
+    return envelope
 
 
 def _report_entry(raw: dict[str, Any]) -> dict[str, Any]:
@@ -321,14 +452,37 @@ def build_reports_catalog(
     reports_config_path: Path,
     warnings_bucket: list[str],
     report_loader: ManifestLoader | None = None,
+    max_workers: int = DEFAULT_CATALOG_FETCH_WORKERS,
+    build_cache: CatalogBuildCache | None = None,
 ) -> dict[str, Any]:
     cfg = _load_yaml(reports_config_path)
-    entries = []
-    for raw in cfg.get("reports") or []:
+    raw_reports = cfg.get("reports") or []
+    if report_loader is not None:
+        report_loader = prefetch_loader(
+            report_loader,
+            (r.get("stable_report_path") for r in raw_reports if isinstance(r, dict)),
+            max_workers=max_workers,
+        )
+
+    def _build_report(raw: dict[str, Any]) -> dict[str, Any]:
         entry = _report_entry(raw)
         _enrich_report_with_document(entry, report_loader, warnings_bucket)
-        entries.append(entry)
-    return {
+        return entry
+
+    entries = [
+        _cached_entry(
+            "reports",
+            raw,
+            doc_path=raw.get("stable_report_path") if isinstance(raw, dict) else None,
+            loader=report_loader,
+            signature=_report_signature,
+            build=lambda raw=raw: _build_report(raw),
+            build_cache=build_cache,
+            warnings_bucket=warnings_bucket,
+        )
+        for raw in raw_reports
+    ]
+    envelope = {
         "schema_version": CATALOG_SCHEMA_VERSION,
         "catalog_id": "reports_catalog",
         "generated_at": _now_iso(),
@@ -336,6 +490,9 @@ def build_reports_catalog(
         "warnings": list(warnings_bucket),
         "reports": entries,
     }
+    if build_cache is not None:
+        build_cache.stabilize_generated_at("reports_catalog", envelope)
+    return envelope
 
 
 def publish_catalogs(
@@ -345,39 +502,79 @@ def publish_catalogs(
     reports_envelope: dict[str, Any],
     bucket_prefix: str = DEFAULT_CATALOG_BUCKET_PREFIX,
     logger: Any = None,
+    keep_versions: int = DEFAULT_KEEP_VERSIONS,
 ) -> dict[str, Any]:
-    """Upload both catalog envelopes to Supabase Storage under bucket_prefix."""
+    """Upload both catalog envelopes to Supabase Storage under bucket_prefix.
+
+    Alongside them go the card-only envelope and the search index derived from
+    the open-data catalog. Everything goes to the fixed paths and to an immutable
+    versioned prefix in one batch; ``current.json`` is flipped to the new version
+    only after all of it landed.
+    """
     prefix = bucket_prefix.strip().rstrip("/")
-    open_data_path = f"{prefix}/open_data_catalog.json"
-    reports_path = f"{prefix}/reports_catalog.json"
-
-    storage.upload_bytes(
-        object_path=open_data_path,
-        data=_to_bytes(open_data_envelope),
-        content_type="application/json; charset=utf-8",
-        upsert=True,
+    pointer_path = f"{prefix}/current.json"
+    documents: dict[str, tuple[str, dict[str, Any]]] = {
+        "open_data_catalog": ("open_data_catalog.json", open_data_envelope),
+        "reports_catalog": ("reports_catalog.json", reports_envelope),
+        "open_data_cards": ("open_data_cards.json", build_card_envelope(open_data_envelope)),
+        "open_data_search_index": ("open_data_search_index.json", build_search_index(open_data_envelope)),
+    }
+    fixed_paths = {key: f"{prefix}/{filename}" for key, (filename, _) in documents.items()}
+
+    staged, versioned_jobs = versioned_upload_jobs(
+        storage,
+        prefix,
+        [
+            StagedJson(filename, payload, "application/json; charset=utf-8")
+            for filename, payload in documents.values()
+        ],
     )
-    storage.upload_bytes(
-        object_path=reports_path,
-        data=_to_bytes(reports_envelope),
-        content_type="application/json; charset=utf-8",
-        upsert=True,
+    version_history, expired_paths = next_version_history(
+        load_pointer(storage, pointer_path, logger),
+        staged,
+        keep_versions=keep_versions,
     )
 
+    mirror_jobs = [
+        job
+        for key, (_, payload) in documents.items()
+        for job in json_upload_jobs(
+            storage,
+            fixed_paths[key],
+            payload,
+            content_type="application/json; charset=utf-8",
+        )
+    ]
+    upload_jobs(storage, [*versioned_jobs, *mirror_jobs], logger=logger).raise_for_failures()
+
+    versioned_paths = {key: staged.paths[filename] for key, (filename, _) in documents.items()}
+    pointer = {
+        "schema_version": CATALOG_POINTER_SCHEMA_VERSION,
+        "version": staged.version,
+        "paths": versioned_paths,
+        "public_urls": {key: storage.public_url(path) for key, path in versioned_paths.items()},
+        "version_history": version_history,
+    }
+    upload_jobs(
+        storage,
+        json_upload_jobs(storage, pointer_path, pointer, content_type="application/json; charset=utf-8"),
+        logger=logger,
+    ).raise_for_failures()
+    collect_expired_versions(storage, expired_paths, logger)
+
     result = {
         "bucket_prefix": prefix,
-        "paths": {
-            "open_data_catalog": open_data_path,
-            "reports_catalog": reports_path,
-        },
+        "version": staged.version,
+        "paths": {**fixed_paths, "pointer": pointer_path},
         "public_urls": {
-            "open_data_catalog": storage.public_url(open_data_path),
-            "reports_catalog": storage.public_url(reports_path),
+            **{key: storage.public_url(path) for key, path in fixed_paths.items()},
+            "pointer": storage.public_url(pointer_path),
         },
     }
     if logger:
         logger.info("open_data_catalog.json publicado: %s", result["public_urls"]["open_data_catalog"])
         logger.info("reports_catalog.json publicado: %s", result["public_urls"]["reports_catalog"])
+        logger.info("open_data_search_index.json publicado: %s", result["public_urls"]["open_data_search_index"])
     return result
 
 
@@ -394,6 +591,8 @@ def build_catalogs_from_defaults(
     *,
     manifest_loader: ManifestLoader | None = None,
     report_loader: ManifestLoader | None = None,
+    max_workers: int = DEFAULT_CATALOG_FETCH_WORKERS,
+    build_cache: CatalogBuildCache | None = None,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
     """Convenience wrapper: resolve all config paths from project root."""
     open_warnings: list[str] = []
@@ -401,13 +600,19 @@ def build_catalogs_from_defaults(
         base_config_path=_default_base_config_path(root),
         warnings_bucket=open_warnings,
         manifest_loader=manifest_loader,
+        max_workers=max_workers,
+        build_cache=build_cache,
     )
     reports_warnings: list[str] = []
     reports_envelope = build_reports_catalog(
         reports_config_path=_default_reports_config_path(root),
         warnings_bucket=reports_warnings,
         report_loader=report_loader or manifest_loader,
+        max_workers=max_workers,
+        build_cache=build_cache,
     )
+    if build_cache is not None:
+        build_cache.save()
     return open_envelope, reports_envelope
 
 
@@ -418,8 +623,12 @@ def make_storage_manifest_loader(
     """Build a manifest_loader that downloads JSON manifests from Supabase Storage.
 
     Returns None for any path that cannot be retrieved or parsed; the caller
-    appends a warning so the catalog publish keeps moving.
+    appends a warning so the catalog publish keeps moving. Safe to call from
+    several threads (the catalog builders prefetch concurrently).
     """
+    #materializa o client antes do pool: cached_property não é thread-safe
+    getattr(storage, "client", None)
+
     def _load(manifest_path: str) -> dict[str, Any] | None:
         try:
             raw = storage.download_bytes(manifest_path)
@@ -443,13 +652,12 @@ def make_storage_manifest_loader(
 __all__ = [
     "CATALOG_SCHEMA_VERSION",
     "DEFAULT_CATALOG_BUCKET_PREFIX",
+    "DEFAULT_CATALOG_FETCH_WORKERS",
     "ManifestLoader",
     "build_open_data_catalog",
     "build_reports_catalog",
     "build_catalogs_from_defaults",
     "publish_catalogs",
     "make_storage_manifest_loader",
+    "prefetch_loader",
 ]
-
-#iterable is imported for type-checking intent; not used in runtime paths.
-_ = Iterable
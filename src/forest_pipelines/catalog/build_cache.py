@@ -0,0 +1,96 @@
+"""Local cache that makes catalog rebuilds incremental.
+
+Each enriched catalog entry is stored next to a fingerprint of its YAML entry and
+of the manifest/report fields the enrichment reads. Unchanged entries are reused
+as-is, and an envelope whose content did not change keeps its previous
+``generated_at``, so the serialized bytes stay identical and the upload index
+skips the publish.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from forest_pipelines.utils.json_codec import canonical_bytes, read_json, write_json
+
+CATALOG_BUILD_CACHE_SCHEMA_VERSION = 1
+
+
+def default_catalog_build_cache_path(data_dir: Path) -> Path:
+    return Path(data_dir) / "_state" / "catalog_build_cache.json"
+
+
+def fingerprint(*parts: Any) -> str:
+    return hashlib.sha256(canonical_bytes(parts, default=str)).hexdigest()
+
+
+@dataclass
+class CatalogBuildCache:
+    path: Path
+    stats: dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0})
+    _data: dict[str, Any] | None = field(default=None, init=False, repr=False)
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _load(self) -> dict[str, Any]:
+        if self._data is not None:
+            return self._data
+        data: dict[str, Any] = {"entries": {}, "envelopes": {}}
+        try:
+            raw = read_json(Path(self.path))
+            if isinstance(raw, dict) and raw.get("schema_version") == CATALOG_BUILD_CACHE_SCHEMA_VERSION:
+                data["entries"] = raw.get("entries") if isinstance(raw.get("entries"), dict) else {}
+                data["envelopes"] = raw.get("envelopes") if isinstance(raw.get("envelopes"), dict) else {}
+        except (OSError, ValueError):
+            pass
+        self._data = data
+        return data
+
+    def get_entry(self, namespace: str, entry_id: str, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._load()["entries"].get(f"{namespace}:{entry_id}")
+            if isinstance(cached, dict) and cached.get("key") == key and isinstance(cached.get("entry"), dict):
+                self.stats["hits"] += 1
+                return copy.deepcopy(cached["entry"])
+            self.stats["misses"] += 1
+            return None
+
+    def put_entry(self, namespace: str, entry_id: str, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._load()["entries"][f"{namespace}:{entry_id}"] = {"key": key, "entry": copy.deepcopy(entry)}
+            self._dirty = True
+
+    def stabilize_generated_at(self, catalog_id: str, envelope: dict[str, Any]) -> bool:
+        """Reuse the previous ``generated_at`` when the rest of the envelope is unchanged.
+
+        Returns True when the envelope changed (and its new timestamp was recorded).
+        """
+        content_key = fingerprint({k: v for k, v in envelope.items() if k != "generated_at"})
+        with self._lock:
+            envelopes = self._load()["envelopes"]
+            previous = envelopes.get(catalog_id)
+            if isinstance(previous, dict) and previous.get("content_key") == content_key and previous.get("generated_at"):
+                envelope["generated_at"] = previous["generated_at"]
+                return False
+            envelopes[catalog_id] = {"content_key": content_key, "generated_at": envelope.get("generated_at")}
+            self._dirty = True
+            return True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or self._data is None:
+                return
+            write_json(Path(self.path), {"schema_version": CATALOG_BUILD_CACHE_SCHEMA_VERSION, **self._data})
+            self._dirty = False
+
+
+__all__ = [
+    "CATALOG_BUILD_CACHE_SCHEMA_VERSION",
+    "CatalogBuildCache",
+    "default_catalog_build_cache_path",
+    "fingerprint",
+]
@@ -0,0 +1,144 @@
+"""Compact search artifacts derived from the open-data catalog envelope.
+
+- open_data_cards.json - card-only fields per dataset, enough to render the list
+- open_data_search_index.json - inverted index token -> dataset positions
+
+Both are pure functions of the envelope (no clock), so an unchanged catalog
+produces byte-identical artifacts.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any
+
+SEARCH_INDEX_SCHEMA_VERSION = "1.0"
+MIN_TOKEN_CHARS = 2
+
+#campos indexados; títulos de fonte/categoria cobrem órgãos e "tags" do catálogo
+SEARCH_FIELDS: tuple[str, ...] = (
+    "id",
+    "title",
+    "title_en",
+    "description",
+    "description_en",
+    "source_title",
+    "source_title_en",
+    "category_title",
+    "category_title_en",
+    "segment_title",
+    "segment_title_en",
+    "subcategory_title",
+    "subcategory_title_en",
+)
+
+CARD_FIELDS: tuple[str, ...] = (
+    "id",
+    "slug",
+    "title",
+    "title_en",
+    "category_title",
+    "category_title_en",
+    "segment_title",
+    "segment_title_en",
+    "subcategory_title",
+    "subcategory_title_en",
+    "source_id",
+    "source_title",
+    "source_title_en",
+    "manifest_path",
+    "generated_at",
+    "last_release_iso",
+)
+
+_STOPWORDS = frozenset(
+    {
+        "a", "as", "o", "os", "de", "da", "das", "do", "dos", "e", "em", "no", "na", "nos", "nas",
+        "um", "uma", "por", "para", "com", "se", "ao", "aos", "ou",
+        "the", "of", "and", "in", "on", "for", "to", "by", "an", "or", "with",
+    }
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold_text(value: Any) -> str:
+    """Lowercase and strip accents ("Região Amazônica" -> "regiao amazonica")."""
+    decomposed = unicodedata.normalize("NFKD", str(value or ""))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(value: Any) -> list[str]:
+    return [
+        token
+        for token in _TOKEN_RE.findall(fold_text(value))
+        if len(token) >= MIN_TOKEN_CHARS and token not in _STOPWORDS
+    ]
+
+
+def build_card_envelope(open_data_envelope: dict[str, Any]) -> dict[str, Any]:
+    cards = [
+        {key: entry[key] for key in CARD_FIELDS if entry.get(key)}
+        for entry in open_data_envelope.get("datasets") or []
+        if isinstance(entry, dict)
+    ]
+    return {
+        "schema_version": open_data_envelope.get("schema_version"),
+        "catalog_id": "open_data_cards",
+        "generated_at": open_data_envelope.get("generated_at"),
+        "datasets": cards,
+    }
+
+
+def build_search_index(open_data_envelope: dict[str, Any]) -> dict[str, Any]:
+    """Inverted index over accent-folded pt/en text fields.
+
+    ``ids`` lists dataset ids in catalog order and ``tokens`` maps each token to
+    sorted positions in ``ids``; integer postings keep the artifact small.
+    """
+    ids: list[str] = []
+    postings: dict[str, set[int]] = {}
+    for entry in open_data_envelope.get("datasets") or []:
+        if not isinstance(entry, dict) or not entry.get("id"):
+            continue
+        position = len(ids)
+        ids.append(str(entry["id"]))
+        for field_name in SEARCH_FIELDS:
+            for token in tokenize(entry.get(field_name)):
+                postings.setdefault(token, set()).add(position)
+
+    return {
+        "schema_version": SEARCH_INDEX_SCHEMA_VERSION,
+        "catalog_id": "open_data_search_index",
+        "generated_at": open_data_envelope.get("generated_at"),
+        "ids": ids,
+        "tokens": {token: sorted(positions) for token, positions in sorted(postings.items())},
+    }
+
+
+def search(index: dict[str, Any], query: str) -> list[str]:
+    """Reference lookup (AND over query tokens, prefix match on the last one)."""
+    terms = tokenize(query)
+    if not terms:
+        return []
+    tokens: dict[str, list[int]] = index.get("tokens") or {}
+    result: set[int] | None = None
+    for i, term in enumerate(terms):
+        if i == len(terms) - 1:
+            matched = {pos for token, positions in tokens.items() if token.startswith(term) for pos in positions}
+        else:
+            matched = set(tokens.get(term) or [])
+        result = matched if result is None else result & matched
+    ids = index.get("ids") or []
+    return [ids[pos] for pos in sorted(result or set())]
+
+
+__all__ = [
+    "CARD_FIELDS",
+    "SEARCH_FIELDS",
+    "SEARCH_INDEX_SCHEMA_VERSION",
+    "build_card_envelope",
+    "build_search_index",
+    "fold_text",
+    "search",
+    "tokenize",
+]
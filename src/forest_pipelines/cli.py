@@ -10,10 +10,12 @@ import typer
 import yaml
 
 from forest_pipelines.audits.registry import get_audit_runner
+from forest_pipelines.catalog.build_cache import CatalogBuildCache, default_catalog_build_cache_path
 from forest_pipelines.cli_help import (
     AUDIT_DATASET_DOC,
     BUILD_REPORT_DOC,
     PUBLISH_CATALOG_DOC,
+    PUSH_STAGED_DOC,
     SYNC_DOC,
     build_app_help,
     short_command_summary,
@@ -21,12 +23,34 @@ from forest_pipelines.cli_help import (
 from forest_pipelines.freshness.cli import app as freshness_app
 from forest_pipelines.logging_ import get_logger
 from forest_pipelines.manifests.build_manifest import build_manifest
+from forest_pipelines.manifests.delta import (
+    build_manifest_delta,
+    delta_index_path,
+    delta_object_path,
+    is_empty_manifest_delta,
+    manifest_revision,
+    next_delta_index,
+)
+from forest_pipelines.manifests.shards import (
+    changed_shards,
+    hydrate_sharded_manifest,
+    is_sharded_index,
+    manifest_shard_by,
+    split_manifest_into_shards,
+)
 from forest_pipelines.profiling import profile_cache_from_manifest, use_profile_cache
 from forest_pipelines.registry.datasets import get_dataset_runner
 from forest_pipelines.reports.publish.supabase import publish_report_package
 from forest_pipelines.reports.registry.reports import get_report_runner
 from forest_pipelines.settings import load_settings
+from forest_pipelines.storage.batch import upload_jobs
+from forest_pipelines.storage.json_publish import json_upload_jobs
+from forest_pipelines.storage.download_cache import default_download_cache_dir
+from forest_pipelines.storage.local_storage import LocalStorage, push_local_storage
+from forest_pipelines.storage.resumable import default_resumable_state_path
+from forest_pipelines.storage.staged_publish import collect_expired_versions, load_pointer
 from forest_pipelines.storage.supabase_storage import SupabaseStorage
+from forest_pipelines.storage.upload_index import default_upload_index_path
 
 app = typer.Typer(
     name="forest-pipelines",
@@ -52,6 +76,70 @@ _PT_MONTH_NAMES = [
 ]
 
 
+def _storage_from_settings(settings: Any, logger: Any) -> SupabaseStorage | LocalStorage:
+    if getattr(settings, "storage_backend", "supabase") == "local":
+        storage = _local_storage_from_settings(settings, logger)
+        logger.info("Storage local: %s", storage.root)
+        return storage
+    return _supabase_storage_from_settings(settings, logger)
+
+
+def _local_storage_from_settings(settings: Any, logger: Any) -> LocalStorage:
+    return LocalStorage.from_env(
+        logger=logger,
+        root=settings.local_storage_dir,
+        bucket_open_data=settings.supabase_bucket_open_data,
+    )
+
+
+def _supabase_storage_from_settings(settings: Any, logger: Any) -> SupabaseStorage:
+    return SupabaseStorage.from_env(
+        logger=logger,
+        bucket_open_data=settings.supabase_bucket_open_data,
+        upload_index_path=default_upload_index_path(
+            settings.data_dir,
+            settings.supabase_bucket_open_data,
+        ),
+        download_cache_dir=default_download_cache_dir(
+            settings.data_dir,
+            settings.supabase_bucket_open_data,
+        ),
+        resumable_state_path=default_resumable_state_path(
+            settings.data_dir,
+            settings.supabase_bucket_open_data,
+        ),
+    )
+
+
+def _log_upload_stats(storage: Any, logger: Any) -> None:
+    stats = getattr(storage, "upload_stats", None)
+    if isinstance(stats, dict):
+        logger.info(
+            "Uploads: escritos=%d ignorados_sem_mudanca=%d",
+            stats.get("written", 0),
+            stats.get("skipped", 0),
+        )
+    cache = getattr(storage, "download_cache", None)
+    if cache is not None:
+        logger.info(
+            "Downloads em cache: hits=%d misses=%d",
+            cache.stats.get("hits", 0),
+            cache.stats.get("misses", 0),
+        )
+
+
+def _catalog_build_cache(settings: Any) -> CatalogBuildCache:
+    return CatalogBuildCache(default_catalog_build_cache_path(settings.data_dir))
+
+
+def _log_catalog_cache_stats(build_cache: CatalogBuildCache, logger: Any) -> None:
+    logger.info(
+        "Catálogo: entradas reaproveitadas=%d recalculadas=%d",
+        build_cache.stats.get("hits", 0),
+        build_cache.stats.get("misses", 0),
+    )
+
+
 def _normalize_reference_month_option(value: str) -> str:
     norm = value.strip().lower()
     if not norm:
@@ -128,10 +216,7 @@ def sync(
     settings = load_settings(config_path)
     logger = get_logger(settings.logs_dir, dataset_id)
 
-    storage = SupabaseStorage.from_env(
-        logger=logger,
-        bucket_open_data=settings.supabase_bucket_open_data,
-    )
+    storage = _storage_from_settings(settings, logger)
 
     manifest_path = _catalog_manifest_path_for_dataset(settings, dataset_id)
     _run_dataset_sync(
@@ -143,6 +228,7 @@ def sync(
         force_profile=force,
         existing_manifest_path=manifest_path,
     )
+    _log_upload_stats(storage, logger)
 
 
 @app.command(
@@ -171,10 +257,7 @@ def sync_all(
     settings = load_settings(config_path)
     logger = get_logger(settings.logs_dir, "sync/all")
 
-    storage = SupabaseStorage.from_env(
-        logger=logger,
-        bucket_open_data=settings.supabase_bucket_open_data,
-    )
+    storage = _storage_from_settings(settings, logger)
 
     entries = _catalog_dataset_entries(settings)
     if not entries:
@@ -209,10 +292,13 @@ def sync_all(
             publish_catalogs,
         )
 
+        build_cache = _catalog_build_cache(settings)
         open_envelope, reports_envelope = build_catalogs_from_defaults(
             settings.root,
             manifest_loader=make_storage_manifest_loader(storage, logger),
+            build_cache=build_cache,
         )
+        _log_catalog_cache_stats(build_cache, logger)
         publish_catalogs(
             storage=storage,
             open_data_envelope=open_envelope,
@@ -222,6 +308,7 @@ def sync_all(
         )
 
     logger.info("Sync all finished: completed=%d failed=%d", completed, len(failures))
+    _log_upload_stats(storage, logger)
     if failures:
         for dataset_id, error in failures:
             logger.error("Dataset failed: %s error=%s", dataset_id, error)
@@ -272,22 +359,87 @@ def _run_dataset_sync(
 
     skip_cli_manifest = bool(manifest.pop("_cli_skip_manifest_upload", False))
 
-    manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
     manifest_path = f"{manifest['bucket_prefix'].rstrip('/')}/manifest.json"
 
     if not skip_cli_manifest:
-        storage.upload_bytes(
-            object_path=manifest_path,
-            data=manifest_bytes,
-            content_type="application/json",
-            upsert=True,
-        )
+        _publish_dataset_manifest(storage, manifest_path, manifest, logger)
 
     logger.info("Manifest publicado: %s", storage.public_url(manifest_path))
     logger.info("Sincronização concluída com sucesso!")
     return manifest
 
 
+def _publish_dataset_manifest(
+    storage: Any,
+    manifest_path: str,
+    manifest: dict[str, Any],
+    logger: Any,
+) -> None:
+    """Upload manifest.json plus a delta against the previous revision.
+
+    Sharded manifests (``sharding.by``) are published as an index plus
+    ``items/<period>.json`` documents, and only shards whose items changed are
+    rewritten. Payload objects (shards, delta) land first; manifest.json and
+    ``deltas/index.json`` are written after them so readers never follow a
+    reference to a missing object. A sync that changes nothing but
+    ``generated_at`` keeps the previous revision and uploads nothing.
+    """
+    bucket_prefix = str(manifest["bucket_prefix"]).rstrip("/")
+    manifest_dir = manifest_path.rsplit("/", 1)[0]
+    previous = _fetch_existing_dataset_manifest(storage, manifest_path, logger)
+    previous_revision = manifest_revision(previous)
+    manifest["revision"] = (previous_revision or 0) + 1
+
+    delta = None
+    if previous is not None and previous_revision is not None:
+        delta = build_manifest_delta(previous, manifest)
+        if is_empty_manifest_delta(delta, previous):
+            #mesmo conteúdo publicado: mantém revision e generated_at anteriores (bytes idênticos)
+            manifest["revision"] = previous_revision
+            manifest["generated_at"] = previous.get("generated_at")
+            logger.info("Manifest inalterado (revision=%d); nada a publicar", previous_revision)
+            return
+
+    jobs: list[Any] = []
+    pointer_jobs: list[Any] = []
+    stale_objects: list[str] = []
+    if manifest_shard_by(manifest):
+        index, shards = split_manifest_into_shards(manifest)
+        previous_shards = split_manifest_into_shards(previous)[1] if manifest_shard_by(previous) else {}
+        changed = changed_shards(shards, previous_shards)
+        for rel in changed:
+            jobs.extend(json_upload_jobs(storage, f"{manifest_dir}/{rel}", shards[rel]))
+        stale_objects.extend(f"{manifest_dir}/{rel}" for rel in previous_shards if rel not in shards)
+        pointer_jobs.extend(json_upload_jobs(storage, manifest_path, index))
+        logger.info("Manifest em shards: %d shard(s), %d reescrito(s)", len(shards), len(changed))
+    else:
+        pointer_jobs.extend(json_upload_jobs(storage, manifest_path, manifest))
+
+    if delta is not None:
+        delta_path = delta_object_path(bucket_prefix, manifest["revision"])
+        index_path = delta_index_path(bucket_prefix)
+        delta_index, expired_deltas = next_delta_index(
+            load_pointer(storage, index_path, logger),
+            delta,
+            delta_path=delta_path,
+            manifest_path=manifest_path,
+        )
+        jobs.extend(json_upload_jobs(storage, delta_path, delta))
+        pointer_jobs.extend(json_upload_jobs(storage, index_path, delta_index))
+        stale_objects.extend(expired_deltas)
+        logger.info(
+            "Manifest delta: revision=%d adicionados=%d alterados=%d removidos=%d",
+            manifest["revision"],
+            len(delta["added"]),
+            len(delta["changed"]),
+            len(delta["removed"]),
+        )
+
+    upload_jobs(storage, jobs, logger=logger).raise_for_failures()
+    upload_jobs(storage, pointer_jobs, logger=logger).raise_for_failures()
+    collect_expired_versions(storage, stale_objects, logger)
+
+
 def _catalog_dataset_entries(settings: Any) -> list[dict[str, Any]]:
     path = settings.root / "configs" / "catalog" / "open_data.yml"
     raw = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
@@ -315,10 +467,38 @@ def _fetch_existing_dataset_manifest(
         if raw is None:
             return None
         manifest = json.loads(raw)
-        return manifest if isinstance(manifest, dict) else None
+        if not isinstance(manifest, dict):
+            return None
     except Exception as exc:
         logger.info("Existing manifest unavailable: %s error=%s", manifest_path, exc)
         return None
+    if is_sharded_index(manifest):
+        manifest = _hydrate_dataset_manifest(storage, manifest_path, manifest, logger)
+    return manifest
+
+
+def _hydrate_dataset_manifest(
+    storage: Any,
+    manifest_path: str,
+    index: dict[str, Any],
+    logger: Any,
+) -> dict[str, Any]:
+    manifest_dir = manifest_path.rsplit("/", 1)[0]
+
+    def _load_shard(rel_path: str) -> dict[str, Any] | None:
+        raw = storage.download_bytes(f"{manifest_dir}/{rel_path}")
+        if raw is None:
+            return None
+        try:
+            shard = json.loads(raw)
+        except ValueError:
+            return None
+        return shard if isinstance(shard, dict) else None
+
+    manifest, missing = hydrate_sharded_manifest(index, _load_shard)
+    if missing:
+        logger.warning("Shards de manifest indisponíveis (%d): %s", len(missing), missing)
+    return manifest
 
 
 def _merge_incremental_manifest_items(
@@ -359,6 +539,7 @@ def _merge_incremental_manifest_items(
         meta=current_manifest.get("meta"),
         generation_status=generation_status,
         warnings=current_manifest.get("warnings") or [],
+        shard_by=manifest_shard_by(current_manifest),
     )
 
 
@@ -407,21 +588,24 @@ def build_report(
     refresh_mensal: bool = typer.Option(
         False,
         "--refresh-mensal",
-        help="Remove CSVs mensais do ano corrente no cache local antes de baixar novamente.",
+        help="Ignora o cache de agregados mensais do ano corrente e baixa novamente os CSVs da listagem.",
     ),
     reference_month: str = typer.Option(
         "",
         "--reference-month",
         help="Mês de referência para leitura mensal no BDQueimadas: previous ou current. Se omitido, exibe prompt.",
     ),
+    max_workers: int | None = typer.Option(
+        None,
+        "--max-workers",
+        min=1,
+        help="Processos para reagregar anos em paralelo (padrão: FP_REPORT_BUILD_WORKERS ou nº de CPUs).",
+    ),
 ) -> None:
     settings = load_settings(config_path)
     logger = get_logger(settings.logs_dir, f"reports/{report_id}")
 
-    storage = SupabaseStorage.from_env(
-        logger=logger,
-        bucket_open_data=settings.supabase_bucket_open_data,
-    )
+    storage = _storage_from_settings(settings, logger)
 
     # --- Smart overwrite check ---
     if not force:
@@ -492,6 +676,7 @@ def build_report(
         skip_mensal_download=skip_mensal_download,
         refresh_mensal=refresh_mensal,
         reference_month_mode=reference_month_mode,
+        build_workers=max_workers,
     )
 
     publication = publish_report_package(
@@ -502,6 +687,7 @@ def build_report(
 
     logger.info("Manifest do report: %s", publication["public_urls"]["manifest"])
     logger.info("Report live: %s", publication["public_urls"]["live_report"])
+    _log_upload_stats(storage, logger)
     logger.info("Build do report concluído com sucesso!")
 
 
@@ -535,15 +721,15 @@ def publish_catalog_cmd(
     #storage is built early so it can also feed the manifest_loader used to
     #enrich open-data entries with generated_at (avoids N browser fetches in
     #the portal catalog page). build, then publish.
-    storage = SupabaseStorage.from_env(
-        logger=logger,
-        bucket_open_data=settings.supabase_bucket_open_data,
-    )
+    storage = _storage_from_settings(settings, logger)
 
+    build_cache = _catalog_build_cache(settings)
     open_envelope, reports_envelope = build_catalogs_from_defaults(
         settings.root,
         manifest_loader=make_storage_manifest_loader(storage, logger),
+        build_cache=build_cache,
     )
+    _log_catalog_cache_stats(build_cache, logger)
 
     logger.info(
         "Catálogo open-data: %d datasets, status=%s, warnings=%d",
@@ -564,10 +750,53 @@ def publish_catalog_cmd(
         bucket_prefix=bucket_prefix,
         logger=logger,
     )
+    _log_upload_stats(storage, logger)
     typer.echo(result["public_urls"]["open_data_catalog"])
     typer.echo(result["public_urls"]["reports_catalog"])
 
 
+@app.command(
+    "push-staged",
+    rich_help_panel="Pipelines e storage",
+    help=PUSH_STAGED_DOC,
+    short_help=short_command_summary(PUSH_STAGED_DOC),
+)
+def push_staged(
+    config_path: str = typer.Option(
+        "configs/app.yml",
+        "--config-path",
+        help="YAML principal (storage.local_dir e bucket Supabase).",
+    ),
+    prefix: str = typer.Option(
+        "",
+        "--prefix",
+        help="Envia só objetos sob este prefixo (ex.: catalog ou reports/bdqueimadas).",
+    ),
+    max_workers: int | None = typer.Option(
+        None,
+        "--max-workers",
+        help="Uploads simultâneos; padrão do SupabaseStorage se omitido.",
+    ),
+) -> None:
+    settings = load_settings(config_path)
+    logger = get_logger(settings.logs_dir, "storage/push-staged")
+
+    source = _local_storage_from_settings(settings, logger)
+    target = _supabase_storage_from_settings(settings, logger)
+
+    result = push_local_storage(
+        source,
+        target,
+        prefix=prefix,
+        max_workers=max_workers,
+        logger=logger,
+    )
+    _log_upload_stats(target, logger)
+    typer.echo(f"Enviados: {len(result.uploaded)}  Falhas: {len(result.failed)}")
+    if not result.ok:
+        raise typer.Exit(code=1)
+
+
 @app.command(
     "audit-dataset",
     rich_help_panel="Auditorias",
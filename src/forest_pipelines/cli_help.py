@@ -34,6 +34,8 @@ Requisitos comuns
     O nome do bucket vem da env cujo nome está em app.yml em supabase.bucket_open_data_env
     (ex.: SUPABASE_BUCKET_OPEN_DATA); se ausente, o default é o bucket "open-data".
   • sync e build-report publicam no Storage do Supabase (mesmas envs).
+  • storage.backend: local em app.yml (ou FP_STORAGE_BACKEND=local) grava tudo em disco, sem credenciais;
+    push-staged envia depois o diretório local ao Supabase em um único passo.
 
 IDs registrados - sync (dataset_id)
 {_bullet_list(datasets)}
@@ -77,7 +79,8 @@ Opções relevantes:
   --no-llm         Pula a geração via LLM e usa o fallback determinístico, mesmo que llm.enabled=true no config.
   --reference-month previous|current  Escolhe mês anterior ou vigente para agregados mensais do BDQueimadas.
   --skip-mensal-download              Não faz HTTP; usa apenas CSVs mensais já presentes no cache local.
-  --refresh-mensal                    Limpa CSVs mensais do ano corrente e baixa novamente antes do build.
+  --refresh-mensal                    Ignora o cache de agregados mensais e baixa novamente os CSVs do ano corrente.
+  --max-workers N                     Processos para reagregar anos em paralelo (padrão: FP_REPORT_BUILD_WORKERS ou nº de CPUs).
 
 Exemplos:
   forest-pipelines build-report bdqueimadas_overview
@@ -108,3 +111,16 @@ Exemplos:
   forest-pipelines publish-catalog
   forest-pipelines publish-catalog --bucket-prefix catalog/v1
 """
+
+
+PUSH_STAGED_DOC = """\
+Envia ao Supabase Storage os objetos gravados pelo backend local (storage.backend: local), em lote e em paralelo.
+
+Uso típico: rodar sync / build-report / publish-catalog com FP_STORAGE_BACKEND=local, conferir o resultado em
+storage.local_dir/<bucket>/ e publicar tudo de uma vez. Content-Type e Content-Encoding originais são preservados.
+
+Exemplos:
+  FP_STORAGE_BACKEND=local forest-pipelines publish-catalog
+  forest-pipelines push-staged
+  forest-pipelines push-staged --prefix catalog --max-workers 16
+"""
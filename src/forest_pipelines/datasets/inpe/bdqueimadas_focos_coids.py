@@ -45,6 +45,7 @@ class DatasetCfg:
     max_depth: int = 4
     notes: str = ""
     kind: str = "data"
+    shard_by: str | None = None
 
 
 def make_sync(config_name: str) -> Callable[..., dict[str, Any]]:
@@ -78,6 +79,7 @@ def load_dataset_cfg(datasets_dir: Path, dataset_key: str) -> DatasetCfg:
         max_depth=int(raw.get("max_depth", 4)),
         notes=str(raw.get("notes", "")),
         kind=str(raw.get("kind", "data")),
+        shard_by=str(raw["shard_by"]) if raw.get("shard_by") else None,
     )
 
 
@@ -126,6 +128,7 @@ def sync_from_cfg(
         bucket_prefix=cfg.bucket_prefix,
         items=items,
         warnings=warnings,
+        shard_by=cfg.shard_by,
         meta={
             "source_agency": "INPE - Programa Queimadas",
             "notes": cfg.notes,
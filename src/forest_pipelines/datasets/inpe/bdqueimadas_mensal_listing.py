@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import re
 from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
+from forest_pipelines.datasets.inpe.coids_directory import fetch_directory_entries
 from forest_pipelines.http import stream_download
 
 RE_MENSAL = re.compile(r"focos_mensal_br_(\d{6})\.(csv|zip)$", re.IGNORECASE)
@@ -19,6 +21,51 @@ DEFAULT_MENSAL_BASE_URL = (
 )
 
 
+@dataclass(frozen=True)
+class MensalSource:
+    """One focos_mensal_br_YYYYMM entry of the INPE listing, with its size/date labels."""
+
+    yyyymm: int
+    filename: str
+    url: str
+    size_label: str | None = None
+    last_modified_label: str | None = None
+
+    @property
+    def month(self) -> int:
+        return yyyymm_to_month(self.yyyymm)
+
+    def source_key(self) -> dict[str, str] | None:
+        """Remote identity (URL + size + Last-Modified); None when the listing has no date."""
+        if not self.last_modified_label:
+            return None
+        return {
+            "url": self.url,
+            "size": self.size_label or "",
+            "last_modified": self.last_modified_label,
+        }
+
+
+def list_mensal_sources(base_url: str, year: int) -> list[MensalSource]:
+    """Monthly files of ``year`` in the listing, ordered by month."""
+    found: dict[int, MensalSource] = {}
+    for entry in fetch_directory_entries(base_url, timeout_s=120):
+        m = RE_MENSAL.search(entry.filename)
+        if entry.is_dir or not m:
+            continue
+        yyyymm = int(m.group(1))
+        if yyyymm // 100 != year:
+            continue
+        found[yyyymm] = MensalSource(
+            yyyymm=yyyymm,
+            filename=entry.filename,
+            url=entry.url,
+            size_label=entry.size_label,
+            last_modified_label=entry.last_modified_label,
+        )
+    return [found[k] for k in sorted(found)]
+
+
 def extract_mensal_links(base_url: str) -> list[tuple[int, str, str]]:
     """Lista (yyyymm, filename, url absoluta) ordenada por yyyymm."""
     r = requests.get(base_url, timeout=120)
@@ -1,7 +1,6 @@
 # src/forest_pipelines/datasets/noticias_agricolas/sync.py
 from __future__ import annotations
 
-import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -21,6 +20,7 @@ from forest_pipelines.datasets.noticias_agricolas.models import CategoryConfig,
 from forest_pipelines.datasets.noticias_agricolas.text_cleanup import first_useful_paragraph
 from forest_pipelines.datasets.noticias_agricolas.validation import validate_feed_for_stable_publish
 from forest_pipelines.manifests.build_manifest import build_manifest
+from forest_pipelines.utils.json_codec import dumps_bytes
 
 
 @dataclass(frozen=True)
@@ -253,11 +253,7 @@ def sync(
         },
     )
 
-    raw_bytes = json.dumps(manifest_body, ensure_ascii=False, indent=2).encode("utf-8")
-    try:
-        json.loads(raw_bytes.decode("utf-8"))
-    except json.JSONDecodeError as e:
-        raise RuntimeError("JSON inválido após serialização") from e
+    raw_bytes = dumps_bytes(manifest_body)
 
     prefix = cfg.bucket_prefix.rstrip("/")
     now = datetime.now(timezone.utc)
@@ -215,6 +215,13 @@ def _collect_manifest_profiled_at(watch: WatchEntry, *, timeout_s: int) -> list[
     response.raise_for_status()
     manifest = response.json()
     items = manifest.get("items") if isinstance(manifest, dict) else None
+    shards = manifest.get("shards") if isinstance(manifest, dict) else None
+    if not items and isinstance(shards, list) and shards and isinstance(shards[0], dict):
+        #manifest em shards: o shard mais recente basta para o sinal de frescor
+        shard_response = requests.get(urljoin(watch.manifest_url, str(shards[0].get("path") or "")), timeout=timeout_s)
+        shard_response.raise_for_status()
+        shard = shard_response.json()
+        items = shard.get("items") if isinstance(shard, dict) else None
     if not isinstance(items, list):
         return [_missing_signal_record(watch, warning="Manifest has no items list")]
     records = []
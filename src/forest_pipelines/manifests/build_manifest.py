@@ -4,6 +4,8 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Iterable, Literal
 
+from forest_pipelines.manifests.shards import normalize_shard_by
+
 MANIFEST_SCHEMA_VERSION = "2.0"
 
 GenerationStatus = Literal["success", "success_partial_fallback", "failed"]
@@ -111,11 +113,16 @@ def build_manifest(
     generation_status: GenerationStatus = "success",
     warnings: Iterable[str] | None = None,
     schema_version: str = MANIFEST_SCHEMA_VERSION,
+    shard_by: str | None = None,
 ) -> dict[str, Any]:
-    """Build the versioned dataset manifest envelope (schema 2.0+)."""
+    """Build the versioned dataset manifest envelope (schema 2.0+).
+
+    With ``shard_by`` ("month" or "year") the envelope is marked for sharding and the
+    publisher splits ``items`` into per-period documents (see ``manifests.shards``).
+    """
     normalized_items = [_normalize_item(item) for item in items]
     status = _status_from_items(normalized_items, generation_status)
-    return {
+    manifest: dict[str, Any] = {
         "schema_version": schema_version,
         "dataset_id": dataset_id,
         "title": title,
@@ -127,3 +134,7 @@ def build_manifest(
         "items": normalized_items,
         "meta": _normalize_meta(meta),
     }
+    shard_by = normalize_shard_by(shard_by)
+    if shard_by:
+        manifest["sharding"] = {"by": shard_by}
+    return manifest
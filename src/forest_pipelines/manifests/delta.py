@@ -0,0 +1,185 @@
+#src/forest_pipelines/manifests/delta.py
+from __future__ import annotations
+
+from typing import Any
+
+from forest_pipelines.utils.json_codec import canonical_bytes
+
+MANIFEST_DELTA_SCHEMA_VERSION = "1.0"
+#deltas mais antigos saem do índice; clientes atrasados recarregam o manifest.json completo
+DEFAULT_MANIFEST_DELTA_KEEP = 30
+DELTAS_DIRNAME = "deltas"
+
+_HEADER_KEYS: tuple[str, ...] = (
+    "schema_version",
+    "title",
+    "source_dataset_url",
+    "generated_at",
+    "generation_status",
+    "warnings",
+    "bucket_prefix",
+    "meta",
+    "sharding",
+)
+#campos que mudam a cada sync mesmo sem mudança de conteúdo
+_VOLATILE_HEADER_KEYS = frozenset({"generated_at"})
+
+
+def manifest_revision(manifest: dict[str, Any] | None) -> int | None:
+    if not isinstance(manifest, dict):
+        return None
+    value = manifest.get("revision")
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return None
+    return value
+
+
+def _items_by_source_url(manifest: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    items = manifest.get("items")
+    out: dict[str, dict[str, Any]] = {}
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("source_url"), str):
+            out[item["source_url"]] = item
+    return out
+
+
+def _canonical(value: Any) -> bytes:
+    return canonical_bytes(value)
+
+
+def build_manifest_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Changes from ``previous`` to ``current`` keyed by item ``source_url``.
+
+    ``added``/``changed`` carry full items, ``removed`` only source URLs, and
+    ``header`` only the top-level fields whose value differs. Applying the delta to
+    ``previous`` with ``apply_manifest_delta`` yields ``current`` (item order
+    follows ``item_order``).
+    """
+    prev_items = _items_by_source_url(previous)
+    curr_items = _items_by_source_url(current)
+
+    added = [item for url, item in curr_items.items() if url not in prev_items]
+    changed = [
+        item
+        for url, item in curr_items.items()
+        if url in prev_items and _canonical(item) != _canonical(prev_items[url])
+    ]
+    removed = [url for url in prev_items if url not in curr_items]
+    header = {
+        key: current.get(key)
+        for key in _HEADER_KEYS
+        if _canonical(current.get(key)) != _canonical(previous.get(key))
+    }
+
+    return {
+        "schema_version": MANIFEST_DELTA_SCHEMA_VERSION,
+        "dataset_id": current.get("dataset_id"),
+        "base_revision": manifest_revision(previous),
+        "revision": manifest_revision(current),
+        "generated_at": current.get("generated_at"),
+        "header": header,
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "item_order": list(curr_items),
+    }
+
+
+def is_empty_manifest_delta(delta: dict[str, Any], previous: dict[str, Any]) -> bool:
+    """True when ``delta`` only moves ``generated_at``: same items, same order, same header."""
+    if delta.get("added") or delta.get("changed") or delta.get("removed"):
+        return False
+    if set(delta.get("header") or {}) - _VOLATILE_HEADER_KEYS:
+        return False
+    return list(delta.get("item_order") or []) == list(_items_by_source_url(previous))
+
+
+def apply_manifest_delta(base: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Reference implementation of the consumer side (portal / SDK)."""
+    base_revision = manifest_revision(base)
+    if base_revision != delta.get("base_revision"):
+        raise ValueError(
+            f"Delta espera revision={delta.get('base_revision')}, manifest está em {base_revision}"
+        )
+    items = _items_by_source_url(base)
+    for url in delta.get("removed") or []:
+        items.pop(url, None)
+    for item in [*(delta.get("added") or []), *(delta.get("changed") or [])]:
+        items[item["source_url"]] = item
+
+    order = [url for url in delta.get("item_order") or [] if url in items]
+    ordered = set(order)
+    order.extend(url for url in items if url not in ordered)
+
+    result = {**base, **(delta.get("header") or {})}
+    result["revision"] = delta.get("revision")
+    result["items"] = [items[url] for url in order]
+    return result
+
+
+def delta_object_path(bucket_prefix: str, revision: int) -> str:
+    return f"{bucket_prefix.rstrip('/')}/{DELTAS_DIRNAME}/{revision:08d}.json"
+
+
+def delta_index_path(bucket_prefix: str) -> str:
+    return f"{bucket_prefix.rstrip('/')}/{DELTAS_DIRNAME}/index.json"
+
+
+def next_delta_index(
+    previous_index: dict[str, Any] | None,
+    delta: dict[str, Any],
+    *,
+    delta_path: str,
+    manifest_path: str,
+    keep: int = DEFAULT_MANIFEST_DELTA_KEEP,
+) -> tuple[dict[str, Any], list[str]]:
+    """Delta index after publishing ``delta`` plus paths of deltas dropped from it."""
+    entries: list[dict[str, Any]] = []
+    previous = (previous_index or {}).get("deltas")
+    for entry in previous if isinstance(previous, list) else []:
+        if isinstance(entry, dict) and isinstance(entry.get("revision"), int):
+            if entry["revision"] < int(delta["revision"]):
+                entries.append(entry)
+    expired: list[str] = []
+    #cadeia quebrada (delta anterior ausente): o índice recomeça a partir deste delta
+    if entries and entries[-1]["revision"] != delta["base_revision"]:
+        expired.extend(str(entry["path"]) for entry in entries if entry.get("path"))
+        entries = []
+    entries.append(
+        {
+            "base_revision": delta["base_revision"],
+            "revision": delta["revision"],
+            "path": delta_path,
+            "generated_at": delta.get("generated_at"),
+            "added": len(delta.get("added") or []),
+            "changed": len(delta.get("changed") or []),
+            "removed": len(delta.get("removed") or []),
+        }
+    )
+
+    keep = max(1, int(keep))
+    expired.extend(str(entry["path"]) for entry in entries[:-keep] if entry.get("path"))
+    entries = entries[-keep:]
+    index = {
+        "schema_version": MANIFEST_DELTA_SCHEMA_VERSION,
+        "dataset_id": delta.get("dataset_id"),
+        "manifest_path": manifest_path,
+        "revision": delta["revision"],
+        "oldest_base_revision": entries[0]["base_revision"],
+        "deltas": entries,
+    }
+    return index, expired
+
+
+__all__ = [
+    "DEFAULT_MANIFEST_DELTA_KEEP",
+    "DELTAS_DIRNAME",
+    "MANIFEST_DELTA_SCHEMA_VERSION",
+    "apply_manifest_delta",
+    "build_manifest_delta",
+    "delta_index_path",
+    "delta_object_path",
+    "is_empty_manifest_delta",
+    "manifest_revision",
+    "next_delta_index",
+]
@@ -0,0 +1,145 @@
+#src/forest_pipelines/manifests/shards.py
+from __future__ import annotations
+
+import re
+from typing import Any, Callable
+
+from forest_pipelines.utils.json_codec import canonical_bytes
+
+MANIFEST_SHARD_SCHEMA_VERSION = "1.0"
+SHARDS_DIRNAME = "items"
+SUPPORTED_SHARD_BY: tuple[str, ...] = ("month", "year")
+UNDATED_SHARD_KEY = "undated"
+
+_RE_PERIOD = re.compile(r"^(?P<year>(19|20)\d{2})(-(?P<month>0[1-9]|1[0-2]))?")
+
+
+def normalize_shard_by(value: Any) -> str | None:
+    norm = str(value or "").strip().lower()
+    if not norm or norm == "none":
+        return None
+    if norm not in SUPPORTED_SHARD_BY:
+        raise ValueError(f"shard_by inválido: {value!r}. Use um de {SUPPORTED_SHARD_BY}.")
+    return norm
+
+
+def manifest_shard_by(manifest: dict[str, Any] | None) -> str | None:
+    sharding = (manifest or {}).get("sharding")
+    if not isinstance(sharding, dict):
+        return None
+    return normalize_shard_by(sharding.get("by"))
+
+
+def is_sharded_index(manifest: dict[str, Any] | None) -> bool:
+    return isinstance(manifest, dict) and isinstance(manifest.get("shards"), list)
+
+
+def shard_key(item: dict[str, Any], shard_by: str) -> str:
+    match = _RE_PERIOD.match(str(item.get("period") or "").strip())
+    if not match:
+        return UNDATED_SHARD_KEY
+    if shard_by == "year" or not match.group("month"):
+        return match.group("year")
+    return f"{match.group('year')}-{match.group('month')}"
+
+
+def shard_relative_path(key: str) -> str:
+    return f"{SHARDS_DIRNAME}/{key}.json"
+
+
+def split_manifest_into_shards(
+    manifest: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Split a full manifest into an index envelope and per-period shard documents.
+
+    The index keeps every top-level field, replaces ``items`` with an empty list and
+    lists the shards (newest period first) with paths relative to the manifest, so
+    HTTP readers can ``urljoin(manifest_url, path)``. Returns ``(index, shards)``
+    where ``shards`` maps the relative path to the shard payload.
+    """
+    shard_by = manifest_shard_by(manifest)
+    if shard_by is None:
+        raise ValueError("Manifest sem sharding.by; nada a dividir")
+
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for item in manifest.get("items") or []:
+        grouped.setdefault(shard_key(item, shard_by), []).append(item)
+
+    shards: dict[str, dict[str, Any]] = {}
+    entries: list[dict[str, Any]] = []
+    #chaves de período ordenam lexicograficamente; "undated" fica por último
+    keys = sorted((k for k in grouped if k != UNDATED_SHARD_KEY), reverse=True)
+    if UNDATED_SHARD_KEY in grouped:
+        keys.append(UNDATED_SHARD_KEY)
+    for key in keys:
+        rel = shard_relative_path(key)
+        shards[rel] = {
+            "schema_version": MANIFEST_SHARD_SCHEMA_VERSION,
+            "dataset_id": manifest.get("dataset_id"),
+            "shard": key,
+            "items": grouped[key],
+        }
+        entries.append({"key": key, "path": rel, "item_count": len(grouped[key])})
+
+    index = {key: value for key, value in manifest.items() if key != "items"}
+    index["items"] = []
+    index["item_count"] = sum(len(items) for items in grouped.values())
+    index["shards"] = entries
+    return index, shards
+
+
+def hydrate_sharded_manifest(
+    index: dict[str, Any],
+    load_shard: Callable[[str], dict[str, Any] | None],
+    *,
+    keys: set[str] | None = None,
+) -> tuple[dict[str, Any], list[str]]:
+    """Rebuild a full manifest from its index, loading shards with ``load_shard(rel_path)``.
+
+    ``keys`` limits which shards are read. Returns the manifest (without ``shards``)
+    and the relative paths of shards that could not be loaded.
+    """
+    items: list[dict[str, Any]] = []
+    missing: list[str] = []
+    for entry in index.get("shards") or []:
+        if not isinstance(entry, dict) or not entry.get("path"):
+            continue
+        if keys is not None and entry.get("key") not in keys:
+            continue
+        shard = load_shard(str(entry["path"]))
+        shard_items = shard.get("items") if isinstance(shard, dict) else None
+        if not isinstance(shard_items, list):
+            missing.append(str(entry["path"]))
+            continue
+        items.extend(item for item in shard_items if isinstance(item, dict))
+
+    manifest = {key: value for key, value in index.items() if key not in {"shards", "item_count"}}
+    manifest["items"] = items
+    return manifest, missing
+
+
+def changed_shards(
+    shards: dict[str, dict[str, Any]],
+    previous_shards: dict[str, dict[str, Any]],
+) -> list[str]:
+    """Relative paths of shards whose items differ from the previously published ones."""
+
+    def _canonical(payload: dict[str, Any] | None) -> bytes:
+        return canonical_bytes((payload or {}).get("items"))
+
+    return [rel for rel, shard in shards.items() if _canonical(shard) != _canonical(previous_shards.get(rel))]
+
+
+__all__ = [
+    "MANIFEST_SHARD_SCHEMA_VERSION",
+    "SHARDS_DIRNAME",
+    "SUPPORTED_SHARD_BY",
+    "changed_shards",
+    "hydrate_sharded_manifest",
+    "is_sharded_index",
+    "manifest_shard_by",
+    "normalize_shard_by",
+    "shard_key",
+    "shard_relative_path",
+    "split_manifest_into_shards",
+]
@@ -1,24 +1,99 @@
 # src/forest_pipelines/reports/builders/bdqueimadas_incremental.py
 from __future__ import annotations
 
+import codecs
 import csv
 import hashlib
+import io
 import json
+import logging
+import os
 import re
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable, Iterator
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from forest_pipelines.storage.batch import UploadJob, delete_objects_best_effort, upload_jobs
+from forest_pipelines.storage.local_mirror import LocalObjectMirror
+from forest_pipelines.utils.json_codec import dumps_bytes, loads
+
+LOG = logging.getLogger(__name__)
 
 RE_YEAR = re.compile(r"(\d{4})")
 
 # Satélite de referência INPE para séries comparáveis (ex.: com anos vindos de ZIP ref).
 INPE_REFERENCE_SATELLITE = "AQUA_M-T"
 
-CACHE_SCHEMA_VERSION = 2
+#3: colunas dayfirst (data_hora/datahora/data/date) com valores ISO eram lidas com mês/dia trocados por
+#format="mixed" (2024-03-05 -> 2024-05-03); o formato detectado corrige, e caches anuais/mensais antigos são refeitos
+CACHE_SCHEMA_VERSION = 3
 ALL_BIOMES_VALUE = "__all__"
 
+#formato dos agregados anuais em _cache/yearly/; a leitura de "json"/cubo longo só vale para caches já no schema 3+
+YEAR_CACHE_FORMAT = "parquet"
+YEAR_CACHE_CONTENT_TYPE = "application/vnd.apache.parquet"
+_YEAR_CACHE_METADATA_KEY = b"forest_pipelines.year_cache"
+
+#colunas-chave de cada agregação (todas somam a coluna "value")
+AGGREGATION_KEY_COLUMNS: dict[str, list[str]] = {
+    "monthly_all": ["period", "year"],
+    "monthly_by_biome": ["period", "year", "biome"],
+    "annual_all": ["year"],
+    "annual_by_biome": ["year", "biome"],
+    "state_year_all": ["year", "state"],
+    "state_year_by_biome": ["year", "state", "biome"],
+    "state_month_all": ["period", "year", "state"],
+    "state_month_by_biome": ["period", "year", "state", "biome"],
+}
+
+#linhas por chunk na leitura em streaming dos CSVs de focos (memória constante por arquivo)
+DEFAULT_FOCOS_CHUNK_ROWS = 250_000
+FOCOS_CSV_ENCODINGS: tuple[str, ...] = ("utf-8", "latin-1", "cp1252")
+#"arrow" (padrão): pyarrow.csv multi-thread com colunas projetadas; "pandas": engine C do pandas
+FOCOS_CSV_ENGINES: tuple[str, ...] = ("arrow", "pandas")
+_ENCODING_SAMPLE_BYTES = 1 << 20
+#formatos testados numa amostra da coluna temporal antes do parse vetorizado com formato explícito
+_DATETIME_SAMPLE_ROWS = 200
+_YEARFIRST_DATETIME_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d",
+)
+_DAYFIRST_DATETIME_FORMATS: tuple[str, ...] = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+_MONTHFIRST_DATETIME_FORMATS: tuple[str, ...] = ("%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%m/%d/%Y")
+_MIN_ARROW_BLOCK_BYTES = 1 << 20
+_APPROX_FOCOS_ROW_BYTES = 200
+
+#agregados dos CSVs mensais do ano corrente em _cache/mensal/, com manifest próprio
+MONTH_CACHE_DIRNAME = "mensal"
+_FINGERPRINT_CHUNK_BYTES = 1 << 20
+
+#chave do payload anual com o cubo de contagens (FocosCounts) do qual as oito agregações derivam
+COUNT_CUBE_KEY = "count_cube"
+
+#células não nulas do cubo mês x UF x bioma; UF/bioma nulos = ausentes no CSV
+_YEAR_CACHE_SCHEMA = pa.schema(
+    [
+        ("period", pa.string()),
+        ("state", pa.string()),
+        ("biome", pa.string()),
+        ("value", pa.int64()),
+    ]
+)
+
 BIOME_LABELS: dict[str, dict[str, str]] = {
     "AMAZÔNIA": {"pt": "Amazônia", "en": "Amazon"},
     "CERRADO": {"pt": "Cerrado", "en": "Cerrado"},
@@ -38,7 +113,17 @@ def build_incremental_year_caches(
     biome_candidates: list[str],
     logger: Any,
     include_cached_payloads: bool = False,
+    max_workers: int | None = None,
+    cache_mirror: LocalObjectMirror | None = None,
 ) -> dict[str, Any]:
+    """Per-year aggregates of the focos ZIPs, reusing cached years whose source is unchanged.
+
+    Years that need rebuilding are aggregated on up to ``max_workers`` processes
+    (default: ``resolve_build_workers``); ``max_workers=1`` keeps everything in
+    this process. With ``cache_mirror`` cached years are read from local disk
+    when the mirrored copy matches the manifest entry, and only downloaded on a
+    miss or when another build wrote a newer version.
+    """
     cache_prefix = cache_prefix.rstrip("/")
     manifest_path = f"{cache_prefix}/incremental_manifest.json"
     build_signature = _build_signature(
@@ -59,6 +144,10 @@ def build_incremental_year_caches(
     reused_count = 0
     rebuilt_count = 0
 
+    #fase 1: reaproveita caches válidos e separa os anos que precisam ser reagregados
+    selected: list[tuple[Path, int, dict[str, Any], str]] = []
+    payload_by_name: dict[str, dict[str, Any]] = {}
+    to_rebuild: list[tuple[Path, dict[str, Any], str]] = []
     for zip_path in sorted(zip_files):
         inferred_year = _extract_year_from_name(zip_path.name)
         if inferred_year is None:
@@ -66,49 +155,56 @@ def build_incremental_year_caches(
             continue
 
         fingerprint = _build_source_fingerprint(zip_path)
-        cache_object_path = f"{cache_prefix}/yearly/{inferred_year}.json"
+        cache_object_path = year_cache_object_path(cache_prefix, inferred_year)
         cached_entry = manifest_files.get(zip_path.name, {})
+        selected.append((zip_path, inferred_year, fingerprint, cache_object_path))
 
-        payload: dict[str, Any] | None = None
-
+        cached_path = cached_entry.get("cache_object_path")
         if (
             cached_entry.get("fingerprint") == fingerprint
             and cached_entry.get("build_signature") == build_signature
-            and cached_entry.get("cache_object_path") == cache_object_path
+            and cached_path in {cache_object_path, year_cache_object_path(cache_prefix, inferred_year, "json")}
         ):
-            cached_payload = _download_json(storage, cache_object_path, logger)
+            cached_payload = _download_year_payload(
+                storage,
+                cached_path,
+                logger,
+                mirror=cache_mirror,
+                is_current=lambda payload, entry=cached_entry: _matches_manifest_entry(payload, entry),
+            )
             if _is_valid_year_payload(
                 payload=cached_payload,
                 inferred_year=inferred_year,
                 fingerprint=fingerprint,
                 build_signature=build_signature,
             ):
-                payload = cached_payload
-
-        if payload is None:
-            logger.info("Reprocessando agregado anual: %s", zip_path.name)
+                if cached_path != cache_object_path or COUNT_CUBE_KEY not in cached_payload:
+                    _upload_year_payload(storage, cache_object_path, cached_payload, mirror=cache_mirror)
+                    logger.info("Cache anual migrado para o cubo Parquet: %s", cache_object_path)
+                logger.info("Reutilizando agregado anual em cache: %s", zip_path.name)
+                payload_by_name[zip_path.name] = cached_payload
+                reused_count += 1
+                continue
 
-            payload = _build_year_payload(
-                zip_path=zip_path,
-                datetime_candidates=datetime_candidates,
-                state_candidates=state_candidates,
-                biome_candidates=biome_candidates,
-            )
-            payload["cache_schema_version"] = CACHE_SCHEMA_VERSION
-            payload["build_signature"] = build_signature
-            payload["fingerprint"] = fingerprint
-
-            storage.upload_bytes(
-                object_path=cache_object_path,
-                data=_to_bytes(payload),
-                content_type="application/json",
-                upsert=True,
-            )
-            rebuilt_count += 1
-        else:
-            logger.info("Reutilizando agregado anual em cache: %s", zip_path.name)
-            reused_count += 1
+        to_rebuild.append((zip_path, fingerprint, cache_object_path))
 
+    #fase 2: reagrega em processos (CPU-bound) e sobe cada ano assim que fica pronto
+    for zip_path, payload in _rebuild_year_payloads(
+        storage=storage,
+        to_rebuild=to_rebuild,
+        datetime_candidates=datetime_candidates,
+        state_candidates=state_candidates,
+        biome_candidates=biome_candidates,
+        build_signature=build_signature,
+        max_workers=max_workers,
+        logger=logger,
+        cache_mirror=cache_mirror,
+    ):
+        payload_by_name[zip_path.name] = payload
+        rebuilt_count += 1
+
+    for zip_path, inferred_year, fingerprint, cache_object_path in selected:
+        payload = payload_by_name[zip_path.name]
         year_payloads.append(payload)
         new_manifest_files[zip_path.name] = {
             "year": inferred_year,
@@ -117,6 +213,7 @@ def build_incremental_year_caches(
             "fingerprint": fingerprint,
             "row_count": int(payload.get("row_count", 0)),
             "processed_at": payload.get("processed_at"),
+            "format": YEAR_CACHE_FORMAT,
         }
 
     if include_cached_payloads:
@@ -133,7 +230,13 @@ def build_incremental_year_caches(
             if not isinstance(fingerprint, dict):
                 continue
 
-            cached_payload = _download_json(storage, cache_object_path, logger)
+            cached_payload = _download_year_payload(
+                storage,
+                cache_object_path,
+                logger,
+                mirror=cache_mirror,
+                is_current=lambda payload, entry=cached_entry: _matches_manifest_entry(payload, entry),
+            )
             if not _is_valid_year_payload(
                 payload=cached_payload,
                 inferred_year=inferred_year,
@@ -146,6 +249,11 @@ def build_incremental_year_caches(
                 continue
 
             logger.info("Reutilizando agregado anual histórico em cache: %s", file_name)
+            parquet_path = year_cache_object_path(cache_prefix, inferred_year)
+            if cache_object_path != parquet_path or COUNT_CUBE_KEY not in cached_payload:
+                _upload_year_payload(storage, parquet_path, cached_payload, mirror=cache_mirror)
+                logger.info("Cache anual migrado para o cubo Parquet: %s", parquet_path)
+                cached_entry = {**cached_entry, "cache_object_path": parquet_path, "format": YEAR_CACHE_FORMAT}
             year_payloads.append(cached_payload)
             new_manifest_files[file_name] = cached_entry
             reused_count += 1
@@ -169,6 +277,14 @@ def build_incremental_year_caches(
         upsert=True,
     )
 
+    #caches anuais JSON (formato anterior ao Parquet) saem depois do manifest novo
+    legacy_paths = _legacy_year_cache_paths(manifest, cache_prefix, new_manifest_files)
+    if legacy_paths:
+        logger.info("Removendo %d cache(s) anual(is) JSON legado(s)", len(legacy_paths))
+        delete_objects_best_effort(storage, legacy_paths, logger, what="cache(s) anual(is) JSON legado(s)")
+        for path in legacy_paths if cache_mirror is not None else []:
+            cache_mirror.discard(path)
+
     return {
         "year_payloads": sorted(
             year_payloads,
@@ -183,41 +299,285 @@ def build_incremental_year_caches(
     }
 
 
-def consolidate_year_payloads(
-    year_payloads: list[dict[str, Any]],
+def _legacy_year_cache_paths(
+    previous_manifest: dict[str, Any] | None,
+    cache_prefix: str,
+    new_manifest_files: dict[str, Any],
+) -> list[str]:
+    """JSON year caches the previous manifest referenced and the new one no longer does.
+
+    Reads the raw previous manifest (any schema version or build signature), so
+    caches left behind by a schema bump are removed too.
+    """
+    files = previous_manifest.get("files") if isinstance(previous_manifest, dict) else None
+    if not isinstance(files, dict):
+        return []
+    referenced = {entry.get("cache_object_path") for entry in new_manifest_files.values() if isinstance(entry, dict)}
+    legacy_prefix = f"{cache_prefix.rstrip('/')}/yearly/"
+    paths = {
+        path
+        for entry in files.values()
+        if isinstance(entry, dict)
+        and isinstance(path := entry.get("cache_object_path"), str)
+        and path.startswith(legacy_prefix)
+        and path.endswith(".json")
+        and path not in referenced
+    }
+    return sorted(paths)
+
+
+def resolve_build_workers(value: int | None = None) -> int:
+    """Worker processes for year rebuilds: explicit value, then FP_REPORT_BUILD_WORKERS, then CPUs."""
+    if value is None:
+        raw = os.getenv("FP_REPORT_BUILD_WORKERS", "").strip()
+        value = int(raw) if raw else (os.cpu_count() or 1)
+    return max(1, int(value))
+
+
+def _rebuild_year_payload(
+    zip_path: Path,
+    datetime_candidates: list[str],
+    state_candidates: list[str],
+    biome_candidates: list[str],
+    build_signature: str,
+    fingerprint: dict[str, Any],
 ) -> dict[str, Any]:
-    monthly_all_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("monthly_all", [])) for item in year_payloads],
-        key_cols=["period", "year"],
-    )
-    monthly_by_biome_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("monthly_by_biome", [])) for item in year_payloads],
-        key_cols=["period", "year", "biome"],
-    )
-    annual_all_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("annual_all", [])) for item in year_payloads],
-        key_cols=["year"],
-    )
-    annual_by_biome_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("annual_by_biome", [])) for item in year_payloads],
-        key_cols=["year", "biome"],
-    )
-    state_year_all_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("state_year_all", [])) for item in year_payloads],
-        key_cols=["year", "state"],
-    )
-    state_year_by_biome_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("state_year_by_biome", [])) for item in year_payloads],
-        key_cols=["year", "state", "biome"],
+    payload = _build_year_payload(
+        zip_path=zip_path,
+        datetime_candidates=datetime_candidates,
+        state_candidates=state_candidates,
+        biome_candidates=biome_candidates,
     )
-    state_month_all_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("state_month_all", [])) for item in year_payloads],
-        key_cols=["period", "year", "state"],
+    payload["cache_schema_version"] = CACHE_SCHEMA_VERSION
+    payload["build_signature"] = build_signature
+    payload["fingerprint"] = fingerprint
+    return payload
+
+
+def _rebuild_year_payloads(
+    *,
+    storage: Any,
+    to_rebuild: list[tuple[Path, dict[str, Any], str]],
+    datetime_candidates: list[str],
+    state_candidates: list[str],
+    biome_candidates: list[str],
+    build_signature: str,
+    max_workers: int | None,
+    logger: Any,
+    cache_mirror: LocalObjectMirror | None = None,
+) -> Iterator[tuple[Path, dict[str, Any]]]:
+    """Rebuild each year, yielding ``(zip_path, payload)`` in completion order.
+
+    The Parquet caches are uploaded in one ``upload_jobs`` batch once every year is
+    done (the storage's own ``upload_many`` handles client setup and the upload
+    index), before the caller writes the manifest that references them.
+    """
+    if not to_rebuild:
+        return
+    workers = min(resolve_build_workers(max_workers), len(to_rebuild))
+    args = (datetime_candidates, state_candidates, biome_candidates, build_signature)
+    jobs: list[UploadJob] = []
+
+    if workers == 1:
+        for zip_path, fingerprint, cache_object_path in to_rebuild:
+            logger.info("Reprocessando agregado anual: %s", zip_path.name)
+            payload = _rebuild_year_payload(zip_path, *args, fingerprint)
+            jobs.append(_year_payload_upload_job(cache_object_path, payload))
+            yield zip_path, payload
+    else:
+        logger.info("Reprocessando %d agregado(s) anual(is) em %d processo(s)", len(to_rebuild), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for zip_path, fingerprint, cache_object_path in to_rebuild:
+                logger.info("Reprocessando agregado anual: %s", zip_path.name)
+                future = pool.submit(_rebuild_year_payload, zip_path, *args, fingerprint)
+                futures[future] = (zip_path, cache_object_path)
+
+            for future in as_completed(futures):
+                zip_path, cache_object_path = futures[future]
+                payload = future.result()
+                jobs.append(_year_payload_upload_job(cache_object_path, payload))
+                yield zip_path, payload
+
+    upload_jobs(storage, jobs, logger=logger).raise_for_failures()
+    for job in jobs if cache_mirror is not None else []:
+        cache_mirror.write(job.object_path, job.data)
+
+
+def month_cache_object_path(cache_prefix: str, yyyymm: int) -> str:
+    return f"{cache_prefix.rstrip('/')}/{MONTH_CACHE_DIRNAME}/{yyyymm}.{YEAR_CACHE_FORMAT}"
+
+
+def build_incremental_month_caches(
+    storage: Any,
+    cache_prefix: str,
+    year: int,
+    month_files: dict[int, Path],
+    datetime_candidates: list[str],
+    state_candidates: list[str],
+    biome_candidates: list[str],
+    logger: Any,
+    *,
+    source_keys: dict[int, dict[str, Any] | None] | None = None,
+    fetch: Callable[[int], Path] | None = None,
+    satellite_candidates: list[str] | None = None,
+    reference_satellite: str | None = INPE_REFERENCE_SATELLITE,
+    force: bool = False,
+    cache_mirror: LocalObjectMirror | None = None,
+) -> dict[str, Any]:
+    """Per-month ``FocosCounts`` for the monthly CSVs of ``year``, reusing unchanged months.
+
+    With ``source_keys`` (listing size/Last-Modified per month) the listing is
+    authoritative: a month whose key matches the manifest is served from its
+    cache without downloading; otherwise ``fetch(month)`` downloads it. Without
+    ``source_keys`` the local ``month_files`` are used. Either way a file whose
+    content fingerprint (size + sha256) is unchanged is not re-aggregated.
+    ``force`` ignores the cache; ``cache_mirror`` works as in
+    ``build_incremental_year_caches``.
+    """
+    cache_prefix = cache_prefix.rstrip("/")
+    manifest_path = f"{cache_prefix}/{MONTH_CACHE_DIRNAME}_manifest.json"
+    build_signature = _build_signature(
+        datetime_candidates=datetime_candidates,
+        state_candidates=state_candidates,
+        biome_candidates=biome_candidates,
+        satellite_candidates=satellite_candidates,
+        reference_satellite=reference_satellite,
     )
-    state_month_by_biome_df = _merge_sum_frames(
-        [pd.DataFrame(item.get("state_month_by_biome", [])) for item in year_payloads],
-        key_cols=["period", "year", "state", "biome"],
+    manifest = None if force else _download_json(storage, manifest_path, logger)
+    cached_months = _extract_manifest_files(manifest=manifest, build_signature=build_signature)
+
+    def _cached_counts(entry: dict[str, Any], object_path: str, fingerprint: Any) -> FocosCounts | None:
+        if entry.get("cache_object_path") != object_path or entry.get("fingerprint") != fingerprint:
+            return None
+        payload = _download_year_payload(
+            storage,
+            object_path,
+            logger,
+            mirror=cache_mirror,
+            is_current=lambda cached: _matches_manifest_entry(cached, entry),
+        )
+        if not isinstance(payload, dict) or payload.get("build_signature") != build_signature:
+            return None
+        if payload.get("fingerprint") != fingerprint or payload.get("cache_schema_version") != CACHE_SCHEMA_VERSION:
+            return None
+        return year_payload_counts(payload)
+
+    months = sorted(source_keys) if source_keys is not None else sorted(month_files)
+    counts_by_month: dict[int, FocosCounts] = {}
+    new_entries: dict[str, Any] = {}
+    stats = {"reused_count": 0, "downloaded_count": 0, "rebuilt_count": 0}
+
+    for month in months:
+        yyyymm = year * 100 + month
+        object_path = month_cache_object_path(cache_prefix, yyyymm)
+        entry = cached_months.get(str(yyyymm)) or {}
+        source_key = source_keys.get(month) if source_keys is not None else entry.get("source_key")
+
+        if source_keys is not None and source_key is not None and entry.get("source_key") == source_key:
+            counts = _cached_counts(entry, object_path, entry.get("fingerprint"))
+            if counts is not None:
+                logger.info("Mensal INPE: %d inalterado na listagem, agregado reutilizado.", yyyymm)
+                counts_by_month[month] = counts
+                new_entries[str(yyyymm)] = entry
+                stats["reused_count"] += 1
+                continue
+
+        if source_keys is not None and fetch is not None:
+            path = fetch(month)
+            stats["downloaded_count"] += 1
+        else:
+            path = month_files.get(month)
+        if path is None or not Path(path).exists():
+            logger.warning("Mensal INPE: arquivo de %d indisponível, mês ignorado.", yyyymm)
+            continue
+
+        fingerprint = _file_content_fingerprint(Path(path))
+        if source_keys is None and entry.get("fingerprint") != fingerprint:
+            #arquivo local mudou: a chave da listagem guardada já não o descreve
+            source_key = None
+        counts = _cached_counts(entry, object_path, fingerprint)
+        if counts is not None:
+            logger.info("Mensal INPE: %s com conteúdo idêntico ao cache, agregado reutilizado.", Path(path).name)
+            stats["reused_count"] += 1
+        else:
+            logger.info("Mensal INPE: agregando %s.", Path(path).name)
+            counts, detected_columns = aggregate_focos_file(
+                Path(path),
+                datetime_candidates,
+                state_candidates,
+                biome_candidates,
+                satellite_candidates=satellite_candidates,
+                reference_satellite=reference_satellite,
+            )
+            payload = year_payload_from_counts(
+                counts,
+                detected_columns=detected_columns,
+                file_name=Path(path).name,
+                file_size_bytes=fingerprint["size_bytes"],
+                inferred_year=year,
+            )
+            payload.update(
+                {
+                    COUNT_CUBE_KEY: counts,
+                    "cache_schema_version": CACHE_SCHEMA_VERSION,
+                    "build_signature": build_signature,
+                    "fingerprint": fingerprint,
+                }
+            )
+            _upload_year_payload(storage, object_path, payload, mirror=cache_mirror)
+            entry = {"processed_at": payload["processed_at"]}
+            stats["rebuilt_count"] += 1
+
+        counts_by_month[month] = counts
+        new_entries[str(yyyymm)] = {
+            "file_name": Path(path).name,
+            "cache_object_path": object_path,
+            "source_key": source_key,
+            "fingerprint": fingerprint,
+            "row_count": counts.row_count,
+            "processed_at": entry.get("processed_at"),
+        }
+
+    storage.upload_bytes(
+        object_path=manifest_path,
+        data=_to_bytes(
+            {
+                "cache_schema_version": CACHE_SCHEMA_VERSION,
+                "build_signature": build_signature,
+                "cache_prefix": cache_prefix,
+                "year": year,
+                "files": new_entries,
+                "stats": stats,
+            }
+        ),
+        content_type="application/json",
+        upsert=True,
     )
+    return {"month_counts": counts_by_month, "cache_stats": {"cache_prefix": cache_prefix, **stats}}
+
+
+def _file_content_fingerprint(path: Path) -> dict[str, Any]:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_FINGERPRINT_CHUNK_BYTES), b""):
+            digest.update(block)
+    return {"size_bytes": int(path.stat().st_size), "sha256": digest.hexdigest()}
+
+
+def consolidate_year_payloads(
+    year_payloads: list[dict[str, Any]],
+) -> dict[str, Any]:
+    cube = FocosCounts.merge([year_payload_counts(item) for item in year_payloads])
+    merged = {name: cube.table(key_cols) for name, key_cols in AGGREGATION_KEY_COLUMNS.items()}
+    monthly_all_df = merged["monthly_all"]
+    monthly_by_biome_df = merged["monthly_by_biome"]
+    annual_all_df = merged["annual_all"]
+    annual_by_biome_df = merged["annual_by_biome"]
+    state_year_all_df = merged["state_year_all"]
+    state_year_by_biome_df = merged["state_year_by_biome"]
+    state_month_all_df = merged["state_month_all"]
+    state_month_by_biome_df = merged["state_month_by_biome"]
 
     available_biomes = sorted(
         {
@@ -321,6 +681,7 @@ def _build_signature(
     datetime_candidates: list[str],
     state_candidates: list[str],
     biome_candidates: list[str],
+    **extra: Any,
 ) -> str:
     payload = {
         "cache_schema_version": CACHE_SCHEMA_VERSION,
@@ -337,6 +698,8 @@ def _build_signature(
             "state_month_all",
             "state_month_by_biome",
         ],
+        #sem extras o payload (e o hash) dos caches anuais fica igual ao de antes
+        **extra,
     }
     raw = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
     return hashlib.sha256(raw).hexdigest()
@@ -392,116 +755,217 @@ def _is_valid_year_payload(
     return all(key in payload for key in required_keys)
 
 
-def _finish_year_payload_from_subset(
+class FocosCounts:
+    """Dense focos count cube indexed by (month, state, biome).
+
+    Labels are integer-coded as they first appear (``None`` is the "missing"
+    state/biome slot) and every chunk is folded in with a single ``bincount``.
+    The cube is the canonical aggregate: all views in ``AGGREGATION_KEY_COLUMNS``
+    are axis sums over it, and the year cache stores its non-zero cells.
+    """
+
+    _AXES = ("period_month", "state", "biome")
+
+    def __init__(self) -> None:
+        self._labels: tuple[list[str | None], ...] = ([], [], [])
+        self._codes: tuple[dict[str | None, int], ...] = ({}, {}, {})
+        self._cube = np.zeros((0, 0, 0), dtype=np.int64)
+
+    @property
+    def row_count(self) -> int:
+        return int(self._cube.sum())
+
+    @property
+    def period_min(self) -> str | None:
+        periods = self._present_labels(0)
+        return min(periods) if periods else None
+
+    @property
+    def period_max(self) -> str | None:
+        periods = self._present_labels(0)
+        return max(periods) if periods else None
+
+    @property
+    def biomes(self) -> set[str]:
+        return set(self._present_labels(2))
+
+    def _present_labels(self, axis: int) -> list[str]:
+        other = tuple(i for i in range(3) if i != axis)
+        totals = self._cube.sum(axis=other)
+        return [
+            label
+            for label, total in zip(self._labels[axis], totals.tolist())
+            if label is not None and total > 0
+        ]
+
+    def _label_code(self, axis: int, label: str | None) -> int:
+        codes = self._codes[axis]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(self._labels[axis])
+            self._labels[axis].append(label)
+        return code
+
+    def _axis_codes(self, axis: int, values: pd.Series) -> np.ndarray:
+        local, uniques = pd.factorize(values)
+        mapping = [self._label_code(axis, str(u)) for u in uniques]
+        #código -1 (ausente) indexa a última posição do mapping
+        if (local < 0).any():
+            mapping.append(self._label_code(axis, None))
+        return np.asarray(mapping, dtype=np.int64)[local]
+
+    def _fold(self, frame: pd.DataFrame, weights: np.ndarray | None = None) -> None:
+        if frame.empty:
+            return
+        coords = tuple(self._axis_codes(axis, frame[col]) for axis, col in enumerate(self._AXES))
+        shape = tuple(len(labels) for labels in self._labels)
+        if shape != self._cube.shape:
+            grown = np.zeros(shape, dtype=np.int64)
+            grown[tuple(slice(0, n) for n in self._cube.shape)] = self._cube
+            self._cube = grown
+        flat = np.ravel_multi_index(coords, shape)
+        counts = np.bincount(flat, weights=weights, minlength=int(np.prod(shape)))
+        self._cube += counts.astype(np.int64).reshape(shape)
+
+    def add(self, subset: pd.DataFrame) -> None:
+        self._fold(subset)
+
+    @classmethod
+    def from_cells(cls, cells: pd.DataFrame) -> FocosCounts:
+        """Cube from a long table with ``period_month``, ``state``, ``biome`` and ``value``."""
+        counts = cls()
+        if not cells.empty:
+            counts._fold(cells, weights=pd.to_numeric(cells["value"]).to_numpy(dtype=np.float64))
+        return counts
+
+    @classmethod
+    def merge(cls, parts: list[FocosCounts]) -> FocosCounts:
+        frames = [part.cells() for part in parts]
+        frames = [frame for frame in frames if not frame.empty]
+        return cls.from_cells(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
+
+    @classmethod
+    def from_year_payload(cls, payload: dict[str, Any]) -> FocosCounts:
+        """Rebuild the cube from the four monthly views of a legacy payload (inclusion-exclusion)."""
+        by_pair = _aggregation_frame(payload, "state_month_by_biome")
+        by_state = _aggregation_frame(payload, "state_month_all")
+        by_biome = _aggregation_frame(payload, "monthly_by_biome")
+        total = _aggregation_frame(payload, "monthly_all")
+
+        def _sum(frame: pd.DataFrame, keys: list[str]) -> pd.Series:
+            if frame.empty:
+                return pd.Series(dtype="int64")
+            values = pd.to_numeric(frame["value"]).astype("int64")
+            return values.groupby([frame[key].astype(str) for key in keys]).sum()
+
+        pair = _sum(by_pair, ["period", "state", "biome"])
+        state_only = _sum(by_state, ["period", "state"]).sub(
+            pair.groupby(level=[0, 1]).sum() if not pair.empty else pd.Series(dtype="int64"), fill_value=0
+        )
+        biome_only = _sum(by_biome, ["period", "biome"]).sub(
+            pair.groupby(level=[0, 2]).sum() if not pair.empty else pd.Series(dtype="int64"), fill_value=0
+        )
+        neither = (
+            _sum(total, ["period"])
+            .sub(state_only.groupby(level=0).sum() if not state_only.empty else pd.Series(dtype="int64"), fill_value=0)
+            .sub(biome_only.groupby(level=0).sum() if not biome_only.empty else pd.Series(dtype="int64"), fill_value=0)
+            .sub(pair.groupby(level=0).sum() if not pair.empty else pd.Series(dtype="int64"), fill_value=0)
+        )
+
+        rows: list[tuple[str, str | None, str | None, int]] = []
+        rows += [(p, s, b, v) for (p, s, b), v in pair.items()]
+        rows += [(p, s, None, v) for (p, s), v in state_only.items()]
+        rows += [(p, None, b, v) for (p, b), v in biome_only.items()]
+        rows += [(p, None, None, v) for p, v in neither.items()]
+        cells = pd.DataFrame(
+            [row for row in rows if row[3] > 0],
+            columns=["period_month", "state", "biome", "value"],
+        )
+        return cls.from_cells(cells)
+
+    def cells(self) -> pd.DataFrame:
+        """Non-zero cells as ``period_month, year, state, biome, value`` (missing labels are NA)."""
+        p, s, b = np.nonzero(self._cube)
+        labels = [np.asarray(axis_labels, dtype=object) for axis_labels in self._labels]
+        periods = labels[0][p] if len(p) else np.asarray([], dtype=object)
+        return pd.DataFrame(
+            {
+                "period_month": pd.Series(periods, dtype="string"),
+                "year": pd.Series([int(str(x)[:4]) for x in periods], dtype="int64"),
+                "state": pd.Series(labels[1][s] if len(s) else [], dtype="string"),
+                "biome": pd.Series(labels[2][b] if len(b) else [], dtype="string"),
+                "value": self._cube[p, s, b].astype("int64"),
+            }
+        )
+
+    def table(self, key_cols: list[str]) -> pd.DataFrame:
+        """Counts summed by ``key_cols`` (``period`` is the month, ``year`` comes from it).
+
+        Missing state/biome slots are dropped when grouping by that column, like
+        ``dropna`` on the raw subset; otherwise the axis is summed away.
+        """
+        cube = self._cube
+        axis_labels: list[np.ndarray] = [np.asarray(labels, dtype=object) for labels in self._labels]
+        for axis, col in ((1, "state"), (2, "biome")):
+            if col in key_cols:
+                keep = np.asarray([label is not None for label in self._labels[axis]], dtype=bool)
+                cube = np.compress(keep, cube, axis=axis)
+                axis_labels[axis] = axis_labels[axis][keep]
+            else:
+                cube = cube.sum(axis=axis, keepdims=True)
+                axis_labels[axis] = np.asarray([None], dtype=object)
+
+        periods = axis_labels[0]
+        years = np.asarray([int(str(label)[:4]) for label in periods], dtype=np.int64)
+        if "period" not in key_cols:
+            year_values, inverse = np.unique(years, return_inverse=True)
+            by_year = np.zeros((len(year_values), *cube.shape[1:]), dtype=np.int64)
+            np.add.at(by_year, inverse, cube)
+            cube, years, periods = by_year, year_values, None
+
+        i, j, k = np.nonzero(cube)
+        columns: dict[str, Any] = {}
+        for col in key_cols:
+            if col == "period":
+                columns[col] = pd.Series(periods[i] if periods is not None else [], dtype=object).astype(str)
+            elif col == "year":
+                columns[col] = pd.Series(years[i], dtype="int64")
+            elif col == "state":
+                columns[col] = pd.Series(axis_labels[1][j], dtype=object).astype(str)
+            elif col == "biome":
+                columns[col] = pd.Series(axis_labels[2][k], dtype=object).astype(str)
+        columns["value"] = pd.Series(cube[i, j, k], dtype="int64")
+        out = pd.DataFrame(columns, columns=[*key_cols, "value"])
+        return out.sort_values(key_cols).reset_index(drop=True) if not out.empty else out
+
+
+def year_payload_from_counts(
+    counts: FocosCounts,
     *,
-    subset: pd.DataFrame,
     detected_columns: dict[str, str],
     file_name: str,
     file_size_bytes: int,
     inferred_year: int | None,
 ) -> dict[str, Any]:
-    monthly_all = (
-        subset.groupby(["period_month", "year"])
-        .size()
-        .rename("value")
-        .reset_index()
-        .rename(columns={"period_month": "period"})
-    )
-    monthly_all["period"] = monthly_all["period"].astype(str)
-
-    monthly_by_biome = (
-        subset.dropna(subset=["biome"])
-        .groupby(["period_month", "year", "biome"])
-        .size()
-        .rename("value")
-        .reset_index()
-        .rename(columns={"period_month": "period"})
-    )
-    monthly_by_biome["period"] = monthly_by_biome["period"].astype(str)
-
-    annual_all = (
-        subset.groupby(["year"])
-        .size()
-        .rename("value")
-        .reset_index()
-    )
-
-    annual_by_biome = (
-        subset.dropna(subset=["biome"])
-        .groupby(["year", "biome"])
-        .size()
-        .rename("value")
-        .reset_index()
-    )
-
-    state_year_all = (
-        subset.dropna(subset=["state"])
-        .groupby(["year", "state"])
-        .size()
-        .rename("value")
-        .reset_index()
-    )
-
-    state_year_by_biome = (
-        subset.dropna(subset=["state", "biome"])
-        .groupby(["year", "state", "biome"])
-        .size()
-        .rename("value")
-        .reset_index()
-    )
-
-    state_month_all = (
-        subset.dropna(subset=["state"])
-        .groupby(["period_month", "year", "state"])
-        .size()
-        .rename("value")
-        .reset_index()
-        .rename(columns={"period_month": "period"})
-    )
-    state_month_all["period"] = state_month_all["period"].astype(str)
-
-    state_month_by_biome = (
-        subset.dropna(subset=["state", "biome"])
-        .groupby(["period_month", "year", "state", "biome"])
-        .size()
-        .rename("value")
-        .reset_index()
-        .rename(columns={"period_month": "period"})
-    )
-    state_month_by_biome["period"] = state_month_by_biome["period"].astype(str)
-
-    available_biomes = sorted(
-        {
-            str(biome).strip()
-            for biome in subset["biome"].dropna().unique().tolist()
-            if str(biome).strip()
-        }
-    )
-
-    return {
+    payload: dict[str, Any] = {
         "file_name": file_name,
         "file_size_bytes": file_size_bytes,
         "inferred_year": inferred_year,
-        "row_count": int(len(subset)),
-        "month_span_min": str(subset["period_month"].min()),
-        "month_span_max": str(subset["period_month"].max()),
+        "row_count": counts.row_count,
+        "month_span_min": counts.period_min,
+        "month_span_max": counts.period_max,
         "detected_datetime_column": detected_columns["datetime"],
         "detected_state_column": detected_columns["state"],
         "detected_biome_column": detected_columns["biome"],
-        "available_biomes": available_biomes,
-        "monthly_all": _df_to_records(monthly_all),
-        "monthly_by_biome": _df_to_records(monthly_by_biome),
-        "annual_all": _df_to_records(annual_all),
-        "annual_by_biome": _df_to_records(annual_by_biome),
-        "state_year_all": _df_to_records(state_year_all),
-        "state_year_by_biome": _df_to_records(state_year_by_biome),
-        "state_month_all": _df_to_records(state_month_all),
-        "state_month_by_biome": _df_to_records(state_month_by_biome),
-        "processed_at": _now_iso(),
+        "available_biomes": sorted({b.strip() for b in counts.biomes if b.strip()}),
     }
+    for name, key_cols in AGGREGATION_KEY_COLUMNS.items():
+        payload[name] = _df_to_records(counts.table(key_cols)) if counts.row_count else []
+    payload["processed_at"] = _now_iso()
+    return payload
 
 
-def _read_csv_path_subset(
+def aggregate_focos_file(
     path: Path,
     datetime_candidates: list[str],
     state_candidates: list[str],
@@ -509,43 +973,29 @@ def _read_csv_path_subset(
     *,
     satellite_candidates: list[str] | None = None,
     reference_satellite: str | None = None,
-) -> tuple[pd.DataFrame, dict[str, str]]:
-    delimiter = _detect_delimiter_path(path)
-    header_df = _read_path_csv(path, delimiter, nrows=0)
-    header_cols = list(header_df.columns)
-    columns = detect_columns_from_header(
-        header_cols,
+    chunk_rows: int = DEFAULT_FOCOS_CHUNK_ROWS,
+    engine: str | None = None,
+) -> tuple[FocosCounts, dict[str, str]]:
+    """Stream a focos CSV (or ZIP with one CSV) into ``FocosCounts`` in ``chunk_rows`` chunks.
+
+    ``engine`` picks the CSV reader (see ``resolve_focos_csv_engine``).
+    """
+    layout = _focos_csv_layout(
+        path,
         datetime_candidates,
         state_candidates,
         biome_candidates,
+        satellite_candidates=satellite_candidates,
+        reference_satellite=reference_satellite,
     )
-    dt_col = columns["datetime"]
-    state_col = columns["state"]
-    biome_col = columns["biome"]
-    usecols = [dt_col, state_col, biome_col]
-    sat_col: str | None = None
-    if reference_satellite and satellite_candidates:
-        sat_col = _pick_column(header_cols, satellite_candidates)
-    if sat_col:
-        usecols.append(sat_col)
-    df = _read_path_csv(path, delimiter, usecols=usecols)
-    if sat_col and reference_satellite:
-        df = _filter_df_by_reference_satellite(df, sat_col, reference_satellite)
-        df = df[[dt_col, state_col, biome_col]]
-    df = df.rename(
-        columns={
-            dt_col: "raw_datetime",
-            state_col: "raw_state",
-            biome_col: "raw_biome",
-        }
-    ).copy()
-    dayfirst = _datetime_dayfirst_for_column(dt_col)
-    out = _normalized_focos_subset_from_raw_columns(df, dayfirst=dayfirst)
-    return out, {
-        "datetime": dt_col,
-        "state": state_col,
-        "biome": biome_col,
-    }
+    counts = _fold_focos_chunks(
+        layout,
+        FocosCounts,
+        reference_satellite=reference_satellite,
+        chunk_rows=chunk_rows,
+        engine=engine,
+    )
+    return counts, layout.columns
 
 
 def build_year_payload_from_csv(
@@ -561,7 +1011,7 @@ def build_year_payload_from_csv(
     Mesmo agregado que _build_year_payload, lendo CSV em disco (ex.: data/inpe_bdqueimadas/anual/).
     Usa data_pas em ISO (YYYY-MM-DD HH:mm:ss) quando presente - alinhado a contagens SQL no arquivo.
     """
-    subset, detected_columns = _read_csv_path_subset(
+    counts, detected_columns = aggregate_focos_file(
         csv_path,
         datetime_candidates,
         state_candidates,
@@ -569,30 +1019,8 @@ def build_year_payload_from_csv(
         satellite_candidates=satellite_candidates,
         reference_satellite=reference_satellite,
     )
-
-    if subset.empty:
-        return {
-            "file_name": csv_path.name,
-            "file_size_bytes": int(csv_path.stat().st_size),
-            "inferred_year": _extract_year_from_name(csv_path.name),
-            "row_count": 0,
-            "month_span_min": None,
-            "month_span_max": None,
-            "detected_datetime_column": detected_columns["datetime"],
-            "detected_state_column": detected_columns["state"],
-            "detected_biome_column": detected_columns["biome"],
-            "available_biomes": [],
-            "monthly_all": [],
-            "monthly_by_biome": [],
-            "annual_all": [],
-            "annual_by_biome": [],
-            "state_year_all": [],
-            "state_year_by_biome": [],
-            "processed_at": _now_iso(),
-        }
-
-    return _finish_year_payload_from_subset(
-        subset=subset,
+    return year_payload_from_counts(
+        counts,
         detected_columns=detected_columns,
         file_name=csv_path.name,
         file_size_bytes=int(csv_path.stat().st_size),
@@ -609,108 +1037,398 @@ def _build_year_payload(
     satellite_candidates: list[str] | None = None,
     reference_satellite: str | None = None,
 ) -> dict[str, Any]:
-    subset, detected_columns = _read_zip_subset(
-        zip_path=zip_path,
-        datetime_candidates=datetime_candidates,
-        state_candidates=state_candidates,
-        biome_candidates=biome_candidates,
+    counts, detected_columns = aggregate_focos_file(
+        zip_path,
+        datetime_candidates,
+        state_candidates,
+        biome_candidates,
         satellite_candidates=satellite_candidates,
         reference_satellite=reference_satellite,
     )
-
-    if subset.empty:
-        return {
-            "file_name": zip_path.name,
-            "file_size_bytes": int(zip_path.stat().st_size),
-            "inferred_year": _extract_year_from_name(zip_path.name),
-            "row_count": 0,
-            "month_span_min": None,
-            "month_span_max": None,
-            "detected_datetime_column": detected_columns["datetime"],
-            "detected_state_column": detected_columns["state"],
-            "detected_biome_column": detected_columns["biome"],
-            "available_biomes": [],
-            "monthly_all": [],
-            "monthly_by_biome": [],
-            "annual_all": [],
-            "annual_by_biome": [],
-            "state_year_all": [],
-            "state_year_by_biome": [],
-            "processed_at": _now_iso(),
-        }
-
-    return _finish_year_payload_from_subset(
-        subset=subset,
+    payload = year_payload_from_counts(
+        counts,
         detected_columns=detected_columns,
         file_name=zip_path.name,
         file_size_bytes=int(zip_path.stat().st_size),
         inferred_year=_extract_year_from_name(zip_path.name),
     )
+    payload[COUNT_CUBE_KEY] = counts
+    return payload
 
 
-def _read_zip_subset(
-    zip_path: Path,
+@dataclass(frozen=True)
+class _FocosCsvLayout:
+    path: Path
+    member: str | None
+    delimiter: str
+    columns: dict[str, str]
+    satellite_column: str | None = None
+
+    @property
+    def usecols(self) -> list[str]:
+        cols = [self.columns["datetime"], self.columns["state"], self.columns["biome"]]
+        if self.satellite_column:
+            cols.append(self.satellite_column)
+        return cols
+
+
+def _focos_csv_layout(
+    path: Path,
     datetime_candidates: list[str],
     state_candidates: list[str],
     biome_candidates: list[str],
     *,
     satellite_candidates: list[str] | None = None,
     reference_satellite: str | None = None,
-) -> tuple[pd.DataFrame, dict[str, str]]:
-    with zipfile.ZipFile(zip_path) as zf:
-        member = _pick_member(zf)
-        delimiter = _detect_delimiter(zf, member)
-        header_df = _read_member_csv(
-            zf=zf,
-            member=member,
-            delimiter=delimiter,
-            nrows=0,
-        )
-        header_cols = list(header_df.columns)
-        columns = detect_columns_from_header(
-            header_cols,
-            datetime_candidates,
-            state_candidates,
-            biome_candidates,
+) -> _FocosCsvLayout:
+    member: str | None = None
+    if path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as zf:
+            member = _pick_member(zf)
+            delimiter = _detect_delimiter(zf, member)
+            header_df = _read_member_csv(zf=zf, member=member, delimiter=delimiter, nrows=0)
+    else:
+        delimiter = _detect_delimiter_path(path)
+        header_df = _read_path_csv(path, delimiter, nrows=0)
+
+    header_cols = list(header_df.columns)
+    columns = detect_columns_from_header(
+        header_cols,
+        datetime_candidates,
+        state_candidates,
+        biome_candidates,
+    )
+    sat_col: str | None = None
+    if reference_satellite and satellite_candidates:
+        sat_col = _pick_column(header_cols, satellite_candidates)
+    return _FocosCsvLayout(
+        path=path,
+        member=member,
+        delimiter=delimiter,
+        columns=columns,
+        satellite_column=sat_col,
+    )
+
+
+@dataclass
+class _SkippedRows:
+    """Rows dropped by the CSV readers because their field count differs from the header."""
+
+    count: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, n: int = 1) -> None:
+        #o handler do pyarrow roda nas threads do leitor
+        with self._lock:
+            self.count += n
+
+
+def _csv_field_count(line: bytes, delimiter: bytes) -> int:
+    if b'"' not in line:
+        return line.count(delimiter) + 1
+    #latin-1 preserva os bytes; utf-8/latin-1/cp1252 compartilham ASCII (aspas e delimitador)
+    return len(next(csv.reader([line.decode("latin-1")], delimiter=delimiter.decode("ascii")), []))
+
+
+class _FieldCountFilter(io.RawIOBase):
+    """Binary CSV stream without the rows whose field count differs from the header's.
+
+    Gives the pandas engine the row policy of pyarrow's ``invalid_row_handler``
+    (pandas pads short rows with nulls and, with ``usecols``, keeps long ones).
+    Like pyarrow with ``newlines_in_values=False``, quoted newlines are not
+    supported: each physical line is one row. Blank lines pass through.
+    """
+
+    def __init__(self, raw: IO[bytes], delimiter: str, skipped: _SkippedRows) -> None:
+        super().__init__()
+        self._raw = raw
+        self._delimiter = delimiter.encode("ascii")
+        self._skipped = skipped
+        header = raw.readline()
+        self._expected = _csv_field_count(header.rstrip(b"\r\n"), self._delimiter)
+        self._buffer = bytearray(header)
+        self._carry = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _valid_lines(self, block: bytes) -> bytes:
+        #caminho rápido: sem aspas, confere o número de delimitadores de todas as linhas com numpy
+        if b'"' not in block:
+            arr = np.frombuffer(block, dtype=np.uint8)
+            ends = np.flatnonzero(arr == 0x0A)
+            delims_before_end = np.searchsorted(np.flatnonzero(arr == self._delimiter[0]), ends)
+            per_line = np.diff(delims_before_end, prepend=0)
+            lengths = np.diff(ends, prepend=-1)
+            blank = (lengths == 1) | ((lengths == 2) & (arr[ends - 1] == 0x0D))
+            if bool(np.all((per_line == self._expected - 1) | blank)):
+                return block
+        kept = bytearray()
+        for line in block.splitlines(keepends=True):
+            body = line.rstrip(b"\r\n")
+            if body and _csv_field_count(body, self._delimiter) != self._expected:
+                self._skipped.add()
+                continue
+            kept += line
+        return bytes(kept)
+
+    def readinto(self, b: Any) -> int:
+        want = len(b)
+        while len(self._buffer) < want and not self._eof:
+            data = self._raw.read(max(want, _MIN_ARROW_BLOCK_BYTES))
+            if not data:
+                self._eof = True
+                block = self._carry + b"\n" if self._carry else b""
+                self._carry = b""
+            else:
+                data = self._carry + data
+                cut = data.rfind(b"\n") + 1
+                block, self._carry = data[:cut], data[cut:]
+            if block:
+                self._buffer += self._valid_lines(block)
+        n = min(want, len(self._buffer))
+        b[:n] = self._buffer[:n]
+        del self._buffer[:n]
+        return n
+
+
+@contextmanager
+def _open_focos_bytes(layout: _FocosCsvLayout) -> Iterator[IO[bytes]]:
+    if layout.member is None:
+        with open(layout.path, "rb") as f:
+            yield f
+    else:
+        with zipfile.ZipFile(layout.path) as zf, zf.open(layout.member) as f:
+            yield f
+
+
+def resolve_focos_csv_engine(value: str | None = None) -> str:
+    """CSV engine for focos files: explicit value, then FP_FOCOS_CSV_ENGINE, then ``arrow``."""
+    norm = str(value or os.getenv("FP_FOCOS_CSV_ENGINE", "") or "arrow").strip().lower()
+    if norm not in FOCOS_CSV_ENGINES:
+        raise ValueError(f"Engine CSV inválida: {value!r}. Use uma de {FOCOS_CSV_ENGINES}.")
+    return norm
+
+
+def _sniff_focos_encoding(layout: _FocosCsvLayout) -> str:
+    """First entry of FOCOS_CSV_ENCODINGS that decodes a leading sample of the file."""
+    with _open_focos_bytes(layout) as f:
+        sample = f.read(_ENCODING_SAMPLE_BYTES)
+    for encoding in FOCOS_CSV_ENCODINGS:
+        try:
+            #decoder incremental: um caractere multibyte cortado no fim da amostra não conta como erro
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return FOCOS_CSV_ENCODINGS[-1]
+
+
+def _raw_focos_frames_pandas(
+    layout: _FocosCsvLayout,
+    *,
+    encoding: str,
+    chunk_rows: int,
+    skipped: _SkippedRows | None = None,
+) -> Iterator[pd.DataFrame]:
+    skipped = skipped if skipped is not None else _SkippedRows()
+    with _open_focos_bytes(layout) as raw, io.BufferedReader(
+        _FieldCountFilter(raw, layout.delimiter, skipped), buffer_size=_MIN_ARROW_BLOCK_BYTES
+    ) as f, pd.read_csv(
+        f,
+        sep=layout.delimiter,
+        encoding=encoding,
+        usecols=layout.usecols,
+        dtype="string",
+        on_bad_lines="skip",
+        chunksize=max(1, int(chunk_rows)),
+    ) as reader:
+        yield from reader
+
+
+def _raw_focos_frames_arrow(
+    layout: _FocosCsvLayout,
+    *,
+    encoding: str,
+    chunk_rows: int,
+    reference_satellite: str | None = None,
+    skipped: _SkippedRows | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Stream record batches with pyarrow: projected columns only, labels dictionary-encoded.
+
+    With ``reference_satellite`` rows of other satellites are dropped from each
+    batch on its dictionary codes, before the batch is converted to pandas.
+    Rows with a wrong field count are skipped and counted in ``skipped``.
+    """
+    skipped = skipped if skipped is not None else _SkippedRows()
+
+    def skip_invalid_row(_row: Any) -> str:
+        skipped.add()
+        return "skip"
+
+    label_type = pa.dictionary(pa.int32(), pa.string())
+    column_types = {col: label_type for col in layout.usecols}
+    column_types[layout.columns["datetime"]] = pa.string()
+    read_options = pa_csv.ReadOptions(
+        encoding=encoding,
+        use_threads=True,
+        block_size=max(_MIN_ARROW_BLOCK_BYTES, int(chunk_rows) * _APPROX_FOCOS_ROW_BYTES),
+    )
+    parse_options = pa_csv.ParseOptions(
+        delimiter=layout.delimiter,
+        invalid_row_handler=skip_invalid_row,
+    )
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=layout.usecols,
+        column_types=column_types,
+        strings_can_be_null=True,
+    )
+    with _open_focos_bytes(layout) as f:
+        reader = pa_csv.open_csv(
+            f,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
         )
+        for batch in reader:
+            if layout.satellite_column and reference_satellite:
+                batch = _arrow_reference_satellite_filter(batch, layout.satellite_column, reference_satellite)
+            yield batch.to_pandas()
+
 
-        dt_col = columns["datetime"]
-        state_col = columns["state"]
-        biome_col = columns["biome"]
-
-        usecols = [dt_col, state_col, biome_col]
-        sat_col: str | None = None
-        if reference_satellite and satellite_candidates:
-            sat_col = _pick_column(header_cols, satellite_candidates)
-        if sat_col:
-            usecols.append(sat_col)
-
-        df = _read_member_csv(
-            zf=zf,
-            member=member,
-            delimiter=delimiter,
-            usecols=usecols,
+def _raw_focos_frames(
+    layout: _FocosCsvLayout,
+    *,
+    engine: str,
+    encoding: str,
+    reference_satellite: str | None,
+    chunk_rows: int,
+    skipped: _SkippedRows | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Projected raw chunks of a focos CSV, already restricted to ``reference_satellite``.
+
+    Both engines drop rows whose field count differs from the header (counted in ``skipped``).
+    """
+    if engine == "arrow":
+        #filtro de satélite empurrado para o leitor arrow
+        yield from _raw_focos_frames_arrow(
+            layout,
+            encoding=encoding,
+            chunk_rows=chunk_rows,
+            reference_satellite=reference_satellite,
+            skipped=skipped,
         )
+        return
+    for df in _raw_focos_frames_pandas(layout, encoding=encoding, chunk_rows=chunk_rows, skipped=skipped):
+        if layout.satellite_column and reference_satellite:
+            df = _filter_df_by_reference_satellite(df, layout.satellite_column, reference_satellite)
+        yield df
 
-    if sat_col and reference_satellite:
-        df = _filter_df_by_reference_satellite(df, sat_col, reference_satellite)
-        df = df[[dt_col, state_col, biome_col]]
 
-    df = df.rename(
+def _normalize_raw_focos_frame(df: pd.DataFrame, layout: _FocosCsvLayout, *, dayfirst: bool) -> pd.DataFrame:
+    df = df[[layout.columns["datetime"], layout.columns["state"], layout.columns["biome"]]].rename(
         columns={
-            dt_col: "raw_datetime",
-            state_col: "raw_state",
-            biome_col: "raw_biome",
+            layout.columns["datetime"]: "raw_datetime",
+            layout.columns["state"]: "raw_state",
+            layout.columns["biome"]: "raw_biome",
         }
-    ).copy()
+    )
+    return _normalized_focos_subset_from_raw_columns(df, dayfirst=dayfirst)
 
-    dayfirst = _datetime_dayfirst_for_column(dt_col)
-    out = _normalized_focos_subset_from_raw_columns(df, dayfirst=dayfirst)
-    return out, {
-        "datetime": dt_col,
-        "state": state_col,
-        "biome": biome_col,
-    }
+
+def _iter_focos_chunks(
+    layout: _FocosCsvLayout,
+    *,
+    engine: str,
+    encoding: str,
+    reference_satellite: str | None,
+    chunk_rows: int,
+    skipped: _SkippedRows | None = None,
+) -> Iterator[pd.DataFrame]:
+    dayfirst = _datetime_dayfirst_for_column(layout.columns["datetime"])
+    for df in _raw_focos_frames(
+        layout,
+        engine=engine,
+        encoding=encoding,
+        reference_satellite=reference_satellite,
+        chunk_rows=chunk_rows,
+        skipped=skipped,
+    ):
+        yield _normalize_raw_focos_frame(df, layout, dayfirst=dayfirst)
+
+
+#erros de leitura que justificam tentar outro encoding/engine
+_FOCOS_READ_ERRORS: tuple[type[Exception], ...] = (UnicodeDecodeError, pa.ArrowInvalid, pd.errors.ParserError)
+
+
+def _fold_focos_chunks(
+    layout: _FocosCsvLayout,
+    sink_factory: Callable[[], Any],
+    *,
+    reference_satellite: str | None,
+    chunk_rows: int,
+    engine: str | None = None,
+) -> Any:
+    """Feed every normalized chunk to ``sink.add``.
+
+    The encoding is sniffed once from a sample; only if reading still fails with a
+    decode/parse error (``_FOCOS_READ_ERRORS``) does it restart on the next
+    encoding with a fresh sink, and the arrow engine finally falls back to pandas.
+    Errors raised by ``sink.add`` propagate unchanged.
+    """
+    source = layout.member or layout.path
+    engine = resolve_focos_csv_engine(engine)
+    sniffed = _sniff_focos_encoding(layout)
+    encodings = FOCOS_CSV_ENCODINGS[FOCOS_CSV_ENCODINGS.index(sniffed):]
+    attempts = [(engine, encoding) for encoding in encodings]
+    if engine != "pandas":
+        attempts.append(("pandas", sniffed))
+
+    last_error: Exception | None = None
+    for attempt_engine, encoding in attempts:
+        #sink novo a cada tentativa: nada da leitura abortada chega ao resultado
+        sink = sink_factory()
+        skipped = _SkippedRows()
+        chunks = _iter_focos_chunks(
+            layout,
+            engine=attempt_engine,
+            encoding=encoding,
+            reference_satellite=reference_satellite,
+            chunk_rows=chunk_rows,
+            skipped=skipped,
+        )
+        try:
+            while True:
+                #só a leitura fica no try; o fold (sink.add) fica fora
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except _FOCOS_READ_ERRORS as e:
+                    last_error = e
+                    sink = None
+                    break
+                sink.add(chunk)
+        finally:
+            chunks.close()
+        if sink is None:
+            continue
+        if skipped.count:
+            LOG.warning(
+                "Linhas com número de campos inválido ignoradas em %s: %d (engine=%s)",
+                source,
+                skipped.count,
+                attempt_engine,
+            )
+        return sink
+
+    raise RuntimeError(f"Falha ao ler {source} com encodings suportados.") from last_error
+
+
+class _ChunkList(list):
+    def add(self, chunk: pd.DataFrame) -> None:
+        self.append(chunk)
 
 
 def _datetime_dayfirst_for_column(dt_col: str) -> bool:
@@ -724,28 +1442,10 @@ def _normalized_focos_subset_from_raw_columns(
     *,
     dayfirst: bool = True,
 ) -> pd.DataFrame:
-    dt = pd.to_datetime(
-        df["raw_datetime"].astype("string").str.strip(),
-        errors="coerce",
-        dayfirst=dayfirst,
-        format="mixed",
-    )
-
-    state = (
-        df["raw_state"]
-        .astype("string")
-        .str.strip()
-        .str.upper()
-        .replace({"": pd.NA, "NAN": pd.NA, "NONE": pd.NA})
-    )
+    dt = _parse_focos_datetimes(df["raw_datetime"], dayfirst=dayfirst)
 
-    biome = (
-        df["raw_biome"]
-        .astype("string")
-        .str.strip()
-        .str.upper()
-        .replace({"": pd.NA, "NAN": pd.NA, "NONE": pd.NA})
-    )
+    state = _normalize_label_column(df["raw_state"])
+    biome = _normalize_label_column(df["raw_biome"])
 
     out = pd.DataFrame(
         {
@@ -756,11 +1456,75 @@ def _normalized_focos_subset_from_raw_columns(
     ).dropna(subset=["datetime"])
 
     out["year"] = out["datetime"].dt.year.astype(int)
-    out["period_month"] = out["datetime"].dt.to_period("M").astype(str)
+    out["period_month"] = _period_month_labels(out["year"], out["datetime"].dt.month)
 
     return out[["datetime", "year", "period_month", "state", "biome"]]
 
 
+def _sniff_datetime_format(text: pd.Series, *, dayfirst: bool) -> str | None:
+    """Explicit format that parses the most values of a leading sample (None if none does)."""
+    sample = text.dropna()
+    sample = sample[sample != ""].head(_DATETIME_SAMPLE_ROWS)
+    if sample.empty:
+        return None
+    candidates = [*_YEARFIRST_DATETIME_FORMATS, *(_DAYFIRST_DATETIME_FORMATS if dayfirst else _MONTHFIRST_DATETIME_FORMATS)]
+    best, best_hits = None, 0
+    for fmt in candidates:
+        hits = int(pd.to_datetime(sample, errors="coerce", format=fmt).notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+        if hits == len(sample):
+            break
+    return best
+
+
+def _parse_focos_datetimes(values: pd.Series, *, dayfirst: bool) -> pd.Series:
+    """Parse with the explicit format detected from a sample.
+
+    Rows that format rejects are retried as ISO 8601 and only then with
+    ``format="mixed"``. Year-first (ISO) values are taken literally even when
+    ``dayfirst`` is set, so ``2024-01-05`` is always 5 January.
+    """
+    text = values.astype("string").str.strip()
+    fmt = _sniff_datetime_format(text, dayfirst=dayfirst)
+    formats = [fmt] if fmt else []
+    formats += ["ISO8601", "mixed"]
+
+    parsed = pd.to_datetime(text, errors="coerce", dayfirst=dayfirst, format=formats[0])
+    for fallback in formats[1:]:
+        failed = parsed.isna() & text.fillna("").ne("")
+        if not failed.any():
+            break
+        parsed.loc[failed] = pd.to_datetime(text[failed], errors="coerce", dayfirst=dayfirst, format=fallback)
+    return parsed
+
+
+def _period_month_labels(year: pd.Series, month: pd.Series) -> pd.Series:
+    """``YYYY-MM`` strings built once per distinct month, instead of ``to_period().astype(str)`` per row."""
+    if year.empty:
+        return pd.Series([], index=year.index, dtype=str)
+    key = year.to_numpy() * 100 + month.to_numpy()
+    uniques, codes = np.unique(key, return_inverse=True)
+    labels = np.array([f"{k // 100:04d}-{k % 100:02d}" for k in uniques.tolist()], dtype=object)
+    return pd.Series(labels[codes], index=year.index).astype(str)
+
+
+def _normalize_label_column(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        #colunas do engine arrow chegam dicionarizadas: normaliza só as categorias e expande pelos códigos
+        labels = _normalize_label_column(pd.Series(values.cat.categories.astype(str), dtype="string"))
+        taken = labels.array.take(values.cat.codes.to_numpy(), allow_fill=True)
+        return pd.Series(taken, index=values.index, dtype="string")
+
+    return (
+        values
+        .astype("string")
+        .str.strip()
+        .str.upper()
+        .replace({"": pd.NA, "NAN": pd.NA, "NONE": pd.NA})
+    )
+
+
 def _pick_member(zf: zipfile.ZipFile) -> str:
     members = [
         name
@@ -869,16 +1633,39 @@ def _normalize_satellite_token(value: str) -> str:
     return re.sub(r"[^a-z0-9]", "", str(value).casefold())
 
 
+def _satellite_label_mask(labels: Any, reference: str) -> np.ndarray:
+    """Match flag per distinct satellite label, plus a trailing slot for missing values.
+
+    Indexing the result with factorized codes (``-1`` = missing) gives the row mask,
+    so the regex normalization runs once per label instead of once per row.
+    """
+    ref = _normalize_satellite_token(reference)
+    keep = np.fromiter(
+        (_normalize_satellite_token(str(label)) == ref for label in labels),
+        dtype=bool,
+        count=len(labels),
+    )
+    return np.append(keep, ref == "")
+
+
 def _filter_df_by_reference_satellite(
     df: pd.DataFrame,
     sat_col: str,
     reference: str,
 ) -> pd.DataFrame:
-    ref = _normalize_satellite_token(reference)
-    norm = df[sat_col].map(
-        lambda x: _normalize_satellite_token(str(x)) if pd.notna(x) else ""
-    )
-    return df.loc[norm == ref].copy()
+    codes, uniques = pd.factorize(df[sat_col], use_na_sentinel=True)
+    return df.loc[_satellite_label_mask(uniques, reference)[codes]].copy()
+
+
+def _arrow_reference_satellite_filter(batch: pa.RecordBatch, sat_col: str, reference: str) -> pa.RecordBatch:
+    """``_filter_df_by_reference_satellite`` applied to a record batch before pandas conversion."""
+    column = batch.column(sat_col)
+    if not isinstance(column, pa.DictionaryArray):
+        column = column.dictionary_encode()
+    keep = _satellite_label_mask(column.dictionary.to_pylist(), reference)
+    #nulos apontam para o slot final da máscara
+    codes = column.indices.fill_null(len(keep) - 1).to_numpy(zero_copy_only=False)
+    return batch.filter(pa.array(keep[codes]))
 
 
 def _read_member_csv(
@@ -959,57 +1746,26 @@ def read_focos_subset_brasil_file(
     reference_satellite: str | None = None,
 ) -> pd.DataFrame:
     """Lê um CSV (ou ZIP com um CSV interno) no mesmo formato dos focos INPE; retorna subset com datetime válido."""
-    suf = path.suffix.lower()
-    if suf == ".zip":
-        out, _ = _read_zip_subset(
-            path,
-            datetime_candidates,
-            state_candidates,
-            biome_candidates,
-            satellite_candidates=satellite_candidates,
-            reference_satellite=reference_satellite,
-        )
-        return out
-
-    if suf == ".csv":
-        delimiter = _detect_delimiter_path(path)
-        header_df = _read_path_csv(path, delimiter, nrows=0)
-        header_cols = list(header_df.columns)
-        columns = detect_columns_from_header(
-            header_cols,
-            datetime_candidates,
-            state_candidates,
-            biome_candidates,
-        )
-        dt_col = columns["datetime"]
-        state_col = columns["state"]
-        biome_col = columns["biome"]
-        usecols = [dt_col, state_col, biome_col]
-        sat_col: str | None = None
-        if reference_satellite and satellite_candidates:
-            sat_col = _pick_column(header_cols, satellite_candidates)
-        if sat_col:
-            usecols.append(sat_col)
-        df = _read_path_csv(
-            path,
-            delimiter,
-            usecols=usecols,
-        )
-        if sat_col and reference_satellite:
-            df = _filter_df_by_reference_satellite(df, sat_col, reference_satellite)
-            df = df[[dt_col, state_col, biome_col]]
-    else:
+    if path.suffix.lower() not in {".zip", ".csv"}:
         raise ValueError(f"Extensão não suportada para focos mensais: {path}")
 
-    df = df.rename(
-        columns={
-            dt_col: "raw_datetime",
-            state_col: "raw_state",
-            biome_col: "raw_biome",
-        }
-    ).copy()
-    dayfirst = _datetime_dayfirst_for_column(dt_col)
-    return _normalized_focos_subset_from_raw_columns(df, dayfirst=dayfirst)
+    layout = _focos_csv_layout(
+        path,
+        datetime_candidates,
+        state_candidates,
+        biome_candidates,
+        satellite_candidates=satellite_candidates,
+        reference_satellite=reference_satellite,
+    )
+    chunks = _fold_focos_chunks(
+        layout,
+        _ChunkList,
+        reference_satellite=reference_satellite,
+        chunk_rows=DEFAULT_FOCOS_CHUNK_ROWS,
+    )
+    if not chunks:
+        return pd.DataFrame(columns=["datetime", "year", "period_month", "state", "biome"])
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
 
 
 def count_focos_rows_brasil_file(
@@ -1027,7 +1783,10 @@ def count_focos_rows_brasil_file(
     Se ``biome_inpe_key`` for informado (ex.: valor normalizado em maiúsculas como no CSV INPE,
     p.ex. ``AMAZÔNIA``), conta apenas linhas desse bioma.
     """
-    subset = read_focos_subset_brasil_file(
+    if path.suffix.lower() not in {".zip", ".csv"}:
+        raise ValueError(f"Extensão não suportada para focos mensais: {path}")
+
+    counts, _ = aggregate_focos_file(
         path,
         datetime_candidates,
         state_candidates,
@@ -1035,10 +1794,11 @@ def count_focos_rows_brasil_file(
         satellite_candidates=satellite_candidates,
         reference_satellite=reference_satellite,
     )
-    if biome_inpe_key:
-        key = str(biome_inpe_key).strip().upper()
-        subset = subset[subset["biome"] == key]
-    return int(len(subset))
+    if not biome_inpe_key:
+        return counts.row_count
+    key = str(biome_inpe_key).strip().upper()
+    by_biome = counts.table(["biome"])
+    return int(by_biome.loc[by_biome["biome"] == key, "value"].sum())
 
 
 def _extract_year_from_name(filename: str) -> int | None:
@@ -1048,39 +1808,176 @@ def _extract_year_from_name(filename: str) -> int | None:
     return int(match.group(1))
 
 
-def _merge_sum_frames(frames: list[pd.DataFrame], key_cols: list[str]) -> pd.DataFrame:
-    non_empty = [frame for frame in frames if not frame.empty]
-    if not non_empty:
-        return pd.DataFrame(columns=[*key_cols, "value"])
+def _download_json(
+    storage: Any,
+    object_path: str,
+    logger: Any,
+) -> dict[str, Any] | None:
+    data = storage.download_bytes(object_path)
+    if not data:
+        return None
+
+    try:
+        parsed = loads(data)
+        return parsed if isinstance(parsed, dict) else None
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Falha ao decodificar JSON de cache em %s. erro=%s", object_path, e)
+        return None
 
-    merged = pd.concat(non_empty, ignore_index=True)
-    merged["value"] = pd.to_numeric(merged["value"], errors="coerce").fillna(0).astype(int)
 
-    return (
-        merged.groupby(key_cols, as_index=False)["value"]
-        .sum()
-        .sort_values(key_cols)
-        .reset_index(drop=True)
+def year_cache_object_path(cache_prefix: str, year: int, cache_format: str = YEAR_CACHE_FORMAT) -> str:
+    return f"{cache_prefix.rstrip('/')}/yearly/{year}.{cache_format}"
+
+
+def _aggregation_frame(payload: dict[str, Any], name: str) -> pd.DataFrame:
+    value = payload.get(name)
+    if isinstance(value, pd.DataFrame):
+        return value
+    return pd.DataFrame(value or [])
+
+
+def year_payload_counts(payload: dict[str, Any]) -> FocosCounts:
+    """Count cube of a year payload, rebuilt from its aggregations when it has none."""
+    cube = payload.get(COUNT_CUBE_KEY)
+    return cube if isinstance(cube, FocosCounts) else FocosCounts.from_year_payload(payload)
+
+
+def _year_payload_with_counts(meta: dict[str, Any], counts: FocosCounts) -> dict[str, Any]:
+    payload = dict(meta)
+    payload[COUNT_CUBE_KEY] = counts
+    for name, key_cols in AGGREGATION_KEY_COLUMNS.items():
+        payload[name] = counts.table(key_cols)
+    return payload
+
+
+def year_payload_to_parquet(payload: dict[str, Any]) -> bytes:
+    """Encode a year payload as one Parquet file.
+
+    Only the non-zero cells of the count cube are stored (``period``, ``state``,
+    ``biome``, ``value``); the eight aggregations are derived again on read.
+    Scalar fields such as ``fingerprint`` and ``row_count`` go into the schema
+    metadata as JSON.
+    """
+    cells = year_payload_counts(payload).cells()
+    if cells.empty:
+        table = _YEAR_CACHE_SCHEMA.empty_table()
+    else:
+        table = pa.Table.from_pandas(
+            cells.rename(columns={"period_month": "period"})[_YEAR_CACHE_SCHEMA.names],
+            schema=_YEAR_CACHE_SCHEMA,
+            preserve_index=False,
+        )
+
+    meta = {
+        key: value
+        for key, value in payload.items()
+        if key not in AGGREGATION_KEY_COLUMNS and key != COUNT_CUBE_KEY
+    }
+    table = table.replace_schema_metadata({_YEAR_CACHE_METADATA_KEY: dumps_bytes(meta)})
+    sink = io.BytesIO()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+
+def year_payload_from_parquet(data: bytes) -> dict[str, Any]:
+    """Decode ``year_payload_to_parquet`` output; aggregations come back as DataFrames."""
+    table = pq.read_table(io.BytesIO(data))
+    raw_meta = (table.schema.metadata or {}).get(_YEAR_CACHE_METADATA_KEY)
+    payload: dict[str, Any] = loads(raw_meta) if raw_meta else {}
+
+    df = table.to_pandas()
+    if "aggregation" not in df.columns:
+        cells = df.rename(columns={"period": "period_month"})
+        return _year_payload_with_counts(payload, FocosCounts.from_cells(cells))
+
+    #tabela longa das oito agregações (caches Parquet anteriores ao cubo)
+    groups = {str(name): part for name, part in df.groupby("aggregation", sort=False)}
+    for name, key_cols in AGGREGATION_KEY_COLUMNS.items():
+        cols = [*key_cols, "value"]
+        part = groups.get(name)
+        if part is None:
+            payload[name] = pd.DataFrame(columns=cols)
+            continue
+        frame = part[cols].reset_index(drop=True)
+        #mesmos dtypes que pd.DataFrame(records) produzia a partir do JSON
+        payload[name] = frame.astype({col: "int64" for col in cols if col in {"year", "value"}})
+    return payload
+
+
+def _year_payload_upload_job(object_path: str, payload: dict[str, Any]) -> UploadJob:
+    return UploadJob(
+        object_path=object_path,
+        data=year_payload_to_parquet(payload),
+        content_type=YEAR_CACHE_CONTENT_TYPE,
     )
 
 
-def _download_json(
+def _upload_year_payload(
+    storage: Any,
+    object_path: str,
+    payload: dict[str, Any],
+    mirror: LocalObjectMirror | None = None,
+) -> None:
+    job = _year_payload_upload_job(object_path, payload)
+    storage.upload_bytes(
+        object_path=job.object_path,
+        data=job.data,
+        content_type=job.content_type,
+        upsert=True,
+    )
+    if mirror is not None:
+        mirror.write(object_path, job.data)
+
+
+def _download_year_payload(
     storage: Any,
     object_path: str,
     logger: Any,
+    *,
+    mirror: LocalObjectMirror | None = None,
+    is_current: Callable[[dict[str, Any] | None], bool] | None = None,
 ) -> dict[str, Any] | None:
+    """Year payload at ``object_path``, from ``mirror`` when ``is_current`` accepts the local copy."""
+    if mirror is not None and is_current is not None:
+        data = mirror.read(object_path)
+        if data is not None:
+            payload = _decode_year_payload(object_path, data, logger)
+            if is_current(payload):
+                return payload
+            mirror.discard(object_path)
+
     data = storage.download_bytes(object_path)
     if not data:
         return None
+    payload = _decode_year_payload(object_path, data, logger)
+    if mirror is not None and payload is not None:
+        mirror.write(object_path, data)
+    return payload
 
+
+def _decode_year_payload(object_path: str, data: bytes, logger: Any) -> dict[str, Any] | None:
     try:
-        parsed = json.loads(data.decode("utf-8"))
+        if object_path.endswith(".parquet"):
+            return year_payload_from_parquet(data)
+        parsed = loads(data)
         return parsed if isinstance(parsed, dict) else None
     except Exception as e:  # noqa: BLE001
-        logger.warning("Falha ao decodificar JSON de cache em %s. erro=%s", object_path, e)
+        logger.warning("Falha ao decodificar cache em %s. erro=%s", object_path, e)
         return None
 
 
+def _matches_manifest_entry(payload: dict[str, Any] | None, entry: dict[str, Any]) -> bool:
+    """Whether a (mirrored) payload is the version the manifest entry describes."""
+    if not isinstance(payload, dict):
+        return False
+    if payload.get("fingerprint") != entry.get("fingerprint"):
+        return False
+    if entry.get("build_signature") is not None and payload.get("build_signature") != entry["build_signature"]:
+        return False
+    #mesmo fingerprint reprocessado por outro build: processed_at distingue a versão publicada
+    return not entry.get("processed_at") or payload.get("processed_at") == entry["processed_at"]
+
+
 def _df_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
     for row in df.to_dict(orient="records"):
@@ -1099,7 +1996,7 @@ def _df_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
 
 
 def _to_bytes(payload: dict[str, Any]) -> bytes:
-    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return dumps_bytes(payload)
 
 
 def _now_iso() -> str:
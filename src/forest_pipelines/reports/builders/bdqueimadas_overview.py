@@ -7,20 +7,24 @@ import re
 from pathlib import Path
 from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
 import yaml
 
 from forest_pipelines.datasets.inpe.bdqueimadas_mensal_listing import (
     DEFAULT_MENSAL_BASE_URL,
-    ensure_mensal_files_for_year,
+    MensalSource,
+    list_mensal_sources,
 )
+from forest_pipelines.http import stream_download
 from forest_pipelines.reports.builders.bdqueimadas_incremental import (
     ALL_BIOMES_VALUE,
     INPE_REFERENCE_SATELLITE,
+    aggregate_focos_file,
     biome_label_i18n,
+    build_incremental_month_caches,
     build_incremental_year_caches,
     consolidate_year_payloads,
-    read_focos_subset_brasil_file,
     _df_to_records,
 )
 from forest_pipelines.reports.definitions.base import (
@@ -29,6 +33,12 @@ from forest_pipelines.reports.definitions.base import (
     localized_text_dict,
 )
 from forest_pipelines.reports.llm.base import maybe_generate_analysis_blocks
+from forest_pipelines.reports.shards import shard_report_package
+from forest_pipelines.storage.local_mirror import (
+    LocalObjectMirror,
+    default_object_mirror_dir,
+    object_mirror_from_env,
+)
 
 RE_YEAR = re.compile(r"(\d{4})")
 RE_MENSAL_CSV = re.compile(r"focos_mensal_br_(\d{4})(\d{2})\.(csv|zip)$", re.IGNORECASE)
@@ -78,6 +88,7 @@ def build_package(
     skip_mensal_download: bool = False,
     refresh_mensal: bool = False,
     reference_month_mode: Literal["previous", "current"] | str = "previous",
+    build_workers: int | None = None,
 ) -> dict[str, Any]:
     cfg = load_report_cfg(settings.reports_dir, "bdqueimadas_overview")
 
@@ -107,6 +118,12 @@ def build_package(
         )
 
     cache_prefix = f"{cfg.bucket_prefix.rstrip('/')}/_cache"
+    #com storage remoto os caches _cache/ são lidos de uma cópia local validada pelo manifest
+    cache_mirror = None
+    if getattr(settings, "storage_backend", "supabase") != "local":
+        cache_mirror = object_mirror_from_env(
+            default_object_mirror_dir(settings.data_dir, settings.supabase_bucket_open_data)
+        )
 
     incremental = build_incremental_year_caches(
         storage=storage,
@@ -117,6 +134,8 @@ def build_package(
         biome_candidates=biome_candidates,
         logger=logger,
         include_cached_payloads=current_year_only,
+        max_workers=build_workers,
+        cache_mirror=cache_mirror,
     )
 
     consolidated = consolidate_year_payloads(incremental["year_payloads"])
@@ -151,49 +170,16 @@ def build_package(
     calendar_year = pd.Timestamp.now().year
     reference_year, reference_month = _resolve_reference_month(calendar_year, reference_month_mode)
 
-    if refresh_mensal and skip_mensal_download:
-        logger.warning(
-            "Mensal INPE: --refresh-mensal não tem efeito com --skip-mensal-download (cache não é limpo nem baixado).",
-        )
-
-    #sempre refaz cache local do ano civil corrente antes do download, salvo skip_mensal_download
-    #captura republicacoes do inpe no mesmo ficheiro; refresh_mensal fica por compatibilidade
-    if not skip_mensal_download and mensal_dir.exists():
-        removed = 0
-        for f in mensal_dir.iterdir():
-            if not f.is_file():
-                continue
-            match = RE_MENSAL_CSV.search(f.name)
-            if not match:
-                continue
-            if int(match.group(1)) == calendar_year:
-                f.unlink()
-                removed += 1
-        logger.info(
-            "Mensal INPE: cache do ano %d limpo (%d ficheiro(s) removidos); a seguir download da listagem.",
-            calendar_year,
-            removed,
-        )
-
+    #republicações do INPE são detectadas por tamanho/data da listagem e sha256 do CSV;
+    #só os meses alterados são baixados e reagregados (refresh_mensal ignora o cache)
+    mensal_sources: list[MensalSource] | None = None
     if not skip_mensal_download:
-        try:
-            ensure_mensal_files_for_year(
-                base_url=DEFAULT_MENSAL_BASE_URL,
-                year=calendar_year,
-                cache_dir=mensal_dir,
-                skip_download=False,
-            )
-            logger.info(
-                "Mensal INPE: ficheiros do ano %d garantidos em %s.",
-                calendar_year,
-                str(mensal_dir.resolve()),
-            )
-        except FileNotFoundError as e:
+        mensal_sources = list_mensal_sources(DEFAULT_MENSAL_BASE_URL, calendar_year)
+        if not mensal_sources:
             logger.warning(
-                "Nenhum CSV mensal disponível para %d em %s (%s).",
+                "Nenhum CSV mensal disponível para %d em %s.",
                 calendar_year,
                 DEFAULT_MENSAL_BASE_URL,
-                e,
             )
 
     mensal_counts = _load_mensal_counts_for_current_year(
@@ -203,7 +189,20 @@ def build_package(
         state_candidates=state_candidates,
         biome_candidates=biome_candidates,
         satellite_candidates=DEFAULT_SATELLITE_CANDIDATES,
+        storage=storage,
+        cache_prefix=cache_prefix,
+        sources=mensal_sources,
+        logger=logger,
+        force=refresh_mensal,
+        cache_mirror=cache_mirror,
     )
+    if cache_mirror is not None:
+        logger.info(
+            "Espelho local dos caches: hits=%d misses=%d writes=%d",
+            cache_mirror.stats["hits"],
+            cache_mirror.stats["misses"],
+            cache_mirror.stats["writes"],
+        )
 
     mensal_available_months = sorted(int(m) for m in mensal_counts["national"].keys())
     _mensal_is_current = (
@@ -786,7 +785,7 @@ def build_package(
         logger=logger,
     )
 
-    return {
+    package = {
         "report_id": cfg.id,
         "title": generated_report["title"],
         "bucket_prefix": cfg.bucket_prefix,
@@ -816,6 +815,10 @@ def build_package(
             },
         },
     }
+    if cfg.publish.sharded:
+        package = shard_report_package(package, all_value=ALL_BIOMES_VALUE)
+        logger.info("Report em shards: %d shard(s) por bioma/UF.", package["meta"]["sharding"]["shard_count"])
+    return package
 
 
 def _merge_candidates(primary: list[str], defaults: list[str]) -> list[str]:
@@ -925,48 +928,20 @@ def _build_top_states_table(
     previous_year: int | None,
     limit: int,
 ) -> list[dict[str, Any]]:
-    current_df = (
-        state_year_series.loc[state_year_series["year"] == latest_year, ["state", "value"]]
-        .rename(columns={"value": "current_year_total"})
-        .copy()
+    merged = _period_change_frame(
+        state_year_series,
+        key="state",
+        select_col="year",
+        current=latest_year,
+        previous=previous_year,
+        current_col="current_year_total",
+        previous_col="previous_year_total",
     )
-
-    if previous_year is None:
-        previous_df = pd.DataFrame(columns=["state", "previous_year_total"])
-    else:
-        previous_df = (
-            state_year_series.loc[state_year_series["year"] == previous_year, ["state", "value"]]
-            .rename(columns={"value": "previous_year_total"})
-            .copy()
-        )
-
-    merged = current_df.merge(previous_df, on="state", how="outer").fillna(0)
-    merged["current_year_total"] = merged["current_year_total"].astype(int)
-    merged["previous_year_total"] = merged["previous_year_total"].astype(int)
-    merged["absolute_change"] = merged["current_year_total"] - merged["previous_year_total"]
-    merged["pct_change"] = merged.apply(
-        lambda row: _safe_pct_change(row["current_year_total"], row["previous_year_total"]),
-        axis=1,
-    )
-
     merged = merged.sort_values(
         by=["current_year_total", "previous_year_total", "state"],
         ascending=[False, False, True],
     ).head(limit)
-
-    rows: list[dict[str, Any]] = []
-    for _, row in merged.iterrows():
-        rows.append(
-            {
-                "state": str(row["state"]),
-                "current_year_total": int(row["current_year_total"]),
-                "previous_year_total": int(row["previous_year_total"]),
-                "absolute_change": int(row["absolute_change"]),
-                "pct_change": None if row["pct_change"] is None else round(float(row["pct_change"]), 2),
-            }
-        )
-
-    return rows
+    return merged.to_dict(orient="records")
 
 
 def _build_top_biomes_context(
@@ -975,48 +950,62 @@ def _build_top_biomes_context(
     previous_year: int | None,
     limit: int,
 ) -> list[dict[str, Any]]:
-    current_df = (
-        annual_by_biome_df.loc[annual_by_biome_df["year"] == latest_year, ["biome", "value"]]
-        .rename(columns={"value": "current_year_total"})
-        .copy()
+    merged = _period_change_frame(
+        annual_by_biome_df,
+        key="biome",
+        select_col="year",
+        current=latest_year,
+        previous=previous_year,
+        current_col="current_year_total",
+        previous_col="previous_year_total",
     )
-
-    if previous_year is None:
-        previous_df = pd.DataFrame(columns=["biome", "previous_year_total"])
-    else:
-        previous_df = (
-            annual_by_biome_df.loc[annual_by_biome_df["year"] == previous_year, ["biome", "value"]]
-            .rename(columns={"value": "previous_year_total"})
-            .copy()
-        )
-
-    merged = current_df.merge(previous_df, on="biome", how="outer").fillna(0)
-    merged["current_year_total"] = merged["current_year_total"].astype(int)
-    merged["previous_year_total"] = merged["previous_year_total"].astype(int)
-    merged["absolute_change"] = merged["current_year_total"] - merged["previous_year_total"]
-    merged["pct_change"] = merged.apply(
-        lambda row: _safe_pct_change(row["current_year_total"], row["previous_year_total"]),
-        axis=1,
-    )
-
     merged = merged.sort_values(
         by=["current_year_total", "previous_year_total", "biome"],
         ascending=[False, False, True],
     ).head(limit)
+    return merged.to_dict(orient="records")
 
-    rows: list[dict[str, Any]] = []
-    for _, row in merged.iterrows():
-        rows.append(
-            {
-                "biome": str(row["biome"]),
-                "current_year_total": int(row["current_year_total"]),
-                "previous_year_total": int(row["previous_year_total"]),
-                "absolute_change": int(row["absolute_change"]),
-                "pct_change": None if row["pct_change"] is None else round(float(row["pct_change"]), 2),
-            }
-        )
 
-    return rows
+def _period_change_frame(
+    df: pd.DataFrame,
+    *,
+    key: str,
+    select_col: str,
+    current: Any,
+    previous: Any | None,
+    current_col: str,
+    previous_col: str,
+) -> pd.DataFrame:
+    """Outer join of ``key`` totals at ``current`` and ``previous`` with absolute and % change.
+
+    Columns come out in record order (``key``, current, previous,
+    ``absolute_change``, ``pct_change``); ``pct_change`` is None without a base.
+    """
+    current_df = df.loc[df[select_col] == current, [key, "value"]].rename(columns={"value": current_col})
+    if previous is None:
+        previous_df = pd.DataFrame(columns=[key, previous_col])
+    else:
+        previous_df = df.loc[df[select_col] == previous, [key, "value"]].rename(columns={"value": previous_col})
+
+    merged = current_df.merge(previous_df, on=key, how="outer").fillna(0)
+    merged[key] = merged[key].astype(str)
+    merged[current_col] = merged[current_col].astype(int)
+    merged[previous_col] = merged[previous_col].astype(int)
+    merged["absolute_change"] = merged[current_col] - merged[previous_col]
+    merged["pct_change"] = _pct_change_column(merged[current_col], merged[previous_col])
+    return merged.reset_index(drop=True)
+
+
+def _pct_change_column(current: pd.Series, previous: pd.Series) -> pd.Series:
+    """Vectorized ``_safe_pct_change`` rounded to 2 places, as an object column with None."""
+    base = previous.astype(float).where(previous != 0)
+    pct = ((current - previous) / base * 100.0).round(2)
+    return _none_for_missing(pct)
+
+
+def _none_for_missing(values: pd.Series) -> pd.Series:
+    """Object column with None for NaN so ``to_dict`` emits JSON-ready scalars."""
+    return values.astype(object).where(values.notna(), None)
 
 
 def _build_highlights(
@@ -1478,44 +1467,18 @@ def _build_top_biomes_month_merged(
     current_period: str,
     previous_period: str | None,
 ) -> list[dict[str, Any]]:
-    if monthly_by_biome_df.empty:
+    if monthly_by_biome_df.empty or not (monthly_by_biome_df["period"] == current_period).any():
         return []
 
-    current_df = (
-        monthly_by_biome_df.loc[monthly_by_biome_df["period"] == current_period, ["biome", "value"]]
-        .rename(columns={"value": "current_month_total"})
-        .copy()
-    )
-    if current_df.empty:
-        return []
-
-    if previous_period is not None and not monthly_by_biome_df.empty:
-        prev_rows = monthly_by_biome_df.loc[
-            monthly_by_biome_df["period"] == previous_period, ["biome", "value"]
-        ]
-        previous_df = prev_rows.rename(columns={"value": "previous_month_total"}).copy()
-    else:
-        previous_df = pd.DataFrame(columns=["biome", "previous_month_total"])
-
-    merged = current_df.merge(previous_df, on="biome", how="outer").fillna(0)
-    merged["current_month_total"] = merged["current_month_total"].astype(int)
-    merged["previous_month_total"] = merged["previous_month_total"].astype(int)
-    merged["absolute_change"] = merged["current_month_total"] - merged["previous_month_total"]
-    merged["pct_change"] = merged.apply(
-        lambda row: _safe_pct_change(row["current_month_total"], row["previous_month_total"]),
-        axis=1,
-    )
-
-    rows: list[dict[str, Any]] = []
-    for _, row in merged.iterrows():
-        rows.append({
-            "biome": str(row["biome"]),
-            "current_month_total": int(row["current_month_total"]),
-            "previous_month_total": int(row["previous_month_total"]),
-            "absolute_change": int(row["absolute_change"]),
-            "pct_change": None if row["pct_change"] is None else round(float(row["pct_change"]), 2),
-        })
-    return rows
+    return _period_change_frame(
+        monthly_by_biome_df,
+        key="biome",
+        select_col="period",
+        current=current_period,
+        previous=previous_period,
+        current_col="current_month_total",
+        previous_col="previous_month_total",
+    ).to_dict(orient="records")
 
 
 def _sort_top_biomes_month(
@@ -1546,64 +1509,68 @@ def _build_state_biome_monthly_series_records(
     max_month_in_current_year: int | None = None,
 ) -> list[dict[str, Any]]:
     ALL = ALL_BIOMES_VALUE
-    by_key: dict[tuple[str, str, str], dict[str, Any]] = {}
-
-    def upsert(period: str, year: int, value: int, biome: str, state: str) -> None:
-        k = (period, biome, state)
-        by_key[k] = {
-            "period": period,
-            "year": year,
-            "value": int(value),
-            "biome": biome,
-            "state": state,
-        }
+    frames = [
+        monthly_all_df.assign(biome=ALL, state=ALL),
+        monthly_by_biome_df.assign(state=ALL),
+        state_month_all_df.assign(biome=ALL),
+        state_month_by_biome_df,
+    ]
+    if mensal_is_current and mensal_counts.get("national"):
+        cy, max_month = calendar_year, max_month_in_current_year
+        frames += [
+            _mensal_series_frame({ALL: mensal_counts["national"]}, cy, keys=["biome"], max_month=max_month)
+            .assign(state=ALL),
+            _mensal_series_frame(mensal_counts.get("by_biome") or {}, cy, keys=["biome"], max_month=max_month)
+            .assign(state=ALL),
+            _mensal_series_frame(mensal_counts.get("by_state") or {}, cy, keys=["state"], max_month=max_month)
+            .assign(biome=ALL),
+            _mensal_series_frame(
+                mensal_counts.get("by_state_biome") or {}, cy, keys=["state", "biome"], max_month=max_month
+            ),
+        ]
 
-    if not monthly_all_df.empty:
-        for _, r in monthly_all_df.iterrows():
-            upsert(str(r["period"]), int(r["year"]), int(r["value"]), ALL, ALL)
-    if not monthly_by_biome_df.empty:
-        for _, r in monthly_by_biome_df.iterrows():
-            upsert(str(r["period"]), int(r["year"]), int(r["value"]), str(r["biome"]), ALL)
-    if not state_month_all_df.empty:
-        for _, r in state_month_all_df.iterrows():
-            upsert(str(r["period"]), int(r["year"]), int(r["value"]), ALL, str(r["state"]))
-    if not state_month_by_biome_df.empty:
-        for _, r in state_month_by_biome_df.iterrows():
-            upsert(str(r["period"]), int(r["year"]), int(r["value"]), str(r["biome"]), str(r["state"]))
+    columns = ["period", "year", "value", "biome", "state"]
+    frames = [frame[columns] for frame in frames if not frame.empty]
+    if not frames:
+        return []
 
-    if mensal_is_current and mensal_counts.get("national"):
-        cy = calendar_year
-        for m, v in mensal_counts["national"].items():
-            if max_month_in_current_year is not None and int(m) > max_month_in_current_year:
-                continue
-            p = f"{cy}-{int(m):02d}"
-            upsert(p, cy, int(v), ALL, ALL)
-        for bio_key, per_m in (mensal_counts.get("by_biome") or {}).items():
-            for m, v in per_m.items():
-                if max_month_in_current_year is not None and int(m) > max_month_in_current_year:
-                    continue
-                p = f"{cy}-{int(m):02d}"
-                upsert(p, cy, int(v), str(bio_key), ALL)
-        for st_key, per_m in (mensal_counts.get("by_state") or {}).items():
-            for m, v in per_m.items():
-                if max_month_in_current_year is not None and int(m) > max_month_in_current_year:
-                    continue
-                p = f"{cy}-{int(m):02d}"
-                upsert(p, cy, int(v), ALL, str(st_key))
-        for pair, per_m in (mensal_counts.get("by_state_biome") or {}).items():
-            if isinstance(pair, tuple) and len(pair) == 2:
-                st_k, bio_k = str(pair[0]), str(pair[1])
-            else:
+    #ordem de precedência: ZIP anual, depois mensal do ano corrente (último valor vence)
+    merged = pd.concat(frames, ignore_index=True).astype(
+        {"period": str, "year": "int64", "value": "int64", "biome": str, "state": str}
+    )
+    merged = merged.drop_duplicates(subset=["period", "biome", "state"], keep="last")
+    return merged.sort_values(["period", "state", "biome"]).to_dict(orient="records")
+
+
+def _mensal_series_frame(
+    per_key: dict[Any, dict[int, int]],
+    year: int,
+    *,
+    keys: list[str],
+    max_month: int | None = None,
+) -> pd.DataFrame:
+    """Long ``period, year, <keys>, value`` frame from mensal ``{key: {month: count}}`` dicts.
+
+    With two ``keys`` the dict keys must be tuples (``by_state_biome``); others are skipped.
+    """
+    rows: list[tuple[Any, ...]] = []
+    for scope, per_month in per_key.items():
+        if len(keys) > 1:
+            if not (isinstance(scope, tuple) and len(scope) == len(keys)):
                 continue
-            for m, v in per_m.items():
-                if max_month_in_current_year is not None and int(m) > max_month_in_current_year:
-                    continue
-                p = f"{cy}-{int(m):02d}"
-                upsert(p, cy, int(v), bio_k, st_k)
-
-    rows = list(by_key.values())
-    rows.sort(key=lambda r: (r["period"], r["state"], r["biome"]))
-    return rows
+            labels = tuple(str(label) for label in scope)
+        else:
+            labels = (str(scope),)
+        rows.extend(
+            (int(month), *labels, int(value))
+            for month, value in per_month.items()
+            if max_month is None or int(month) <= max_month
+        )
+
+    frame = pd.DataFrame(rows, columns=["month", *keys, "value"])
+    frame.insert(0, "period", f"{year}-" + frame["month"].astype(str).str.zfill(2))
+    frame.insert(1, "year", year)
+    return frame.drop(columns="month").astype({"year": "int64", "value": "int64"})
 
 
 def _build_annual_totals_from_monthly_series(
@@ -1633,42 +1600,18 @@ def _build_top_states_month_merged(
     current_period: str,
     previous_period: str | None,
 ) -> list[dict[str, Any]]:
-    if state_month_all_df.empty:
+    if state_month_all_df.empty or not (state_month_all_df["period"] == current_period).any():
         return []
 
-    current_df = (
-        state_month_all_df.loc[state_month_all_df["period"] == current_period, ["state", "value"]]
-        .rename(columns={"value": "current_month_total"})
-        .copy()
-    )
-    if current_df.empty:
-        return []
-
-    if previous_period is not None and not state_month_all_df.empty:
-        prev_rows = state_month_all_df.loc[state_month_all_df["period"] == previous_period, ["state", "value"]]
-        previous_df = prev_rows.rename(columns={"value": "previous_month_total"}).copy()
-    else:
-        previous_df = pd.DataFrame(columns=["state", "previous_month_total"])
-
-    merged = current_df.merge(previous_df, on="state", how="outer").fillna(0)
-    merged["current_month_total"] = merged["current_month_total"].astype(int)
-    merged["previous_month_total"] = merged["previous_month_total"].astype(int)
-    merged["absolute_change"] = merged["current_month_total"] - merged["previous_month_total"]
-    merged["pct_change"] = merged.apply(
-        lambda row: _safe_pct_change(row["current_month_total"], row["previous_month_total"]),
-        axis=1,
-    )
-
-    rows: list[dict[str, Any]] = []
-    for _, row in merged.iterrows():
-        rows.append({
-            "state": str(row["state"]),
-            "current_month_total": int(row["current_month_total"]),
-            "previous_month_total": int(row["previous_month_total"]),
-            "absolute_change": int(row["absolute_change"]),
-            "pct_change": None if row["pct_change"] is None else round(float(row["pct_change"]), 2),
-        })
-    return rows
+    return _period_change_frame(
+        state_month_all_df,
+        key="state",
+        select_col="period",
+        current=current_period,
+        previous=previous_period,
+        current_col="current_month_total",
+        previous_col="previous_month_total",
+    ).to_dict(orient="records")
 
 
 def _sort_top_states_month(
@@ -1803,19 +1746,22 @@ def _build_effective_national_monthly_series(
     mensal_is_current: bool,
     calendar_year: int,
 ) -> list[tuple[str, int]]:
-    merged: dict[str, int] = {}
-    if not monthly_all_df.empty:
-        for _, row in monthly_all_df.iterrows():
-            period = str(row["period"])
-            merged[period] = int(row["value"])
-
+    frames = [monthly_all_df[["period", "value"]]] if not monthly_all_df.empty else []
     if mensal_is_current:
-        for month, value in (mensal_counts.get("national") or {}).items():
-            period = f"{calendar_year}-{int(month):02d}"
-            merged[period] = int(value)
+        frames.append(
+            _mensal_series_frame(
+                {ALL_BIOMES_VALUE: mensal_counts.get("national") or {}},
+                calendar_year,
+                keys=["scope"],
+            )[["period", "value"]]
+        )
+    if not frames:
+        return []
 
-    sorted_items = sorted(merged.items(), key=lambda item: item[0])
-    return [(period, int(value)) for period, value in sorted_items]
+    #mensal sobrepõe o ZIP no mesmo período (último valor vence)
+    merged = pd.concat(frames, ignore_index=True).astype({"period": str, "value": "int64"})
+    merged = merged.drop_duplicates(subset=["period"], keep="last").sort_values("period")
+    return list(zip(merged["period"].tolist(), merged["value"].tolist()))
 
 
 def _compute_rolling_12m_metrics(
@@ -1865,6 +1811,13 @@ def _load_mensal_counts_for_current_year(
     state_candidates: list[str],
     biome_candidates: list[str],
     satellite_candidates: list[str] | None = None,
+    *,
+    storage: Any = None,
+    cache_prefix: str | None = None,
+    sources: list[MensalSource] | None = None,
+    logger: Any = None,
+    force: bool = False,
+    cache_mirror: LocalObjectMirror | None = None,
 ) -> dict[str, Any]:
     """
     Reads INPE monthly CSV files (focos_mensal_br_YYYYMM.csv) for current_year and aggregates:
@@ -1872,6 +1825,10 @@ def _load_mensal_counts_for_current_year(
       - per-biome total per month (BIOME_KEY uppercase, matching CSV)
       - per-state total per month (state name uppercase, matching CSV)
 
+    With ``storage`` and ``cache_prefix`` each month goes through
+    ``build_incremental_month_caches``; ``sources`` (INPE listing) makes the
+    listing authoritative and downloads only months that changed.
+
     Returns a dict with keys: last_closed_month, national, by_biome, by_state.
     Returns empty structure if no files are found.
     """
@@ -1884,7 +1841,41 @@ def _load_mensal_counts_for_current_year(
             if int(m.group(1)) == current_year:
                 month_files[int(m.group(2))] = f
 
-    if not month_files:
+    if storage is not None and cache_prefix:
+        by_source = {source.month: source for source in sources or []}
+        month_counts = build_incremental_month_caches(
+            storage=storage,
+            cache_prefix=cache_prefix,
+            year=current_year,
+            month_files=month_files,
+            datetime_candidates=datetime_candidates,
+            state_candidates=state_candidates,
+            biome_candidates=biome_candidates,
+            logger=logger,
+            source_keys=(
+                {month: source.source_key() for month, source in by_source.items()}
+                if sources is not None
+                else None
+            ),
+            fetch=lambda month: _download_mensal_source(by_source[month], mensal_dir),
+            satellite_candidates=satellite_candidates,
+            force=force,
+            cache_mirror=cache_mirror,
+        )["month_counts"]
+    else:
+        month_counts = {
+            month: aggregate_focos_file(
+                fpath,
+                datetime_candidates,
+                state_candidates,
+                biome_candidates,
+                satellite_candidates=satellite_candidates,
+                reference_satellite=INPE_REFERENCE_SATELLITE,
+            )[0]
+            for month, fpath in sorted(month_files.items())
+        }
+
+    if not month_counts:
         return {
             "last_closed_month": 0,
             "national": {},
@@ -1898,41 +1889,21 @@ def _load_mensal_counts_for_current_year(
     by_state: dict[str, dict[int, int]] = {}
     by_state_biome: dict[tuple[str, str], dict[int, int]] = {}
 
-    for month, fpath in sorted(month_files.items()):
-        df = read_focos_subset_brasil_file(
-            fpath,
-            datetime_candidates,
-            state_candidates,
-            biome_candidates,
-            satellite_candidates=satellite_candidates,
-            reference_satellite=INPE_REFERENCE_SATELLITE,
-        )
+    for month, counts in sorted(month_counts.items()):
+        national[month] = counts.row_count
+
+        for row in counts.table(["biome"]).itertuples(index=False):
+            by_biome.setdefault(str(row.biome), {})[month] = int(row.value)
+
+        for row in counts.table(["state"]).itertuples(index=False):
+            by_state.setdefault(str(row.state), {})[month] = int(row.value)
 
-        national[month] = len(df)
-
-        if not df.empty:
-            for biome_key, grp in df.dropna(subset=["biome"]).groupby("biome"):
-                k = str(biome_key)
-                if k not in by_biome:
-                    by_biome[k] = {}
-                by_biome[k][month] = len(grp)
-
-            for state_key, grp in df.dropna(subset=["state"]).groupby("state"):
-                k = str(state_key)
-                if k not in by_state:
-                    by_state[k] = {}
-                by_state[k][month] = len(grp)
-
-            pair_df = df.dropna(subset=["state", "biome"])
-            if not pair_df.empty:
-                for (sk, bk), grp in pair_df.groupby(["state", "biome"]):
-                    key = (str(sk).upper(), str(bk).upper())
-                    if key not in by_state_biome:
-                        by_state_biome[key] = {}
-                    by_state_biome[key][month] = len(grp)
+        for row in counts.table(["state", "biome"]).itertuples(index=False):
+            key = (str(row.state).upper(), str(row.biome).upper())
+            by_state_biome.setdefault(key, {})[month] = int(row.value)
 
     return {
-        "last_closed_month": max(month_files.keys()),
+        "last_closed_month": max(month_counts.keys()),
         "national": national,
         "by_biome": by_biome,
         "by_state": by_state,
@@ -1940,6 +1911,12 @@ def _load_mensal_counts_for_current_year(
     }
 
 
+def _download_mensal_source(source: MensalSource, mensal_dir: Path) -> Path:
+    local = mensal_dir / source.filename
+    stream_download(source.url, local)
+    return local
+
+
 def _build_monthly_year_comparison_records(
     monthly_all_df: pd.DataFrame,
     monthly_by_biome_df: pd.DataFrame,
@@ -1956,85 +1933,112 @@ def _build_monthly_year_comparison_records(
     (more accurate than annual ZIP aggregation for the incomplete current year).
     """
     ALL = ALL_BIOMES_VALUE
-    records: list[dict[str, Any]] = []
-
-    def _month_vals(df: pd.DataFrame, year: int, period_col: str = "period") -> dict[int, int | None]:
-        vals: dict[int, int | None] = {}
-        for m in range(1, 13):
-            period = f"{year}-{str(m).zfill(2)}"
-            rows = df.loc[df[period_col] == period, "value"]
-            vals[m] = int(rows.sum()) if not rows.empty else None
-        return vals
-
-    def _avg_vals(df: pd.DataFrame, years: list[int]) -> dict[int, float | None]:
-        avg: dict[int, float | None] = {}
-        for m in range(1, 13):
-            ys = []
-            for yr in years:
-                period = f"{yr}-{str(m).zfill(2)}"
-                rows = df.loc[df["period"] == period, "value"]
-                if not rows.empty:
-                    v = float(rows.sum())
-                    if v > 0:
-                        ys.append(v)
-            avg[m] = round(sum(ys) / len(ys), 1) if ys else None
-        return avg
-
-    def _mensal_month_vals(counts: dict[int, int]) -> dict[int, int | None]:
-        return {m: counts.get(m) for m in range(1, 13)}
-
-    def _add_records(
-        scope_biome: str,
-        scope_state: str,
-        cur_vals: dict[int, int | None],
-        prev_vals: dict[int, int | None],
-        avg_5yr: dict[int, float | None],
-    ) -> None:
-        for m in range(1, 13):
-            records.append({
-                "month": m,
-                "biome": scope_biome,
-                "state": scope_state,
-                "current_year_val": cur_vals[m] if m <= last_closed_month else None,
-                "previous_year_val": prev_vals[m],
-                "avg_5yr_val": avg_5yr[m],
-            })
+    mensal_counts = mensal_counts or {}
+    common = {
+        "latest_year": latest_year,
+        "previous_year": previous_year,
+        "avg_years": five_avg_candidate_years,
+        "last_closed_month": last_closed_month,
+    }
 
     # --- National (__all__ biome, __all__ state) ---
-    if mensal_counts and mensal_counts.get("national"):
-        cur_nat = _mensal_month_vals(mensal_counts["national"])
-    else:
-        cur_nat = _month_vals(monthly_all_df, latest_year)
-    prev_nat = _month_vals(monthly_all_df, previous_year) if previous_year else {m: None for m in range(1, 13)}
-    avg_nat = _avg_vals(monthly_all_df, five_avg_candidate_years)
-    _add_records(ALL, ALL, cur_nat, prev_nat, avg_nat)
+    national = mensal_counts.get("national")
+    frames = [
+        _year_comparison_frame(
+            monthly_all_df.assign(scope=ALL),
+            "scope",
+            scopes=[ALL],
+            mensal={ALL: national} if national else {},
+            **common,
+        ).assign(biome=ALL, state=ALL)
+    ]
 
     # --- Per biome (__all__ state) ---
-    mensal_by_biome = mensal_counts.get("by_biome", {}) if mensal_counts else {}
     if not monthly_by_biome_df.empty:
-        for biome in monthly_by_biome_df["biome"].unique():
-            biome_df = monthly_by_biome_df[monthly_by_biome_df["biome"] == biome]
-            biome_key = str(biome).upper()
-            if biome_key in mensal_by_biome:
-                cur_b = _mensal_month_vals(mensal_by_biome[biome_key])
-            else:
-                cur_b = _month_vals(biome_df, latest_year)
-            prev_b = _month_vals(biome_df, previous_year) if previous_year else {m: None for m in range(1, 13)}
-            avg_b = _avg_vals(biome_df, five_avg_candidate_years)
-            _add_records(str(biome), ALL, cur_b, prev_b, avg_b)
+        frames.append(
+            _year_comparison_frame(
+                monthly_by_biome_df, "biome", mensal=mensal_counts.get("by_biome") or {}, **common
+            ).rename(columns={"scope": "biome"}).assign(state=ALL)
+        )
 
     # --- Per state (__all__ biome) ---
-    mensal_by_state = mensal_counts.get("by_state", {}) if mensal_counts else {}
     if not state_month_all_df.empty:
-        for state in state_month_all_df["state"].unique():
-            state_df = state_month_all_df[state_month_all_df["state"] == state]
-            state_key = str(state).upper()
-            if state_key in mensal_by_state:
-                cur_s = _mensal_month_vals(mensal_by_state[state_key])
-            else:
-                cur_s = _month_vals(state_df, latest_year)
-            prev_s = _month_vals(state_df, previous_year) if previous_year else {m: None for m in range(1, 13)}
-            avg_s = _avg_vals(state_df, five_avg_candidate_years)
-            _add_records(ALL, str(state), cur_s, prev_s, avg_s)
-
-    return records
\ No newline at end of file
+        frames.append(
+            _year_comparison_frame(
+                state_month_all_df, "state", mensal=mensal_counts.get("by_state") or {}, **common
+            ).rename(columns={"scope": "state"}).assign(biome=ALL)
+        )
+
+    columns = ["month", "biome", "state", "current_year_val", "previous_year_val", "avg_5yr_val"]
+    return pd.concat(frames, ignore_index=True)[columns].to_dict(orient="records")
+
+
+_MONTHS = list(range(1, 13))
+
+
+def _year_comparison_frame(
+    df: pd.DataFrame,
+    scope_col: str,
+    *,
+    latest_year: int,
+    previous_year: int | None,
+    avg_years: list[int],
+    last_closed_month: int,
+    mensal: dict[str, dict[int, int]],
+    scopes: list[str] | None = None,
+) -> pd.DataFrame:
+    """Rows ``scope, month, current_year_val, previous_year_val, avg_5yr_val`` (12 per scope).
+
+    Values are monthly sums of ``df`` (None when the month has no rows); the
+    average skips empty and zero months. A scope found in ``mensal`` (keys
+    compared upper-case) takes its current-year values from the INPE monthly
+    CSVs instead.
+    """
+    if scopes is None:
+        scopes = [str(scope) for scope in pd.unique(df[scope_col].astype(str))]
+    parts = df["period"].astype(str).str.extract(r"^(\d{4})-(\d{2})$")
+    sums = (
+        pd.DataFrame(
+            {
+                "scope": df[scope_col].astype(str),
+                "year": pd.to_numeric(parts[0]),
+                "month": pd.to_numeric(parts[1]),
+                "value": pd.to_numeric(df["value"]),
+            }
+        )
+        .dropna(subset=["year", "month"])
+        .astype({"year": "int64", "month": "int64"})
+        .groupby(["scope", "year", "month"])["value"]
+        .sum()
+    )
+    years = sums.index.get_level_values("year")
+
+    def _grid(values: pd.Series) -> pd.DataFrame:
+        if values.empty:
+            return pd.DataFrame(index=scopes, columns=_MONTHS, dtype=float)
+        return values.unstack("month").reindex(index=scopes, columns=_MONTHS).astype(float)
+
+    current = _grid(sums[years == latest_year].droplevel("year"))
+    previous = _grid(sums[years == previous_year].droplevel("year") if previous_year else sums.iloc[:0])
+    positive = sums[years.isin(avg_years) & (sums > 0)]
+    average = _grid(positive.groupby(level=["scope", "month"]).mean().round(1))
+
+    mensal_by_key = {str(key).upper(): per_month for key, per_month in mensal.items()}
+    overrides = {scope: mensal_by_key[scope.upper()] for scope in scopes if scope.upper() in mensal_by_key}
+    if overrides:
+        override_df = pd.DataFrame.from_dict(overrides, orient="index")
+        current.loc[list(overrides)] = override_df.reindex(index=list(overrides), columns=_MONTHS).astype(float)
+    current.loc[:, [m for m in _MONTHS if m > last_closed_month]] = float("nan")
+
+    def _column(grid: pd.DataFrame, dtype: str) -> pd.Series:
+        return _none_for_missing(pd.Series(grid.to_numpy(dtype=float).ravel()).astype(dtype))
+
+    return pd.DataFrame(
+        {
+            "scope": np.repeat(scopes, len(_MONTHS)),
+            "month": np.tile(_MONTHS, len(scopes)),
+            "current_year_val": _column(current, "Int64"),
+            "previous_year_val": _column(previous, "Int64"),
+            "avg_5yr_val": _column(average, "float64"),
+        }
+    )
@@ -121,6 +121,13 @@ class ReportAnalysisCfg(BaseModel):
     top_biomes_context_limit: int = 5
 
 
+class ReportPublishCfg(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    #core + shards por bioma/UF (reports.shards) em vez de um report.json único
+    sharded: bool = False
+
+
 class ReportConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -135,6 +142,7 @@ class ReportConfig(BaseModel):
     editorial: ReportEditorialCfg = Field(default_factory=ReportEditorialCfg)
     llm: ReportLLMCfg = Field(default_factory=ReportLLMCfg)
     analysis: ReportAnalysisCfg = Field(default_factory=ReportAnalysisCfg)
+    publish: ReportPublishCfg = Field(default_factory=ReportPublishCfg)
 
     def resolve_overrides_path(self, root: Path) -> Path | None:
         if not self.editorial.overrides_file:
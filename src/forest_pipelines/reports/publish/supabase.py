@@ -1,9 +1,22 @@
 # src/forest_pipelines/reports/publish/supabase.py
 from __future__ import annotations
 
-import json
 from typing import Any
 
+from forest_pipelines.reports.shards import is_sharded_report, rebase_report_shards
+from forest_pipelines.storage.batch import delete_objects_best_effort, upload_jobs
+from forest_pipelines.storage.json_publish import debug_copy_path, json_upload_jobs
+from forest_pipelines.storage.staged_publish import (
+    DEFAULT_KEEP_VERSIONS,
+    StagedJson,
+    VERSIONS_DIRNAME,
+    collect_expired_versions,
+    content_version,
+    load_pointer,
+    next_version_history,
+    versioned_upload_jobs,
+)
+
 REPORT_MANIFEST_SCHEMA_VERSION = "1.0"
 
 _STRICT_REPORT_META_KEYS: tuple[str, ...] = (
@@ -46,19 +59,23 @@ def _normalize_report_meta(meta: dict[str, Any] | None) -> dict[str, Any]:
     return normalized
 
 
-def _to_bytes(payload: dict[str, Any]) -> bytes:
-    return json.dumps(
-        payload,
-        ensure_ascii=False,
-        separators=(",", ":"),
-    ).encode("utf-8")
-
-
 def publish_report_package(
     storage: Any,
     package: dict[str, Any],
     logger: Any,
+    keep_versions: int = DEFAULT_KEEP_VERSIONS,
 ) -> dict[str, Any]:
+    """Publish a report package; ``manifest.json`` is the pointer and is written last.
+
+    Report files go to an immutable ``versions/<id>/`` prefix and to the legacy fixed
+    paths in one concurrent batch. The manifest then points at the new version, and
+    versions beyond ``keep_versions`` are deleted.
+
+    A sharded live report (see ``reports.shards``) is recorded under the manifest's
+    ``sharding`` key; fixed-path shards of the previous publish that are no longer
+    referenced are deleted once the new manifest is in place. Versioned report
+    copies reference the shard copies of their own version.
+    """
     report_id = package["report_id"]
     title = package["title"]
     bucket_prefix = package["bucket_prefix"].rstrip("/")
@@ -73,26 +90,15 @@ def publish_report_package(
     manifest_path = f"{bucket_prefix}/manifest.json"
     auxiliary_paths: dict[str, str] = {}
 
-    storage.upload_bytes(
-        object_path=generated_path,
-        data=_to_bytes(generated_report),
-        content_type="application/json",
-        upsert=True,
-    )
-
-    storage.upload_bytes(
-        object_path=live_path,
-        data=_to_bytes(live_report),
-        content_type="application/json",
-        upsert=True,
-    )
-
-    storage.upload_bytes(
-        object_path=stable_live_path,
-        data=_to_bytes(live_report),
-        content_type="application/json",
-        upsert=True,
-    )
+    staged_objects = [
+        StagedJson("generated/report.json", generated_report),
+        StagedJson("live/report.json", live_report),
+    ]
+    jobs = [
+        *json_upload_jobs(storage, generated_path, generated_report),
+        *json_upload_jobs(storage, live_path, live_report),
+        *json_upload_jobs(storage, stable_live_path, live_report),
+    ]
 
     for item in auxiliary_json:
         if not isinstance(item, dict):
@@ -102,14 +108,47 @@ def publish_report_package(
         if not relative_path or not isinstance(payload, dict):
             continue
         object_path = f"{bucket_prefix}/{relative_path}"
-        storage.upload_bytes(
-            object_path=object_path,
-            data=_to_bytes(payload),
-            content_type="application/json",
-            upsert=True,
-        )
+        jobs.extend(json_upload_jobs(storage, object_path, payload))
+        staged_objects.append(StagedJson(relative_path, payload))
         auxiliary_paths[relative_path] = object_path
 
+    #versão calculada antes de apontar os cores versionados para os shards da mesma versão
+    version = content_version(staged_objects)
+    staged_objects = [
+        StagedJson(obj.relative_path, rebase_report_shards(obj.payload, f"{VERSIONS_DIRNAME}/{version}"))
+        if obj.relative_path in {"generated/report.json", "live/report.json"}
+        else obj
+        for obj in staged_objects
+    ]
+    staged, versioned_jobs = versioned_upload_jobs(storage, bucket_prefix, staged_objects, version=version)
+    previous_pointer = load_pointer(storage, manifest_path, logger)
+    version_history, expired_paths = next_version_history(
+        previous_pointer,
+        staged,
+        keep_versions=keep_versions,
+    )
+
+    sharding = None
+    if is_sharded_report(live_report):
+        shard_paths = sorted({str(entry["path"]) for entry in live_report["sharding"]["shards"]})
+        sharding = {
+            "schema_version": live_report["sharding"].get("schema_version"),
+            "sections": list(live_report["sharding"].get("sections") or []),
+            "shard_count": len(shard_paths),
+            "relative_paths": shard_paths,
+        }
+    previous_sharding = (previous_pointer or {}).get("sharding")
+    previous_shard_paths = previous_sharding.get("relative_paths") if isinstance(previous_sharding, dict) else None
+    #shards fixos que sumiram (bioma/UF fora do report novo) saem depois do manifest novo
+    dropped_shard_paths: list[str] = []
+    for rel in previous_shard_paths if isinstance(previous_shard_paths, list) else []:
+        if str(rel) not in auxiliary_paths:
+            object_path = f"{bucket_prefix}/{str(rel).lstrip('/')}"
+            dropped_shard_paths.extend([object_path, debug_copy_path(object_path)])
+
+    #report files sobem em paralelo; o manifest só é escrito depois que todos chegaram
+    upload_jobs(storage, [*versioned_jobs, *jobs], logger=logger).raise_for_failures()
+
     manifest = {
         "schema_version": REPORT_MANIFEST_SCHEMA_VERSION,
         "report_id": report_id,
@@ -136,15 +175,22 @@ def publish_report_package(
                 for relative_path, object_path in auxiliary_paths.items()
             },
         },
+        "version": staged.version,
+        "versioned_paths": staged.paths,
+        "versioned_public_urls": staged.public_urls(storage),
+        "version_history": version_history,
         "meta": _normalize_report_meta(package.get("meta")),
     }
-
-    storage.upload_bytes(
-        object_path=manifest_path,
-        data=_to_bytes(manifest),
-        content_type="application/json",
-        upsert=True,
-    )
+    if sharding is not None:
+        manifest["sharding"] = sharding
+
+    upload_jobs(
+        storage,
+        json_upload_jobs(storage, manifest_path, manifest),
+        logger=logger,
+    ).raise_for_failures()
+    collect_expired_versions(storage, expired_paths, logger)
+    delete_objects_best_effort(storage, dropped_shard_paths, logger, what="shard(s) fora do report")
 
     logger.info("Report publicado: %s", manifest["public_urls"]["live_report"])
     return manifest
\ No newline at end of file
@@ -0,0 +1,233 @@
+#src/forest_pipelines/reports/shards.py
+"""Sharded layout for report documents.
+
+The core document keeps every field of the report, but sections filterable by
+biome/state only carry the national rows (biome and state both ``__all__``).
+The remaining rows go to one shard per biome (rows with state ``__all__``) and
+one shard per state (rows of that state, every biome), so the portal loads at
+most one extra document for a given filter. Shard paths are relative to the
+report's ``bucket_prefix``, like ``meta.artifacts``, and are listed under the
+core's ``sharding`` key. Versioned copies of a core point at the shard copies of
+the same version (``versions/<id>/shards/...``, see ``rebase_report_shards``).
+Only the sections listed in ``sharding.sections`` take rows from the shards.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Callable
+
+from forest_pipelines.utils.json_codec import canonical_bytes
+
+REPORT_SHARD_SCHEMA_VERSION = "1.0"
+REPORT_SHARDS_DIRNAME = "shards"
+REPORT_SHARD_BY: tuple[str, ...] = ("biome", "state")
+DEFAULT_ALL_VALUE = "__all__"
+
+
+def _slug(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", "-", ascii_text.lower()).strip("-") or "sem-nome"
+
+
+def report_shard_relative_path(by: str, value: str, taken: set[str] | None = None) -> str:
+    """``shards/<by>/<slug>.json``; a numeric suffix disambiguates slugs already in ``taken``."""
+    base = f"{REPORT_SHARDS_DIRNAME}/{by}/{_slug(value)}"
+    rel = f"{base}.json"
+    suffix = 2
+    while taken is not None and rel in taken:
+        rel = f"{base}-{suffix}.json"
+        suffix += 1
+    return rel
+
+
+def _is_shardable(section: Any) -> bool:
+    if not isinstance(section, dict) or not section.get("id") or not isinstance(section.get("data"), list):
+        return False
+    return bool(set(REPORT_SHARD_BY) & set(section.get("filterable_by") or []))
+
+
+def _shardable_sections(report: dict[str, Any]) -> list[dict[str, Any]]:
+    return [section for section in report.get("sections") or [] if _is_shardable(section)]
+
+
+def split_report_into_shards(
+    report: dict[str, Any],
+    *,
+    all_value: str = DEFAULT_ALL_VALUE,
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Split a report into a core document and per-biome/per-state shard documents.
+
+    Returns ``(core, shards)`` where ``shards`` maps the relative path to the shard
+    payload. Rows keep their order inside each document; ``hydrate_report_shards``
+    rebuilds the full sections.
+    """
+    grouped: dict[tuple[str, str], dict[str, list[dict[str, Any]]]] = {}
+    core = {**report, "sections": list(report.get("sections") or [])}
+    section_ids: list[str] = []
+
+    for index, section in enumerate(core["sections"]):
+        if not _is_shardable(section):
+            continue
+        section_id = str(section["id"])
+        biome_key = str(section.get("biome_key") or "biome")
+        state_key = str(section.get("state_key") or "state")
+        national: list[dict[str, Any]] = []
+        for row in section["data"]:
+            biome = str(row.get(biome_key) or all_value) if isinstance(row, dict) else all_value
+            state = str(row.get(state_key) or all_value) if isinstance(row, dict) else all_value
+            if state != all_value:
+                key = ("state", state)
+            elif biome != all_value:
+                key = ("biome", biome)
+            else:
+                national.append(row)
+                continue
+            grouped.setdefault(key, {}).setdefault(section_id, []).append(row)
+
+        core["sections"][index] = {**section, "data": national}
+        section_ids.append(section_id)
+
+    shards: dict[str, dict[str, Any]] = {}
+    entries: list[dict[str, Any]] = []
+    for by, value in sorted(grouped, key=lambda k: (REPORT_SHARD_BY.index(k[0]), k[1])):
+        rel = report_shard_relative_path(by, value, set(shards))
+        sections = grouped[(by, value)]
+        shards[rel] = {
+            "schema_version": REPORT_SHARD_SCHEMA_VERSION,
+            "report_id": report.get("report_id"),
+            "shard": {"by": by, "value": value},
+            "sections": sections,
+        }
+        entries.append(
+            {"by": by, "value": value, "path": rel, "row_count": sum(len(rows) for rows in sections.values())}
+        )
+
+    core["sharding"] = {
+        "schema_version": REPORT_SHARD_SCHEMA_VERSION,
+        "by": list(REPORT_SHARD_BY),
+        "all_value": all_value,
+        "sections": section_ids,
+        "shards": entries,
+    }
+    return core, shards
+
+
+def is_sharded_report(report: dict[str, Any] | None) -> bool:
+    return isinstance(report, dict) and isinstance((report.get("sharding") or {}).get("shards"), list)
+
+
+def hydrate_report_shards(
+    core: dict[str, Any],
+    load_shard: Callable[[str], dict[str, Any] | None],
+) -> tuple[dict[str, Any], list[str]]:
+    """Reference implementation of the consumer side: full report from core + shards.
+
+    Shard rows are merged only into the sections listed in ``sharding.sections``;
+    other sections (e.g. live sections changed by editorial overrides) are already
+    complete in the core. Returns the report (without ``sharding``) and the
+    relative paths of shards that could not be loaded.
+    """
+    sharding = core.get("sharding") or {}
+    sharded_ids = {str(section_id) for section_id in sharding.get("sections") or []}
+    rows_by_section: dict[str, list[dict[str, Any]]] = {}
+    missing: list[str] = []
+    for entry in sharding.get("shards") or []:
+        if not isinstance(entry, dict) or not entry.get("path"):
+            continue
+        shard = load_shard(str(entry["path"]))
+        sections = shard.get("sections") if isinstance(shard, dict) else None
+        if not isinstance(sections, dict):
+            missing.append(str(entry["path"]))
+            continue
+        for section_id, rows in sections.items():
+            if str(section_id) in sharded_ids:
+                rows_by_section.setdefault(str(section_id), []).extend(rows or [])
+
+    report = {key: value for key, value in core.items() if key != "sharding"}
+    report["sections"] = [
+        {**section, "data": [*section["data"], *rows_by_section.get(str(section["id"]), [])]}
+        if isinstance(section, dict) and str(section.get("id")) in rows_by_section
+        else section
+        for section in core.get("sections") or []
+    ]
+    return report, missing
+
+
+def rebase_report_shards(core: dict[str, Any], prefix: str) -> dict[str, Any]:
+    """Copy of a sharded core whose shard paths start with ``prefix`` (e.g. ``versions/<id>``)."""
+    if not is_sharded_report(core):
+        return core
+    prefix = prefix.strip("/")
+    sharding = core["sharding"]
+    return {
+        **core,
+        "sharding": {
+            **sharding,
+            "shards": [
+                {**entry, "path": f"{prefix}/{str(entry['path']).lstrip('/')}"}
+                if isinstance(entry, dict) and entry.get("path")
+                else entry
+                for entry in sharding["shards"]
+            ],
+        },
+    }
+
+
+def shard_report_package(package: dict[str, Any], *, all_value: str = DEFAULT_ALL_VALUE) -> dict[str, Any]:
+    """Package with sharded generated/live reports and the shards added to ``auxiliary_json``.
+
+    Shards come from the generated report. The live report only references them
+    for sections whose data the editorial overrides left untouched; any other
+    filterable section stays inline in the live core.
+    """
+    generated_core, shards = split_report_into_shards(package["generated_report"], all_value=all_value)
+    live_core, _ = split_report_into_shards(package["live_report"], all_value=all_value)
+
+    generated_data = {s["id"]: canonical_bytes(s["data"]) for s in _shardable_sections(package["generated_report"])}
+    live_sections = {s["id"]: s for s in _shardable_sections(package["live_report"])}
+    diverged = {
+        section_id
+        for section_id, section in live_sections.items()
+        if generated_data.get(section_id) != canonical_bytes(section["data"])
+    }
+    if diverged:
+        live_core["sections"] = [
+            live_sections[section["id"]]
+            if isinstance(section, dict) and section.get("id") in diverged
+            else section
+            for section in live_core["sections"]
+        ]
+        live_core["sharding"] = {
+            **generated_core["sharding"],
+            "sections": [s for s in generated_core["sharding"]["sections"] if s not in diverged],
+        }
+
+    auxiliary = [
+        *(package.get("auxiliary_json") or []),
+        *({"relative_path": rel, "payload": payload} for rel, payload in shards.items()),
+    ]
+    meta = dict(package.get("meta") or {})
+    meta["sharding"] = {"shard_count": len(shards), "sections": generated_core["sharding"]["sections"]}
+    return {
+        **package,
+        "generated_report": generated_core,
+        "live_report": live_core,
+        "auxiliary_json": auxiliary,
+        "meta": meta,
+    }
+
+
+__all__ = [
+    "DEFAULT_ALL_VALUE",
+    "REPORT_SHARDS_DIRNAME",
+    "REPORT_SHARD_BY",
+    "REPORT_SHARD_SCHEMA_VERSION",
+    "hydrate_report_shards",
+    "is_sharded_report",
+    "rebase_report_shards",
+    "report_shard_relative_path",
+    "shard_report_package",
+    "split_report_into_shards",
+]
@@ -33,6 +33,8 @@ class Settings:
     reports_dir: Path
     supabase_bucket_open_data: str
     llm: LLMSettings
+    storage_backend: str = "supabase"
+    local_storage_dir: Path | None = None
 
 
 def load_settings(config_path: str) -> Settings:
@@ -51,6 +53,19 @@ def load_settings(config_path: str) -> Settings:
     bucket_env = cfg["supabase"]["bucket_open_data_env"]
     bucket = os.getenv(bucket_env, "open-data")
 
+    #FP_STORAGE_BACKEND sobrepõe storage.backend do YAML (supabase | local)
+    storage_cfg = cfg.get("storage", {}) or {}
+    storage_backend = (
+        os.getenv("FP_STORAGE_BACKEND", "").strip().lower()
+        or str(storage_cfg.get("backend", "supabase")).strip().lower()
+    )
+    if storage_backend not in {"supabase", "local"}:
+        raise ValueError(f"storage.backend inválido: {storage_backend!r} (use 'supabase' ou 'local')")
+    local_storage_raw = os.getenv("FP_LOCAL_STORAGE_DIR", "").strip() or str(
+        storage_cfg.get("local_dir", "data/_local_storage")
+    )
+    local_storage_dir = (root / local_storage_raw).resolve()
+
     llm_cfg = cfg.get("llm", {}) or {}
     preferred_models = llm_cfg.get("preferred_models", []) or []
 
@@ -79,4 +94,6 @@ def load_settings(config_path: str) -> Settings:
             timeout_s=float(llm_cfg.get("timeout_s", 90.0)),
             preferred_models=tuple(str(m).strip() for m in preferred_models if str(m).strip()),
         ),
+        storage_backend=storage_backend,
+        local_storage_dir=local_storage_dir,
     )
@@ -0,0 +1,179 @@
+# src/forest_pipelines/storage/batch.py
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+DEFAULT_UPLOAD_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class UploadJob:
+    """One object to publish. Exactly one of ``data`` / ``local_path`` must be set."""
+
+    object_path: str
+    content_type: str
+    data: bytes | None = field(default=None, repr=False)
+    local_path: str | None = None
+    upsert: bool = True
+    content_encoding: str | None = None
+    cache_control: str | None = None
+
+    def __post_init__(self) -> None:
+        if (self.data is None) == (self.local_path is None):
+            raise ValueError(f"UploadJob precisa de data OU local_path: {self.object_path}")
+
+
+@dataclass
+class UploadManyResult:
+    uploaded: list[str] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "uploaded_count": len(self.uploaded),
+            "failed_count": len(self.failed),
+            "failed": {path: f"{type(exc).__name__}: {exc}" for path, exc in self.failed.items()},
+        }
+
+    def raise_for_failures(self) -> None:
+        if not self.failed:
+            return
+        first_path = sorted(self.failed)[0]
+        raise RuntimeError(
+            f"Falha ao subir {len(self.failed)} objeto(s): {sorted(self.failed)}"
+        ) from self.failed[first_path]
+
+
+def _run_job(storage: Any, job: UploadJob) -> None:
+    #content_encoding/cache_control só são repassados quando definidos, mantendo backends simples compatíveis
+    extra: dict[str, Any] = {}
+    if job.content_encoding:
+        extra["content_encoding"] = job.content_encoding
+    if job.cache_control:
+        extra["cache_control"] = job.cache_control
+    if job.local_path is not None:
+        storage.upload_file(
+            object_path=job.object_path,
+            local_path=job.local_path,
+            content_type=job.content_type,
+            upsert=job.upsert,
+            **extra,
+        )
+        return
+    storage.upload_bytes(
+        object_path=job.object_path,
+        data=job.data,
+        content_type=job.content_type,
+        upsert=job.upsert,
+        **extra,
+    )
+
+
+def upload_many(
+    storage: Any,
+    jobs: Iterable[UploadJob],
+    *,
+    max_workers: int | None = None,
+    logger: Any = None,
+) -> UploadManyResult:
+    """Upload several objects on a bounded thread pool.
+
+    Works with any storage exposing ``upload_bytes`` / ``upload_file``; retries stay
+    per object inside those methods. Failures are collected rather than raised so the
+    caller decides whether a partial publish is acceptable (see ``raise_for_failures``).
+    """
+    job_list = list(jobs)
+    result = UploadManyResult()
+    if not job_list:
+        return result
+
+    if max_workers is None:
+        max_workers = int(getattr(storage, "upload_max_workers", DEFAULT_UPLOAD_MAX_WORKERS))
+    workers = max(1, min(int(max_workers), len(job_list)))
+
+    if workers == 1:
+        for job in job_list:
+            try:
+                _run_job(storage, job)
+                result.uploaded.append(job.object_path)
+            except Exception as exc:  # noqa: BLE001
+                result.failed[job.object_path] = exc
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_job, storage, job): job for job in job_list}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    future.result()
+                    result.uploaded.append(job.object_path)
+                except Exception as exc:  # noqa: BLE001
+                    result.failed[job.object_path] = exc
+
+    if logger:
+        logger.info(
+            "Upload em lote: %d enviado(s), %d falha(s) (workers=%d)",
+            len(result.uploaded),
+            len(result.failed),
+            workers,
+        )
+        for path, exc in sorted(result.failed.items()):
+            logger.warning("Upload em lote falhou: %s erro=%s", path, exc)
+    return result
+
+
+def delete_objects_best_effort(
+    storage: Any,
+    object_paths: Iterable[str],
+    logger: Any = None,
+    *,
+    what: str = "objetos",
+) -> None:
+    """Delete ``object_paths`` when the storage supports it; failures are logged, never raised."""
+    paths = [path for path in dict.fromkeys(object_paths) if path]
+    if not paths:
+        return
+    delete = getattr(storage, "delete_objects", None)
+    if delete is None:
+        if logger:
+            logger.info("Storage sem delete_objects; %d %s mantidos", len(paths), what)
+        return
+    try:
+        delete(paths)
+    except Exception as exc:  # noqa: BLE001
+        if logger:
+            logger.warning("Falha ao remover %d %s: %s", len(paths), what, exc)
+
+
+def upload_jobs(
+    storage: Any,
+    jobs: Iterable[UploadJob],
+    *,
+    max_workers: int | None = None,
+    logger: Any = None,
+) -> UploadManyResult:
+    """Upload through ``storage.upload_many`` when the backend has one.
+
+    Backends use their own ``upload_many`` to get ready for the thread pool
+    (SupabaseStorage builds its client before the workers start); storages
+    without one fall back to the module-level ``upload_many``.
+    """
+    method = getattr(storage, "upload_many", None)
+    if callable(method):
+        return method(jobs, max_workers=max_workers)
+    return upload_many(storage, jobs, max_workers=max_workers, logger=logger)
+
+
+__all__ = [
+    "DEFAULT_UPLOAD_MAX_WORKERS",
+    "UploadJob",
+    "UploadManyResult",
+    "delete_objects_best_effort",
+    "upload_jobs",
+    "upload_many",
+]
@@ -0,0 +1,122 @@
+# src/forest_pipelines/storage/download_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_DOWNLOAD_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_download_cache_dir(data_dir: Path, bucket: str) -> Path:
+    return Path(data_dir) / "_state" / "download_cache" / bucket
+
+
+@dataclass
+class DownloadCache:
+    """Read-through cache for storage downloads: in-process LRU plus optional disk tier.
+
+    The memory tier is bounded by total payload size and lives for the process, so
+    objects read by one step of a run (e.g. manifests during ``sync-all``) are reused
+    by later steps (``publish-catalog``). The disk tier is only used when ``disk_dir``
+    is set and ``disk_ttl_seconds`` > 0; entries older than the TTL are ignored.
+    Storage backends must call ``put``/``invalidate`` on their own uploads so the
+    cache never serves content older than what this process wrote.
+    """
+
+    max_bytes: int = DEFAULT_DOWNLOAD_CACHE_MAX_BYTES
+    disk_dir: Path | None = None
+    disk_ttl_seconds: float = 0.0
+    stats: dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0})
+    _entries: OrderedDict[str, bytes] = field(default_factory=OrderedDict, init=False, repr=False)
+    _size: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self.disk_dir is not None and self.disk_ttl_seconds > 0
+
+    def _disk_path(self, object_path: str) -> Path:
+        key = hashlib.sha256(object_path.encode("utf-8")).hexdigest()
+        return Path(self.disk_dir) / key[:2] / f"{key}.bin"  # type: ignore[arg-type]
+
+    def _memory_put_locked(self, object_path: str, data: bytes) -> None:
+        old = self._entries.pop(object_path, None)
+        if old is not None:
+            self._size -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[object_path] = data
+        self._size += len(data)
+        while self._size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_get(self, object_path: str) -> bytes | None:
+        if not self.disk_enabled:
+            return None
+        path = self._disk_path(object_path)
+        try:
+            if time.time() - path.stat().st_mtime > self.disk_ttl_seconds:
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def _disk_put(self, object_path: str, data: bytes) -> None:
+        if not self.disk_enabled:
+            return
+        path = self._disk_path(object_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            #cache em disco é best-effort; falha aqui só custa um download a mais
+            return
+
+    def get(self, object_path: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(object_path)
+            if data is not None:
+                self._entries.move_to_end(object_path)
+                self.stats["hits"] += 1
+                return data
+
+        data = self._disk_get(object_path)
+        with self._lock:
+            if data is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._memory_put_locked(object_path, data)
+        return data
+
+    def put(self, object_path: str, data: bytes) -> None:
+        data = bytes(data)
+        with self._lock:
+            self._memory_put_locked(object_path, data)
+        self._disk_put(object_path, data)
+
+    def invalidate(self, object_path: str) -> None:
+        with self._lock:
+            old = self._entries.pop(object_path, None)
+            if old is not None:
+                self._size -= len(old)
+        if self.disk_enabled:
+            try:
+                self._disk_path(object_path).unlink()
+            except OSError:
+                pass
+
+
+__all__ = [
+    "DEFAULT_DOWNLOAD_CACHE_MAX_BYTES",
+    "DownloadCache",
+    "default_download_cache_dir",
+]
@@ -0,0 +1,143 @@
+# src/forest_pipelines/storage/json_publish.py
+from __future__ import annotations
+
+import gzip
+from typing import Any
+
+from forest_pipelines.storage.batch import UploadJob
+from forest_pipelines.utils.json_codec import dumps_bytes
+
+JSON_CONTENT_TYPE = "application/json"
+SUPPORTED_JSON_COMPRESSIONS = ("gzip", "br")
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def normalize_json_compression(value: str | None) -> str | None:
+    norm = str(value or "").strip().lower()
+    if norm in {"", "none", "identity", "off", "0"}:
+        return None
+    if norm == "brotli":
+        norm = "br"
+    if norm not in SUPPORTED_JSON_COMPRESSIONS:
+        raise ValueError(
+            f"Compressão JSON inválida: {value!r}. Use uma de {SUPPORTED_JSON_COMPRESSIONS} ou vazio."
+        )
+    return norm
+
+
+def json_dumps_bytes(payload: Any, *, pretty: bool = False) -> bytes:
+    return dumps_bytes(payload, pretty=pretty)
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        #mtime=0 deixa a saída determinística (o índice de hash de upload depende disso)
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br":
+        return _brotli().compress(data, quality=11)
+    raise ValueError(f"Compressão não suportada: {encoding}")
+
+
+def _brotli() -> Any:
+    try:
+        import brotli  # type: ignore  # noqa: PLC0415
+    except ImportError as exc:
+        raise RuntimeError(
+            "Compressão 'br' requer o pacote opcional 'brotli' (pip install '.[brotli]')."
+        ) from exc
+    return brotli
+
+
+def maybe_decompress(data: bytes, content_encoding: str | None = None) -> bytes:
+    """Undo the compression of objects we published pre-compressed.
+
+    gzip is detected by its magic bytes. Brotli has no magic bytes, so it is only
+    decoded when the caller passes the object's ``content_encoding`` (see
+    ``needs_content_encoding``).
+    """
+    if normalize_json_compression(content_encoding) == "br":
+        brotli = _brotli()
+        try:
+            return brotli.decompress(data)
+        except Exception:  # noqa: BLE001 - brotli.error varia entre brotli e brotlicffi
+            #objeto marcado como br mas já entregue decodificado (ex.: cliente HTTP descomprimiu)
+            return data
+    if data[:2] == _GZIP_MAGIC:
+        try:
+            return gzip.decompress(data)
+        except (OSError, EOFError):
+            return data
+    return data
+
+
+def needs_content_encoding(object_path: str, data: bytes) -> bool:
+    """True when a downloaded JSON object may be brotli and its Content-Encoding must be looked up.
+
+    Only ``json_upload_jobs`` compresses, and only ``*.json`` documents; plain
+    JSON starts with ``{``/``[`` and gzip is recognized by ``maybe_decompress``.
+    """
+    if not object_path.endswith(".json") or data[:2] == _GZIP_MAGIC:
+        return False
+    return data[:64].lstrip()[:1] not in (b"{", b"[")
+
+
+def debug_copy_path(object_path: str) -> str:
+    if object_path.endswith(".json"):
+        return f"{object_path[:-5]}.debug.json"
+    return f"{object_path}.debug.json"
+
+
+def json_upload_jobs(
+    storage: Any,
+    object_path: str,
+    payload: Any,
+    *,
+    content_type: str = JSON_CONTENT_TYPE,
+    upsert: bool = True,
+    cache_control: str | None = None,
+) -> list[UploadJob]:
+    """Upload jobs for a JSON document following the storage's publish settings.
+
+    The main object is compact JSON, compressed when ``storage.json_compression``
+    is set (with the matching Content-Encoding). A pretty-printed, uncompressed
+    ``*.debug.json`` sibling is added only when ``storage.json_debug_copy`` is on.
+    """
+    compression = normalize_json_compression(getattr(storage, "json_compression", None))
+    data = json_dumps_bytes(payload)
+    if compression:
+        data = compress_bytes(data, compression)
+
+    jobs = [
+        UploadJob(
+            object_path=object_path,
+            data=data,
+            content_type=content_type,
+            content_encoding=compression,
+            upsert=upsert,
+            cache_control=cache_control,
+        )
+    ]
+    if getattr(storage, "json_debug_copy", False):
+        jobs.append(
+            UploadJob(
+                object_path=debug_copy_path(object_path),
+                data=json_dumps_bytes(payload, pretty=True),
+                content_type=content_type,
+                upsert=upsert,
+                cache_control=cache_control,
+            )
+        )
+    return jobs
+
+
+__all__ = [
+    "JSON_CONTENT_TYPE",
+    "SUPPORTED_JSON_COMPRESSIONS",
+    "compress_bytes",
+    "debug_copy_path",
+    "json_dumps_bytes",
+    "json_upload_jobs",
+    "maybe_decompress",
+    "needs_content_encoding",
+    "normalize_json_compression",
+]
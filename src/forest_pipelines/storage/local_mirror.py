@@ -0,0 +1,80 @@
+# src/forest_pipelines/storage/local_mirror.py
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def default_object_mirror_dir(data_dir: Path, bucket: str) -> Path:
+    return Path(data_dir) / "_state" / "object_mirror" / bucket
+
+
+def object_mirror_from_env(mirror_dir: Path) -> LocalObjectMirror | None:
+    #FP_REPORT_CACHE_MIRROR=0 desliga o espelho local dos caches de report
+    if os.getenv("FP_REPORT_CACHE_MIRROR", "").strip().lower() in _FALSE_VALUES:
+        return None
+    return LocalObjectMirror(root=Path(mirror_dir))
+
+
+@dataclass
+class LocalObjectMirror:
+    """On-disk copy of storage objects, laid out by object path under ``root``.
+
+    Unlike ``DownloadCache`` there is no TTL: a mirrored copy is only as good as
+    the caller's validation (e.g. the fingerprint and build signature recorded in
+    a freshly downloaded manifest). Callers ``write`` after every upload or
+    download and ``discard`` copies that failed validation.
+    """
+
+    root: Path
+    stats: dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0, "writes": 0})
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def path_for(self, object_path: str) -> Path:
+        parts = PurePosixPath(object_path.strip("/")).parts
+        if not parts or any(part in {"", ".", ".."} for part in parts):
+            raise ValueError(f"Caminho de objeto inválido para o espelho local: {object_path!r}")
+        return Path(self.root).joinpath(*parts)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def read(self, object_path: str) -> bytes | None:
+        try:
+            data = self.path_for(object_path).read_bytes()
+        except OSError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return data
+
+    def write(self, object_path: str, data: bytes) -> None:
+        path = self.path_for(object_path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(bytes(data))
+            os.replace(tmp, path)
+        except OSError:
+            #espelho é best-effort; falha aqui só custa um download no próximo build
+            tmp.unlink(missing_ok=True)
+            return
+        self._count("writes")
+
+    def discard(self, object_path: str) -> None:
+        try:
+            self.path_for(object_path).unlink()
+        except OSError:
+            pass
+
+
+__all__ = [
+    "LocalObjectMirror",
+    "default_object_mirror_dir",
+    "object_mirror_from_env",
+]
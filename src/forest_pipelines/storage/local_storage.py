@@ -0,0 +1,214 @@
+# src/forest_pipelines/storage/local_storage.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Iterable
+
+from forest_pipelines.storage.batch import (
+    DEFAULT_UPLOAD_MAX_WORKERS,
+    UploadJob,
+    UploadManyResult,
+    upload_jobs,
+    upload_many,
+)
+from forest_pipelines.storage.json_publish import (
+    maybe_decompress,
+    needs_content_encoding,
+    normalize_json_compression,
+)
+
+_META_DIRNAME = ".meta"
+
+
+@dataclass
+class LocalStorage:
+    """Filesystem backend with the SupabaseStorage interface.
+
+    Objects live under ``root/<object_path>``; content type / encoding are kept in
+    a sidecar under ``root/.meta/`` so a staged run can later be pushed as-is
+    (see ``push_local_storage``).
+    """
+
+    root: Path
+    bucket: str = "open-data"
+    logger: Any = None
+    public_base_url: str | None = None
+    upload_max_workers: int = DEFAULT_UPLOAD_MAX_WORKERS
+    json_compression: str | None = None
+    json_debug_copy: bool = False
+    upload_stats: dict[str, int] = field(default_factory=lambda: {"written": 0, "skipped": 0})
+    _stats_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root).resolve()
+
+    @classmethod
+    def from_env(cls, logger: Any, root: Path, bucket_open_data: str) -> "LocalStorage":
+        bucket = (bucket_open_data or "").strip() or "open-data"
+        return cls(
+            root=Path(root) / bucket,
+            bucket=bucket,
+            logger=logger,
+            public_base_url=os.getenv("FP_LOCAL_STORAGE_PUBLIC_BASE_URL", "").strip() or None,
+            json_compression=normalize_json_compression(os.getenv("FP_JSON_COMPRESSION")),
+            json_debug_copy=os.getenv("FP_JSON_DEBUG_COPY", "").strip().lower() in {"1", "true", "yes", "on"},
+        )
+
+    def _object_file(self, object_path: str) -> Path:
+        rel = PurePosixPath(object_path.lstrip("/"))
+        if not rel.parts or any(part in ("", ".", "..") for part in rel.parts) or rel.parts[0] == _META_DIRNAME:
+            raise ValueError(f"object_path inválido para LocalStorage: {object_path!r}")
+        return self.root.joinpath(*rel.parts)
+
+    def _meta_file(self, object_path: str) -> Path:
+        rel = PurePosixPath(object_path.lstrip("/"))
+        return self.root.joinpath(_META_DIRNAME, *rel.parts[:-1], f"{rel.name}.json")
+
+    def _write(
+        self,
+        object_path: str,
+        data: bytes,
+        content_type: str,
+        upsert: bool,
+        content_encoding: str | None,
+        cache_control: str | None = None,
+    ) -> None:
+        target = self._object_file(object_path)
+        if target.exists() and not upsert:
+            raise FileExistsError(f"Objeto já existe: {object_path}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+        meta_path = self._meta_file(object_path)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "content_type": content_type,
+            "content_encoding": content_encoding,
+            "cache_control": cache_control,
+        }
+        meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        with self._stats_lock:
+            self.upload_stats["written"] = self.upload_stats.get("written", 0) + 1
+        if self.logger:
+            self.logger.info("Local upload: %s (%d bytes)", object_path, len(data))
+
+    def upload_file(
+        self,
+        object_path: str,
+        local_path: str,
+        content_type: str,
+        upsert: bool = True,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        with open(local_path, "rb") as f:
+            data = f.read()
+        self._write(object_path, data, content_type, upsert, content_encoding, cache_control)
+
+    def upload_bytes(
+        self,
+        object_path: str,
+        data: bytes,
+        content_type: str,
+        upsert: bool = True,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        self._write(object_path, data, content_type, upsert, content_encoding, cache_control)
+
+    def upload_many(
+        self,
+        jobs: Iterable[UploadJob],
+        max_workers: int | None = None,
+    ) -> UploadManyResult:
+        return upload_many(
+            self,
+            jobs,
+            max_workers=max_workers or self.upload_max_workers,
+            logger=self.logger,
+        )
+
+    def download_bytes(self, object_path: str) -> bytes | None:
+        try:
+            data = self._object_file(object_path).read_bytes()
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.info("Download ausente ou indisponível: %s (erro=%s)", object_path, e)
+            return None
+        content_encoding = None
+        if needs_content_encoding(object_path, data):
+            content_encoding = self.object_meta(object_path).get("content_encoding")
+        return maybe_decompress(data, content_encoding)
+
+    def object_meta(self, object_path: str) -> dict[str, Any]:
+        try:
+            meta = json.loads(self._meta_file(object_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) else {}
+
+    def iter_object_paths(self, prefix: str = "") -> list[str]:
+        prefix = prefix.strip("/")
+        base = self.root / prefix if prefix else self.root
+        if not base.exists():
+            return []
+        out: list[str] = []
+        for path in sorted(base.rglob("*")):
+            if not path.is_file() or path.name.endswith(".tmp"):
+                continue
+            rel = path.relative_to(self.root)
+            if rel.parts[0] == _META_DIRNAME:
+                continue
+            out.append(rel.as_posix())
+        return out
+
+    def delete_objects(self, object_paths: Iterable[str]) -> None:
+        for object_path in object_paths:
+            for path in (self._object_file(object_path), self._meta_file(object_path)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def public_url(self, object_path: str) -> str:
+        path = object_path.lstrip("/")
+        if self.public_base_url:
+            return f"{self.public_base_url.rstrip('/')}/{self.bucket}/{path}"
+        return self._object_file(path).as_uri()
+
+
+def push_local_storage(
+    source: LocalStorage,
+    target: Any,
+    *,
+    prefix: str = "",
+    max_workers: int | None = None,
+    logger: Any = None,
+) -> UploadManyResult:
+    """Push every object staged in ``source`` to ``target`` in one batched step."""
+    jobs: list[UploadJob] = []
+    for object_path in source.iter_object_paths(prefix):
+        meta = source.object_meta(object_path)
+        jobs.append(
+            UploadJob(
+                object_path=object_path,
+                local_path=str(source._object_file(object_path)),
+                content_type=str(meta.get("content_type") or "application/octet-stream"),
+                content_encoding=meta.get("content_encoding") or None,
+                cache_control=meta.get("cache_control") or None,
+            )
+        )
+    return upload_jobs(target, jobs, max_workers=max_workers, logger=logger)
+
+
+__all__ = [
+    "LocalStorage",
+    "push_local_storage",
+]
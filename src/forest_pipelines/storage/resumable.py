@@ -0,0 +1,227 @@
+# src/forest_pipelines/storage/resumable.py
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin
+
+import requests
+
+TUS_VERSION = "1.0.0"
+#o endpoint TUS do Supabase exige chunks de exatamente 6 MiB (exceto o último)
+SUPABASE_TUS_CHUNK_SIZE = 6 * 1024 * 1024
+DEFAULT_RESUMABLE_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+
+def default_resumable_state_path(data_dir: Path, bucket: str) -> Path:
+    return Path(data_dir) / "_state" / f"resumable_uploads_{bucket}.json"
+
+
+def _encode_upload_metadata(values: dict[str, str]) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode('utf-8')).decode('ascii')}"
+        for key, value in values.items()
+    )
+
+
+@dataclass
+class ResumableUploader:
+    """TUS client for large objects.
+
+    The file is sent in ``chunk_size`` PATCH requests. On a failed chunk the
+    server offset is re-read with HEAD and the upload continues from there, so a
+    network blip near the end of a big file only costs the chunk in flight. Upload
+    URLs are remembered per (bucket, object, size, mtime) in ``state_path`` when
+    set, which also lets a new process resume an interrupted upload.
+    """
+
+    endpoint: str
+    auth_headers: dict[str, str] = field(repr=False)
+    chunk_size: int = SUPABASE_TUS_CHUNK_SIZE
+    state_path: Path | None = None
+    max_chunk_retries: int = 5
+    timeout_s: float = 120.0
+    logger: Any = None
+    session: Any = None
+    _state: dict[str, str] | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size precisa ser positivo")
+        if self.session is None:
+            self.session = requests.Session()
+
+    # --- estado persistido (fingerprint -> upload url) ---
+
+    def _load_state_locked(self) -> dict[str, str]:
+        if self._state is not None:
+            return self._state
+        state: dict[str, str] = {}
+        if self.state_path is not None:
+            try:
+                raw = json.loads(Path(self.state_path).read_text(encoding="utf-8"))
+                if isinstance(raw, dict):
+                    state = {str(k): str(v) for k, v in raw.items() if isinstance(v, str)}
+            except (OSError, ValueError):
+                state = {}
+        self._state = state
+        return state
+
+    def _save_state_locked(self) -> None:
+        if self.state_path is None or self._state is None:
+            return
+        target = Path(self.state_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(dict(sorted(self._state.items())), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def _remember(self, fingerprint: str, upload_url: str | None) -> None:
+        with self._lock:
+            state = self._load_state_locked()
+            if upload_url is None:
+                if state.pop(fingerprint, None) is None:
+                    return
+            else:
+                state[fingerprint] = upload_url
+            self._save_state_locked()
+
+    def _recall(self, fingerprint: str) -> str | None:
+        with self._lock:
+            return self._load_state_locked().get(fingerprint)
+
+    # --- protocolo TUS ---
+
+    def _headers(self, extra: dict[str, str] | None = None) -> dict[str, str]:
+        headers = {"Tus-Resumable": TUS_VERSION, **self.auth_headers}
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def _server_offset(self, upload_url: str) -> int | None:
+        try:
+            resp = self.session.head(upload_url, headers=self._headers(), timeout=self.timeout_s)
+        except requests.RequestException:
+            return None
+        if resp.status_code not in (200, 204):
+            return None
+        try:
+            return int(resp.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return None
+
+    def _create(self, size: int, metadata: dict[str, str], upsert: bool) -> str:
+        resp = self.session.post(
+            self.endpoint,
+            headers=self._headers(
+                {
+                    "Upload-Length": str(size),
+                    "Upload-Metadata": _encode_upload_metadata(metadata),
+                    "x-upsert": "true" if upsert else "false",
+                }
+            ),
+            timeout=self.timeout_s,
+        )
+        if resp.status_code not in (200, 201):
+            raise RuntimeError(f"TUS create falhou: status={resp.status_code} body={resp.text[:200]}")
+        location = resp.headers.get("Location")
+        if not location:
+            raise RuntimeError("TUS create sem header Location")
+        return urljoin(self.endpoint, location)
+
+    def upload(
+        self,
+        local_path: str | Path,
+        *,
+        bucket: str,
+        object_path: str,
+        content_type: str,
+        upsert: bool = True,
+        user_metadata: dict[str, str] | None = None,
+        cache_control: str | None = None,
+    ) -> str:
+        path = Path(local_path)
+        stat = path.stat()
+        size = stat.st_size
+        fingerprint = f"{bucket}/{object_path}:{size}:{stat.st_mtime_ns}"
+
+        metadata = {
+            "bucketName": bucket,
+            "objectName": object_path,
+            "contentType": content_type,
+        }
+        if cache_control:
+            metadata["cacheControl"] = cache_control
+        if user_metadata:
+            metadata["metadata"] = json.dumps(user_metadata, ensure_ascii=False)
+
+        upload_url = self._recall(fingerprint)
+        offset = self._server_offset(upload_url) if upload_url else None
+        if upload_url and offset is not None and self.logger:
+            self.logger.info("Upload retomado: %s offset=%d/%d", object_path, offset, size)
+        if offset is None:
+            upload_url = self._create(size, metadata, upsert)
+            offset = 0
+            self._remember(fingerprint, upload_url)
+
+        failures = 0
+        with open(path, "rb") as f:
+            while offset < size:
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+                try:
+                    resp = self.session.patch(
+                        upload_url,
+                        data=chunk,
+                        headers=self._headers(
+                            {
+                                "Upload-Offset": str(offset),
+                                "Content-Type": "application/offset+octet-stream",
+                            }
+                        ),
+                        timeout=self.timeout_s,
+                    )
+                    if resp.status_code not in (200, 204):
+                        raise RuntimeError(f"status={resp.status_code} body={resp.text[:200]}")
+                    offset = int(resp.headers.get("Upload-Offset", offset + len(chunk)))
+                    failures = 0
+                except (requests.RequestException, RuntimeError, ValueError) as e:
+                    failures += 1
+                    if self.logger:
+                        self.logger.warning(
+                            "Falha no chunk TUS %s offset=%d (tentativa=%d). erro=%s",
+                            object_path,
+                            offset,
+                            failures,
+                            e,
+                        )
+                    if failures > self.max_chunk_retries:
+                        raise RuntimeError(f"Upload TUS abortado para {object_path} em offset={offset}") from e
+                    time.sleep(min(2 * failures, 10))
+                    server_offset = self._server_offset(upload_url)
+                    if server_offset is None:
+                        #upload expirou no servidor: recomeça do zero com nova url
+                        upload_url = self._create(size, metadata, upsert)
+                        self._remember(fingerprint, upload_url)
+                        offset = 0
+                    else:
+                        offset = server_offset
+
+        self._remember(fingerprint, None)
+        return upload_url
+
+
+__all__ = [
+    "DEFAULT_RESUMABLE_THRESHOLD_BYTES",
+    "ResumableUploader",
+    "SUPABASE_TUS_CHUNK_SIZE",
+    "TUS_VERSION",
+    "default_resumable_state_path",
+]
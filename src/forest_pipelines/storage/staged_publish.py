@@ -0,0 +1,161 @@
+# src/forest_pipelines/storage/staged_publish.py
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from forest_pipelines.storage.batch import UploadJob
+from forest_pipelines.storage.json_publish import (
+    JSON_CONTENT_TYPE,
+    debug_copy_path,
+    json_dumps_bytes,
+    json_upload_jobs,
+)
+
+VERSIONS_DIRNAME = "versions"
+#objetos versionados nunca mudam de conteúdo: cache de 1 ano é seguro
+IMMUTABLE_CACHE_CONTROL = "31536000"
+DEFAULT_KEEP_VERSIONS = 3
+
+
+@dataclass(frozen=True)
+class StagedJson:
+    relative_path: str
+    payload: Any = field(repr=False)
+    content_type: str = JSON_CONTENT_TYPE
+
+
+@dataclass(frozen=True)
+class StagedVersion:
+    prefix: str
+    version: str
+    paths: dict[str, str]
+
+    def public_urls(self, storage: Any) -> dict[str, str]:
+        return {rel: storage.public_url(path) for rel, path in self.paths.items()}
+
+
+def content_version(objects: Iterable[StagedJson]) -> str:
+    """Version id derived from the content, so a retried publish reuses the same prefix."""
+    digest = hashlib.sha256()
+    for obj in sorted(objects, key=lambda o: o.relative_path):
+        digest.update(obj.relative_path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json_dumps_bytes(obj.payload))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def versioned_object_path(prefix: str, version: str, relative_path: str) -> str:
+    return f"{prefix.rstrip('/')}/{VERSIONS_DIRNAME}/{version}/{relative_path.lstrip('/')}"
+
+
+def versioned_upload_jobs(
+    storage: Any,
+    prefix: str,
+    objects: Iterable[StagedJson],
+    version: str | None = None,
+) -> tuple[StagedVersion, list[UploadJob]]:
+    """Jobs that write ``objects`` under an immutable ``<prefix>/versions/<id>/`` prefix.
+
+    The caller uploads them (alongside any legacy fixed-path mirrors) and only then
+    writes the pointer object that references ``StagedVersion.paths``; readers that
+    follow the pointer never see a mix of two publishes. ``version`` defaults to
+    ``content_version(objects)``; pass it when the payloads embed their own version.
+    """
+    object_list = list(objects)
+    version = version or content_version(object_list)
+    paths: dict[str, str] = {}
+    jobs: list[UploadJob] = []
+    for obj in object_list:
+        object_path = versioned_object_path(prefix, version, obj.relative_path)
+        paths[obj.relative_path] = object_path
+        jobs.extend(
+            json_upload_jobs(
+                storage,
+                object_path,
+                obj.payload,
+                content_type=obj.content_type,
+                cache_control=IMMUTABLE_CACHE_CONTROL,
+            )
+        )
+    return StagedVersion(prefix=prefix.rstrip("/"), version=version, paths=paths), jobs
+
+
+def load_pointer(storage: Any, pointer_path: str, logger: Any = None) -> dict[str, Any] | None:
+    try:
+        raw = storage.download_bytes(pointer_path)
+        if raw is None:
+            return None
+        pointer = json.loads(raw)
+    except Exception as exc:  # noqa: BLE001
+        if logger:
+            logger.info("Ponteiro de publicação indisponível: %s erro=%s", pointer_path, exc)
+        return None
+    return pointer if isinstance(pointer, dict) else None
+
+
+def next_version_history(
+    previous_pointer: dict[str, Any] | None,
+    staged: StagedVersion,
+    *,
+    keep_versions: int = DEFAULT_KEEP_VERSIONS,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """History for the new pointer (newest first) and object paths of versions to drop."""
+    previous = (previous_pointer or {}).get("version_history")
+    entries: list[dict[str, Any]] = [
+        {"version": staged.version, "relative_paths": sorted(staged.paths)}
+    ]
+    for entry in previous if isinstance(previous, list) else []:
+        if not isinstance(entry, dict) or not entry.get("version"):
+            continue
+        if entry["version"] == staged.version:
+            continue
+        entries.append(
+            {
+                "version": str(entry["version"]),
+                "relative_paths": [str(p) for p in entry.get("relative_paths") or []],
+            }
+        )
+
+    keep = max(1, int(keep_versions))
+    expired_paths: list[str] = []
+    for entry in entries[keep:]:
+        for rel in entry["relative_paths"]:
+            object_path = versioned_object_path(staged.prefix, entry["version"], rel)
+            #a cópia *.debug.json pode não existir; remover ausente é inofensivo
+            expired_paths.extend([object_path, debug_copy_path(object_path)])
+    return entries[:keep], expired_paths
+
+
+def collect_expired_versions(storage: Any, expired_paths: list[str], logger: Any = None) -> None:
+    """Delete objects of versions no longer referenced. Best-effort: never fails a publish."""
+    if not expired_paths:
+        return
+    delete = getattr(storage, "delete_objects", None)
+    if delete is None:
+        if logger:
+            logger.info("Storage sem delete_objects; %d objeto(s) antigos mantidos", len(expired_paths))
+        return
+    try:
+        delete(expired_paths)
+    except Exception as exc:  # noqa: BLE001
+        if logger:
+            logger.warning("Falha ao remover versões antigas (%d objetos): %s", len(expired_paths), exc)
+
+
+__all__ = [
+    "DEFAULT_KEEP_VERSIONS",
+    "IMMUTABLE_CACHE_CONTROL",
+    "StagedJson",
+    "StagedVersion",
+    "VERSIONS_DIRNAME",
+    "collect_expired_versions",
+    "content_version",
+    "load_pointer",
+    "next_version_history",
+    "versioned_object_path",
+    "versioned_upload_jobs",
+]
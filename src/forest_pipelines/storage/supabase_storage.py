@@ -2,13 +2,39 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from functools import cached_property
-from typing import Any
+from pathlib import Path
+from typing import Any, ContextManager, Iterable
 
 from supabase import create_client
 
+from forest_pipelines.storage.batch import (
+    DEFAULT_UPLOAD_MAX_WORKERS,
+    UploadJob,
+    UploadManyResult,
+    upload_many,
+)
+from forest_pipelines.storage.download_cache import DEFAULT_DOWNLOAD_CACHE_MAX_BYTES, DownloadCache
+from forest_pipelines.storage.json_publish import (
+    maybe_decompress,
+    needs_content_encoding,
+    normalize_json_compression,
+)
+from forest_pipelines.storage.resumable import (
+    DEFAULT_RESUMABLE_THRESHOLD_BYTES,
+    SUPABASE_TUS_CHUNK_SIZE,
+    ResumableUploader,
+)
+from forest_pipelines.storage.upload_index import UploadIndex, sha256_bytes
+from forest_pipelines.utils.hashing import sha256_file
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
 
 @dataclass
 class SupabaseStorage:
@@ -16,9 +42,27 @@ class SupabaseStorage:
     service_role_key: str = field(repr=False)
     bucket: str = "open-data"
     logger: Any = None
+    upload_max_workers: int = DEFAULT_UPLOAD_MAX_WORKERS
+    upload_index: UploadIndex | None = None
+    verify_remote_hash: bool = False
+    json_compression: str | None = None
+    json_debug_copy: bool = False
+    download_cache: DownloadCache | None = None
+    resumable_threshold_bytes: int | None = DEFAULT_RESUMABLE_THRESHOLD_BYTES
+    resumable_chunk_size: int = SUPABASE_TUS_CHUNK_SIZE
+    resumable_state_path: Path | None = None
+    upload_stats: dict[str, int] = field(default_factory=lambda: {"written": 0, "skipped": 0})
+    _stats_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     @classmethod
-    def from_env(cls, logger: Any, bucket_open_data: str) -> "SupabaseStorage":
+    def from_env(
+        cls,
+        logger: Any,
+        bucket_open_data: str,
+        upload_index_path: Path | None = None,
+        download_cache_dir: Path | None = None,
+        resumable_state_path: Path | None = None,
+    ) -> "SupabaseStorage":
         supabase_url = os.getenv("SUPABASE_URL", "").strip()
         service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "").strip()
 
@@ -31,33 +75,165 @@ class SupabaseStorage:
 
         supabase_url = supabase_url.rstrip("/") + "/"
 
+        #FP_UPLOAD_INDEX=0 desliga o skip por hash; FP_UPLOAD_INDEX_VERIFY_REMOTE=1 confere metadata remota
+        index_enabled = os.getenv("FP_UPLOAD_INDEX", "").strip().lower() not in _FALSE_VALUES
+        upload_index = UploadIndex(upload_index_path) if upload_index_path and index_enabled else None
+        verify_remote = os.getenv("FP_UPLOAD_INDEX_VERIFY_REMOTE", "").strip().lower() in _TRUE_VALUES
+        #FP_JSON_COMPRESSION=gzip|br publica JSON pré-comprimido; FP_JSON_DEBUG_COPY=1 mantém *.debug.json legível
+        json_compression = normalize_json_compression(os.getenv("FP_JSON_COMPRESSION"))
+        json_debug_copy = os.getenv("FP_JSON_DEBUG_COPY", "").strip().lower() in _TRUE_VALUES
+        download_cache = _download_cache_from_env(download_cache_dir)
+        #arquivos >= FP_RESUMABLE_UPLOAD_THRESHOLD_MB vão por TUS em chunks (0 desliga)
+        threshold_mb = os.getenv("FP_RESUMABLE_UPLOAD_THRESHOLD_MB", "").strip()
+        resumable_threshold = (
+            int(float(threshold_mb) * 1024 * 1024) if threshold_mb else DEFAULT_RESUMABLE_THRESHOLD_BYTES
+        )
+        chunk_mb = os.getenv("FP_RESUMABLE_CHUNK_MB", "").strip()
+
         return cls(
             supabase_url=supabase_url,
             service_role_key=service_role_key,
             bucket=bucket,
             logger=logger,
+            upload_index=upload_index,
+            verify_remote_hash=verify_remote,
+            json_compression=json_compression,
+            json_debug_copy=json_debug_copy,
+            download_cache=download_cache,
+            resumable_threshold_bytes=resumable_threshold or None,
+            resumable_chunk_size=int(float(chunk_mb) * 1024 * 1024) if chunk_mb else SUPABASE_TUS_CHUNK_SIZE,
+            resumable_state_path=resumable_state_path,
         )
 
     @cached_property
     def client(self):
         return create_client(self.supabase_url, self.service_role_key)
 
-    def upload_file(self, object_path: str, local_path: str, content_type: str, upsert: bool = True) -> None:
+    @cached_property
+    def resumable_uploader(self) -> ResumableUploader:
+        return ResumableUploader(
+            endpoint=f"{self.supabase_url.rstrip('/')}/storage/v1/upload/resumable",
+            auth_headers={
+                "authorization": f"Bearer {self.service_role_key}",
+                "apikey": self.service_role_key,
+            },
+            chunk_size=self.resumable_chunk_size,
+            state_path=self.resumable_state_path,
+            logger=self.logger,
+        )
+
+    def _use_resumable(self, local_path: str, content_encoding: str | None) -> bool:
+        #TUS não repassa Content-Encoding; esses objetos seguem pelo upload simples
+        if self.resumable_threshold_bytes is None or content_encoding:
+            return False
+        try:
+            return os.path.getsize(local_path) >= self.resumable_threshold_bytes
+        except OSError:
+            return False
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.upload_stats[key] = self.upload_stats.get(key, 0) + 1
+
+    def _remote_hash_matches(self, object_path: str, digest: str) -> bool:
+        try:
+            info = self.client.storage.from_(self.bucket).info(object_path)
+        except Exception as e:  # noqa: BLE001
+            if self.logger:
+                self.logger.info("Metadata remota indisponível: %s (erro=%s)", object_path, e)
+            return False
+        if not isinstance(info, dict):
+            return False
+        for key in ("metadata", "user_metadata"):
+            meta = info.get(key)
+            if isinstance(meta, dict) and meta.get("sha256") == digest:
+                return True
+        return False
+
+    def _should_skip_upload(self, object_path: str, digest: str | None, upsert: bool) -> bool:
+        if digest is None or self.upload_index is None or not upsert:
+            return False
+        if self.upload_index.get(object_path) != digest:
+            return False
+        if self.verify_remote_hash and not self._remote_hash_matches(object_path, digest):
+            return False
+        self._count("skipped")
+        if self.logger:
+            self.logger.info("Upload ignorado (conteúdo inalterado): %s", object_path)
+        return True
+
+    def _upload_index_batch(self) -> ContextManager[Any]:
+        return self.upload_index.batch() if self.upload_index is not None else nullcontext()
+
+    def _record_upload(self, object_path: str, digest: str | None) -> None:
+        self._count("written")
+        if digest is not None and self.upload_index is not None:
+            self.upload_index.record(object_path, digest)
+
+    def _remote_content_encoding(self, object_path: str) -> str | None:
+        try:
+            info = self.client.storage.from_(self.bucket).info(object_path)
+        except Exception as e:  # noqa: BLE001
+            if self.logger:
+                self.logger.info("Metadata remota indisponível: %s (erro=%s)", object_path, e)
+            return None
+        if not isinstance(info, dict):
+            return None
+        #gravamos o encoding na metadata do objeto; alguns retornos também trazem o header
+        for key in ("metadata", "user_metadata"):
+            meta = info.get(key)
+            if isinstance(meta, dict) and meta.get("content_encoding"):
+                return str(meta["content_encoding"])
+        value = info.get("content_encoding") or info.get("contentEncoding")
+        return str(value) if value else None
+
+    def _cache_uploaded_bytes(self, object_path: str, data: bytes, content_encoding: str | None) -> None:
+        #write-through: o próximo download do mesmo objeto neste processo não vai à rede
+        if self.download_cache is not None:
+            self.download_cache.put(object_path, maybe_decompress(bytes(data), content_encoding))
+
+    def upload_file(
+        self,
+        object_path: str,
+        local_path: str,
+        content_type: str,
+        upsert: bool = True,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
         upsert_str = "true" if upsert else "false"
         last_error: Exception | None = None
+        digest = sha256_file(Path(local_path)) if self.upload_index is not None else None
+        if self._should_skip_upload(object_path, digest, upsert):
+            return
+        file_options = _file_options(content_type, upsert_str, digest, content_encoding, cache_control)
+        if self.download_cache is not None:
+            self.download_cache.invalidate(object_path)
+        resumable = self._use_resumable(local_path, content_encoding)
 
         for attempt in range(1, 4):
             try:
-                with open(local_path, "rb") as f:
-                    resp = (
-                        self.client.storage
-                        .from_(self.bucket)
-                        .upload(
-                            file=f,
-                            path=object_path,
-                            file_options={"content-type": content_type, "upsert": upsert_str},
-                        )
+                if resumable:
+                    resp = self.resumable_uploader.upload(
+                        local_path,
+                        bucket=self.bucket,
+                        object_path=object_path,
+                        content_type=content_type,
+                        upsert=upsert,
+                        user_metadata=file_options.get("metadata"),
+                        cache_control=cache_control,
                     )
+                else:
+                    with open(local_path, "rb") as f:
+                        resp = (
+                            self.client.storage
+                            .from_(self.bucket)
+                            .upload(
+                                file=f,
+                                path=object_path,
+                                file_options=file_options,
+                            )
+                        )
 
                 if self.logger:
                     self.logger.info(
@@ -67,6 +243,7 @@ class SupabaseStorage:
                         attempt,
                         str(resp)[:200],
                     )
+                self._record_upload(object_path, digest)
                 return
             except Exception as e:  # noqa: BLE001
                 last_error = e
@@ -82,9 +259,24 @@ class SupabaseStorage:
 
         raise RuntimeError(f"Falha ao subir arquivo para {object_path}") from last_error
 
-    def upload_bytes(self, object_path: str, data: bytes, content_type: str, upsert: bool = True) -> None:
+    def upload_bytes(
+        self,
+        object_path: str,
+        data: bytes,
+        content_type: str,
+        upsert: bool = True,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
         upsert_str = "true" if upsert else "false"
         last_error: Exception | None = None
+        digest = sha256_bytes(data) if self.upload_index is not None else None
+        if self._should_skip_upload(object_path, digest, upsert):
+            self._cache_uploaded_bytes(object_path, data, content_encoding)
+            return
+        file_options = _file_options(content_type, upsert_str, digest, content_encoding, cache_control)
+        if self.download_cache is not None:
+            self.download_cache.invalidate(object_path)
 
         for attempt in range(1, 4):
             try:
@@ -94,7 +286,7 @@ class SupabaseStorage:
                     .upload(
                         file=data,
                         path=object_path,
-                        file_options={"content-type": content_type, "upsert": upsert_str},
+                        file_options=file_options,
                     )
                 )
 
@@ -105,6 +297,8 @@ class SupabaseStorage:
                         attempt,
                         str(resp)[:200],
                     )
+                self._record_upload(object_path, digest)
+                self._cache_uploaded_bytes(object_path, data, content_encoding)
                 return
             except Exception as e:  # noqa: BLE001
                 last_error = e
@@ -120,7 +314,30 @@ class SupabaseStorage:
 
         raise RuntimeError(f"Falha ao subir bytes para {object_path}") from last_error
 
+    def upload_many(
+        self,
+        jobs: Iterable[UploadJob],
+        max_workers: int | None = None,
+    ) -> UploadManyResult:
+        # materializa o client antes do pool: cached_property não é thread-safe
+        _ = self.client
+        if self.resumable_threshold_bytes is not None:
+            _ = self.resumable_uploader
+        with self._upload_index_batch():
+            return upload_many(
+                self,
+                jobs,
+                max_workers=max_workers or self.upload_max_workers,
+                logger=self.logger,
+            )
+
     def download_bytes(self, object_path: str) -> bytes | None:
+        if self.download_cache is not None:
+            cached = self.download_cache.get(object_path)
+            if cached is not None:
+                if self.logger:
+                    self.logger.info("Download bytes (cache): %s", object_path)
+                return cached
         try:
             data = (
                 self.client.storage
@@ -130,17 +347,72 @@ class SupabaseStorage:
 
             if self.logger:
                 self.logger.info("Download bytes: %s", object_path)
-
-            if isinstance(data, (bytes, bytearray)):
-                return bytes(data)
-
-            return data if isinstance(data, bytes) else None
         except Exception as e:  # noqa: BLE001
             if self.logger:
                 self.logger.info("Download ausente ou indisponível: %s (erro=%s)", object_path, e)
             return None
 
+        if not isinstance(data, (bytes, bytearray)):
+            return None
+        data = bytes(data)
+        #fora do try: falha ao decodificar não pode virar "objeto ausente"
+        content_encoding = None
+        if needs_content_encoding(object_path, data):
+            content_encoding = self._remote_content_encoding(object_path)
+        payload = maybe_decompress(data, content_encoding)
+        if self.download_cache is not None:
+            self.download_cache.put(object_path, payload)
+        return payload
+
+    def delete_objects(self, object_paths: Iterable[str]) -> None:
+        paths = [p for p in dict.fromkeys(object_paths) if p]
+        if not paths:
+            return
+        bucket = self.client.storage.from_(self.bucket)
+        for start in range(0, len(paths), 100):
+            bucket.remove(paths[start:start + 100])
+        with self._upload_index_batch():
+            for path in paths:
+                if self.download_cache is not None:
+                    self.download_cache.invalidate(path)
+                if self.upload_index is not None:
+                    self.upload_index.forget(path)
+        if self.logger:
+            self.logger.info("Objetos removidos: %d", len(paths))
+
     def public_url(self, object_path: str) -> str:
         base = self.supabase_url.rstrip("/")
         path = object_path.lstrip("/")
-        return f"{base}/storage/v1/object/public/{self.bucket}/{path}"
\ No newline at end of file
+        return f"{base}/storage/v1/object/public/{self.bucket}/{path}"
+
+
+def _download_cache_from_env(cache_dir: Path | None) -> DownloadCache | None:
+    #FP_DOWNLOAD_CACHE=0 desliga; o tier em disco só vale com FP_DOWNLOAD_CACHE_TTL_SECONDS > 0
+    if os.getenv("FP_DOWNLOAD_CACHE", "").strip().lower() in _FALSE_VALUES:
+        return None
+    max_mb = os.getenv("FP_DOWNLOAD_CACHE_MAX_MB", "").strip()
+    ttl = os.getenv("FP_DOWNLOAD_CACHE_TTL_SECONDS", "").strip()
+    return DownloadCache(
+        max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_DOWNLOAD_CACHE_MAX_BYTES,
+        disk_dir=cache_dir,
+        disk_ttl_seconds=float(ttl) if ttl else 0.0,
+    )
+
+
+def _file_options(
+    content_type: str,
+    upsert_str: str,
+    digest: str | None,
+    content_encoding: str | None = None,
+    cache_control: str | None = None,
+) -> dict[str, Any]:
+    options: dict[str, Any] = {"content-type": content_type, "upsert": upsert_str}
+    if cache_control:
+        options["cache-control"] = cache_control
+    if digest is not None:
+        options["metadata"] = {"sha256": digest}
+    if content_encoding:
+        options["headers"] = {"content-encoding": content_encoding}
+        #a metadata guarda o encoding para o download_bytes (br não tem bytes mágicos)
+        options["metadata"] = {**options.get("metadata", {}), "content_encoding": content_encoding}
+    return options
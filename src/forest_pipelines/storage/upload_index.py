@@ -0,0 +1,120 @@
+# src/forest_pipelines/storage/upload_index.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from forest_pipelines.utils.json_codec import read_json, write_json
+
+UPLOAD_INDEX_SCHEMA_VERSION = 1
+#dentro de batch(), o índice é regravado a cada N mudanças e no fim do lote
+DEFAULT_UPLOAD_INDEX_FLUSH_EVERY = 500
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_upload_index_path(data_dir: Path, bucket: str) -> Path:
+    return Path(data_dir) / "_state" / f"upload_index_{bucket}.json"
+
+
+@dataclass
+class UploadIndex:
+    """Local map object_path -> sha256 of the bytes we last uploaded.
+
+    Lets storage backends skip re-uploading identical content. The file is
+    rewritten atomically after every change, or inside ``batch()`` every
+    ``flush_every`` changes and when the batch ends. A crashed run only loses
+    entries not yet flushed, which costs redundant uploads later.
+    """
+
+    path: Path
+    flush_every: int = DEFAULT_UPLOAD_INDEX_FLUSH_EVERY
+    _entries: dict[str, str] | None = field(default=None, init=False, repr=False)
+    _pending: int = field(default=0, init=False, repr=False)
+    _batch_depth: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _load(self) -> dict[str, str]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, str] = {}
+        try:
+            raw = read_json(Path(self.path))
+            if (
+                isinstance(raw, dict)
+                and raw.get("schema_version") == UPLOAD_INDEX_SCHEMA_VERSION
+                and isinstance(raw.get("objects"), dict)
+            ):
+                entries = {
+                    str(k): str(v)
+                    for k, v in raw["objects"].items()
+                    if isinstance(v, str)
+                }
+        except (OSError, ValueError):
+            entries = {}
+        self._entries = entries
+        return entries
+
+    def get(self, object_path: str) -> str | None:
+        with self._lock:
+            return self._load().get(object_path)
+
+    def record(self, object_path: str, sha256: str) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.get(object_path) == sha256:
+                return
+            entries[object_path] = sha256
+            self._changed_locked(entries)
+
+    def forget(self, object_path: str) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.pop(object_path, None) is not None:
+                self._changed_locked(entries)
+
+    @contextmanager
+    def batch(self) -> Iterator["UploadIndex"]:
+        """Defer index writes until the (outermost) batch ends."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._pending:
+                    self._save_locked(self._load())
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._save_locked(self._load())
+
+    def _changed_locked(self, entries: dict[str, str]) -> None:
+        self._pending += 1
+        if self._batch_depth == 0 or self._pending >= max(1, self.flush_every):
+            self._save_locked(entries)
+
+    def _save_locked(self, entries: dict[str, str]) -> None:
+        payload: dict[str, Any] = {
+            "schema_version": UPLOAD_INDEX_SCHEMA_VERSION,
+            "objects": dict(sorted(entries.items())),
+        }
+        write_json(Path(self.path), payload)
+        self._pending = 0
+
+
+__all__ = [
+    "DEFAULT_UPLOAD_INDEX_FLUSH_EVERY",
+    "UPLOAD_INDEX_SCHEMA_VERSION",
+    "UploadIndex",
+    "default_upload_index_path",
+    "sha256_bytes",
+]
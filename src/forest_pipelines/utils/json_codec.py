@@ -0,0 +1,127 @@
+# src/forest_pipelines/utils/json_codec.py
+"""Shared JSON encoding for manifests, reports, caches and state files.
+
+Uses ``orjson`` when it is installed (extra ``fast``) and falls back to the
+stdlib encoder otherwise, or when orjson rejects a value (e.g. ints beyond
+64 bits). Output is always UTF-8 without ASCII escaping, compact unless
+``pretty=True``.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+try:  # pragma: no cover - depende do ambiente
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+#pedaços do iterencode acumulados antes de cada write no modo streaming
+_STREAM_BUFFER_CHARS = 1 << 16
+
+
+def fast_encoder_available() -> bool:
+    return _orjson is not None
+
+
+def _stdlib_encoder(*, pretty: bool, sort_keys: bool, default: Callable[[Any], Any] | None) -> json.JSONEncoder:
+    return json.JSONEncoder(
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        default=default,
+    )
+
+
+def dumps_bytes(
+    obj: Any,
+    *,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= _orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        try:
+            return _orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            #orjson.JSONEncodeError herda de TypeError; o stdlib cobre int > 64 bits etc.
+            pass
+    return _stdlib_encoder(pretty=pretty, sort_keys=sort_keys, default=default).encode(obj).encode("utf-8")
+
+
+def dumps(obj: Any, *, pretty: bool = False, sort_keys: bool = False, default: Callable[[Any], Any] | None = None) -> str:
+    return dumps_bytes(obj, pretty=pretty, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def canonical_bytes(obj: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Compact, key-sorted encoding for hashing and equality checks."""
+    return dumps_bytes(obj, sort_keys=True, default=default)
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def write_json(
+    path: Path,
+    obj: Any,
+    *,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> None:
+    """Atomically write ``obj`` to ``path`` (tmp file + ``os.replace``).
+
+    Without orjson the document is streamed through ``JSONEncoder.iterencode``,
+    so large payloads are never held in memory as a single string.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        if _orjson is not None:
+            tmp.write_bytes(dumps_bytes(obj, pretty=pretty, sort_keys=sort_keys, default=default))
+        else:
+            encoder = _stdlib_encoder(pretty=pretty, sort_keys=sort_keys, default=default)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                buffer: list[str] = []
+                size = 0
+                for chunk in encoder.iterencode(obj):
+                    buffer.append(chunk)
+                    size += len(chunk)
+                    if size >= _STREAM_BUFFER_CHARS:
+                        fh.write("".join(buffer))
+                        buffer.clear()
+                        size = 0
+                fh.write("".join(buffer))
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def read_json(path: Path) -> Any:
+    return loads(Path(path).read_bytes())
+
+
+__all__ = [
+    "canonical_bytes",
+    "dumps",
+    "dumps_bytes",
+    "fast_encoder_available",
+    "loads",
+    "read_json",
+    "write_json",
+]
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from forest_pipelines.datasets.inpe import bdqueimadas_mensal_listing as listing
+from forest_pipelines.datasets.inpe.coids_directory import CoidsEntry
 
 
 def test_ensure_mensal_files_refreshes_only_forced_month(
@@ -55,3 +56,29 @@ def test_ensure_mensal_files_refreshes_only_forced_month(
     assert jan.read_text(encoding="utf-8") == "jan-cache\n"
     assert may.read_text(encoding="utf-8") == "downloaded https://example.test/may.csv\n"
     assert not (cache_dir / "focos_mensal_br_202606.csv").exists()
+
+
+def test_list_mensal_sources_keeps_listing_size_and_date(monkeypatch) -> None:
+    entries = [
+        CoidsEntry("focos_mensal_br_202512.csv", "https://example.test/focos_mensal_br_202512.csv", False),
+        CoidsEntry(
+            "focos_mensal_br_202602.csv",
+            "https://example.test/focos_mensal_br_202602.csv",
+            False,
+            size_label="12M",
+            last_modified_label="2026-03-02 04:10",
+        ),
+        CoidsEntry("focos_mensal_br_202601.csv", "https://example.test/focos_mensal_br_202601.csv", False),
+        CoidsEntry("antigos/", "https://example.test/antigos/", True),
+    ]
+    monkeypatch.setattr(listing, "fetch_directory_entries", lambda _url, timeout_s: entries)
+
+    sources = listing.list_mensal_sources("https://example.test/", 2026)
+
+    assert [source.month for source in sources] == [1, 2]
+    assert sources[0].source_key() is None
+    assert sources[1].source_key() == {
+        "url": "https://example.test/focos_mensal_br_202602.csv",
+        "size": "12M",
+        "last_modified": "2026-03-02 04:10",
+    }
@@ -3,20 +3,40 @@ from __future__ import annotations
 import json
 
 import pandas as pd
+import pytest
 
 from forest_pipelines.reports.builders.bdqueimadas_incremental import (
+    AGGREGATION_KEY_COLUMNS,
     CACHE_SCHEMA_VERSION,
+    FocosCounts,
+    aggregate_focos_file,
+    build_incremental_month_caches,
     build_incremental_year_caches,
+    consolidate_year_payloads,
+    count_focos_rows_brasil_file,
+    read_focos_subset_brasil_file,
+    year_payload_from_counts,
+    year_payload_from_parquet,
+    year_payload_to_parquet,
+    _arrow_reference_satellite_filter,
     _build_signature,
+    _df_to_records,
+    _filter_df_by_reference_satellite,
+    _normalize_satellite_token,
 )
 from forest_pipelines.reports.builders.bdqueimadas_overview import (
     _build_annual_totals_from_monthly_series,
     _build_effective_national_monthly_series,
     _build_monthly_year_comparison_records,
+    _build_state_biome_monthly_series_records,
+    _build_top_states_month_merged,
     _compute_rolling_12m_metrics,
+    _load_mensal_counts_for_current_year,
     _resolve_historical_average_years,
     _truncate_mensal_counts,
 )
+from forest_pipelines.storage.batch import upload_many
+from forest_pipelines.storage.local_mirror import LocalObjectMirror
 
 
 class FakeStorage:
@@ -35,6 +55,10 @@ class FakeStorage:
     ) -> None:
         self.objects[object_path] = data
 
+    def delete_objects(self, object_paths: list[str]) -> None:
+        for object_path in object_paths:
+            self.objects.pop(object_path, None)
+
 
 class NullLogger:
     def info(self, *_args: object, **_kwargs: object) -> None:
@@ -222,3 +246,499 @@ def test_incremental_current_scope_can_reuse_historical_cache() -> None:
 
     assert [item["inferred_year"] for item in result["year_payloads"]] == [2025]
     assert result["cache_stats"]["reused_count"] == 1
+
+    migrated = storage.objects["reports/test/_cache/yearly/2025.parquet"]
+    assert year_payload_from_parquet(migrated)["fingerprint"] == fingerprint
+    new_manifest = json.loads(storage.objects["reports/test/_cache/incremental_manifest.json"])
+    entry = new_manifest["files"]["focos_br_ref_2025.zip"]
+    assert entry["cache_object_path"] == "reports/test/_cache/yearly/2025.parquet"
+    assert entry["format"] == "parquet"
+    assert "reports/test/_cache/yearly/2025.json" not in storage.objects
+
+
+def test_year_payload_parquet_round_trip_matches_json_consolidation() -> None:
+    payload = {
+        "inferred_year": 2024,
+        "row_count": 3,
+        "fingerprint": {"zip_name": "focos_br_ref_2024.zip"},
+        "available_biomes": ["AMAZÔNIA"],
+        "monthly_all": [{"period": "2024-01", "year": 2024, "value": 2}, {"period": "2024-02", "year": 2024, "value": 1}],
+        "monthly_by_biome": [{"period": "2024-01", "year": 2024, "biome": "AMAZÔNIA", "value": 2}],
+        "annual_all": [{"year": 2024, "value": 3}],
+        "annual_by_biome": [{"year": 2024, "biome": "AMAZÔNIA", "value": 2}],
+        "state_year_all": [{"year": 2024, "state": "PARÁ", "value": 3}],
+        "state_year_by_biome": [{"year": 2024, "state": "PARÁ", "biome": "AMAZÔNIA", "value": 2}],
+        "state_month_all": [
+            {"period": "2024-01", "year": 2024, "state": "PARÁ", "value": 2},
+            {"period": "2024-02", "year": 2024, "state": "PARÁ", "value": 1},
+        ],
+        "state_month_by_biome": [
+            {"period": "2024-01", "year": 2024, "state": "PARÁ", "biome": "AMAZÔNIA", "value": 2}
+        ],
+    }
+
+    decoded = year_payload_from_parquet(year_payload_to_parquet(payload))
+
+    assert decoded["fingerprint"] == payload["fingerprint"]
+    assert list(decoded["state_year_by_biome"].columns) == ["year", "state", "biome", "value"]
+    from_json = consolidate_year_payloads([payload])
+    from_parquet = consolidate_year_payloads([decoded])
+    for key, frame in from_json.items():
+        if key.endswith("_df"):
+            pd.testing.assert_frame_equal(frame, from_parquet[key])
+    assert from_json["state_month_all_df"]["value"].tolist() == [2, 1]
+
+
+def test_count_cube_views_match_groupby_and_legacy_payload() -> None:
+    subset = pd.DataFrame(
+        {
+            "period_month": ["2024-01", "2024-01", "2024-02", "2024-02", "2024-03", "2024-03"],
+            "year": [2024] * 6,
+            "state": ["PARÁ", "PARÁ", None, "MATO GROSSO", "PARÁ", None],
+            "biome": ["AMAZÔNIA", None, "CERRADO", "CERRADO", "AMAZÔNIA", None],
+        }
+    )
+    counts = FocosCounts()
+    counts.add(subset.iloc[:3])
+    counts.add(subset.iloc[3:])
+
+    assert counts.row_count == 6
+    assert (counts.period_min, counts.period_max) == ("2024-01", "2024-03")
+    assert counts.biomes == {"AMAZÔNIA", "CERRADO"}
+    expected = subset.rename(columns={"period_month": "period"})
+    for key_cols in AGGREGATION_KEY_COLUMNS.values():
+        by_groupby = expected.dropna(subset=[c for c in ("state", "biome") if c in key_cols])
+        by_groupby = by_groupby.groupby(key_cols).size().reset_index(name="value")
+        view = counts.table(key_cols)
+        assert view.astype(str).values.tolist() == by_groupby.astype(str).values.tolist()
+
+    legacy = {name: _df_to_records(counts.table(cols)) for name, cols in AGGREGATION_KEY_COLUMNS.items()}
+    rebuilt = FocosCounts.from_year_payload(legacy)
+    pd.testing.assert_frame_equal(
+        rebuilt.cells().sort_values(["period_month", "state", "biome"]).reset_index(drop=True),
+        counts.cells().sort_values(["period_month", "state", "biome"]).reset_index(drop=True),
+    )
+    assert FocosCounts.merge([counts, rebuilt]).row_count == 12
+
+
+def _write_focos_zip(path, rows: list[tuple[str, str, str]]) -> None:
+    import zipfile
+
+    lines = ["data_pas,estado,bioma", *(",".join(row) for row in rows)]
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(path.stem + ".csv", "\n".join(lines) + "\n")
+
+
+def test_incremental_rebuild_in_processes_matches_serial(tmp_path) -> None:
+    zips = []
+    for year in (2023, 2024, 2025):
+        zip_path = tmp_path / f"focos_br_ref_{year}.zip"
+        _write_focos_zip(
+            zip_path,
+            [
+                (f"{year}-01-05 10:00:00", "PARÁ", "Amazônia"),
+                (f"{year}-02-07 11:00:00", "MATO GROSSO", "Cerrado"),
+                (f"{year}-02-08 12:00:00", "PARÁ", "Amazônia"),
+            ],
+        )
+        zips.append(zip_path)
+
+    results = {}
+    for workers in (1, 2):
+        storage = FakeStorage({})
+        result = build_incremental_year_caches(
+            storage=storage,
+            cache_prefix="reports/test/_cache",
+            zip_files=zips,
+            datetime_candidates=["data_pas"],
+            state_candidates=["estado"],
+            biome_candidates=["bioma"],
+            logger=NullLogger(),
+            max_workers=workers,
+        )
+        assert result["cache_stats"]["rebuilt_count"] == 3
+        assert sorted(k for k in storage.objects if k.endswith(".parquet")) == [
+            f"reports/test/_cache/yearly/{year}.parquet" for year in (2023, 2024, 2025)
+        ]
+        manifest = json.loads(storage.objects["reports/test/_cache/incremental_manifest.json"])
+        assert list(manifest["files"]) == [p.name for p in zips]
+        results[workers] = consolidate_year_payloads(result["year_payloads"])
+
+    for key, frame in results[1].items():
+        if key.endswith("_df"):
+            pd.testing.assert_frame_equal(frame, results[2][key])
+    assert results[2]["annual_all_df"]["value"].tolist() == [3, 3, 3]
+
+
+def test_local_mirror_serves_unchanged_years_and_refreshes_stale_copies(tmp_path) -> None:
+    class CountingStorage(FakeStorage):
+        def __init__(self, objects: dict[str, bytes]) -> None:
+            super().__init__(objects)
+            self.downloads: list[str] = []
+
+        def download_bytes(self, object_path: str) -> bytes | None:
+            self.downloads.append(object_path)
+            return super().download_bytes(object_path)
+
+    zips = []
+    for year in (2024, 2025):
+        zip_path = tmp_path / f"focos_br_ref_{year}.zip"
+        _write_focos_zip(zip_path, [(f"{year}-03-01 10:00:00", "PARÁ", "Amazônia")])
+        zips.append(zip_path)
+
+    storage = CountingStorage({})
+    mirror = LocalObjectMirror(root=tmp_path / "mirror")
+
+    def run() -> dict:
+        storage.downloads.clear()
+        return build_incremental_year_caches(
+            storage=storage,
+            cache_prefix="reports/test/_cache",
+            zip_files=zips,
+            datetime_candidates=["data_pas"],
+            state_candidates=["estado"],
+            biome_candidates=["bioma"],
+            logger=NullLogger(),
+            max_workers=1,
+            cache_mirror=mirror,
+        )
+
+    assert run()["cache_stats"]["rebuilt_count"] == 2
+    assert mirror.stats["writes"] == 2
+
+    second = run()
+    assert second["cache_stats"]["reused_count"] == 2
+    assert storage.downloads == ["reports/test/_cache/incremental_manifest.json"]
+    assert mirror.stats["hits"] == 2
+
+    #cópia local de outra versão (processed_at diferente do manifest): baixa de novo e regrava o espelho
+    stale_path = "reports/test/_cache/yearly/2024.parquet"
+    stale = year_payload_from_parquet(mirror.read(stale_path))
+    stale["processed_at"] = "2000-01-01T00:00:00Z"
+    mirror.write(stale_path, year_payload_to_parquet(stale))
+
+    third = run()
+    assert third["cache_stats"]["reused_count"] == 2
+    assert storage.downloads == ["reports/test/_cache/incremental_manifest.json", stale_path]
+    assert mirror.read(stale_path) == storage.objects[stale_path]
+    for key, frame in consolidate_year_payloads(second["year_payloads"]).items():
+        if key.endswith("_df"):
+            pd.testing.assert_frame_equal(frame, consolidate_year_payloads(third["year_payloads"])[key])
+
+    with pytest.raises(ValueError):
+        mirror.path_for("reports/../../etc/passwd")
+
+
+def test_chunked_aggregation_matches_whole_file_counts(tmp_path) -> None:
+    csv_path = tmp_path / "focos_mensal_br_202403.csv"
+    rows = ["data_pas;estado;bioma;satelite"]
+    for i in range(50):
+        state = ["PARÁ", " mato grosso ", ""][i % 3]
+        biome = ["Amazônia", "CERRADO", ""][i % 4 % 3]
+        satellite = "AQUA_M-T" if i % 5 else "NOAA-20"
+        rows.append(f"2024-0{1 + i % 3}-1{i % 9} 10:00:00;{state};{biome};{satellite}")
+    rows.append("data inválida;PARÁ;Amazônia;AQUA_M-T")
+    #latin-1 força o fallback de encoding no meio do streaming
+    csv_path.write_text("\n".join(rows) + "\n", encoding="latin-1")
+    kwargs = {"satellite_candidates": ["satelite"], "reference_satellite": "AQUA_M-T"}
+    args = (csv_path, ["data_pas"], ["estado"], ["bioma"])
+
+    subset = read_focos_subset_brasil_file(*args, **kwargs)
+    small, columns = aggregate_focos_file(*args, chunk_rows=7, **kwargs)
+    whole, _ = aggregate_focos_file(*args, chunk_rows=10_000, **kwargs)
+
+    assert small.row_count == whole.row_count == len(subset) == 40
+    assert count_focos_rows_brasil_file(*args, biome_inpe_key="amazônia", **kwargs) == int(
+        (subset["biome"] == "AMAZÔNIA").sum()
+    )
+    payloads = [
+        year_payload_from_counts(
+            counts,
+            detected_columns=columns,
+            file_name=csv_path.name,
+            file_size_bytes=1,
+            inferred_year=2024,
+        )
+        for counts in (small, whole)
+    ]
+    for payload in payloads:
+        payload.pop("processed_at")
+    assert payloads[0] == payloads[1]
+    assert payloads[0]["month_span_min"] == "2024-01"
+    assert payloads[0]["available_biomes"] == ["AMAZÔNIA", "CERRADO"]
+    state_year = {row["state"]: row["value"] for row in payloads[0]["state_year_all"]}
+    assert state_year == {
+        "PARÁ": int((subset["state"] == "PARÁ").sum()),
+        "MATO GROSSO": int((subset["state"] == "MATO GROSSO").sum()),
+    }
+
+
+def test_arrow_engine_matches_pandas_with_late_non_utf8_bytes(tmp_path, monkeypatch) -> None:
+    import zipfile
+
+    from forest_pipelines.reports.builders import bdqueimadas_incremental as incremental
+
+    rows = ["data_pas;estado;bioma;satelite"]
+    rows += [f"2024-05-0{1 + i % 9} 10:00:00;PARA;Amazonia;AQUA_M-T" for i in range(30)]
+    rows += ["2024-06-01 10:00:00;MARANHÃO;Cerrado;AQUA_M-T", "2024-06-02 10:00:00;PARÁ;;NOAA-20"]
+    zip_path = tmp_path / "focos_br_ref_2024.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("focos.csv", ("\n".join(rows) + "\n").encode("latin-1"))
+    #amostra curta: o byte latin-1 só aparece depois dela e força a releitura
+    monkeypatch.setattr(incremental, "_ENCODING_SAMPLE_BYTES", 64)
+    kwargs = {"satellite_candidates": ["satelite"], "reference_satellite": "AQUA_M-T"}
+    args = (zip_path, ["data_pas"], ["estado"], ["bioma"])
+
+    by_engine = {
+        engine: aggregate_focos_file(*args, engine=engine, chunk_rows=8, **kwargs)[0]
+        for engine in ("arrow", "pandas")
+    }
+
+    assert by_engine["arrow"].row_count == by_engine["pandas"].row_count == 31
+    for key_cols in (["period", "year", "state", "biome"], ["state"], ["biome"]):
+        pd.testing.assert_frame_equal(by_engine["arrow"].table(key_cols), by_engine["pandas"].table(key_cols))
+    assert by_engine["arrow"].table(["state"])["state"].tolist() == ["MARANHÃO", "PARA"]
+
+
+def test_both_engines_skip_rows_with_wrong_field_count(tmp_path, caplog) -> None:
+    rows = ["data_pas;estado;bioma;satelite"]
+    rows += [f"2024-05-0{1 + i % 9} 10:00:00;PARÁ;Amazônia;AQUA_M-T" for i in range(12)]
+    #curta (pandas preencheria com nulos), longa e com delimitador entre aspas (válida)
+    rows += [
+        "2024-06-01 10:00:00;MARANHÃO",
+        "2024-06-02 10:00:00;PARÁ;Amazônia;AQUA_M-T;extra",
+        '2024-06-03 10:00:00;"MATO GROSSO;X";Cerrado;AQUA_M-T',
+        "",
+    ]
+    csv_path = tmp_path / "focos_mensal_br_202406.csv"
+    csv_path.write_bytes("\r\n".join(rows).encode("utf-8"))
+    args = (csv_path, ["data_pas"], ["estado"], ["bioma"])
+
+    with caplog.at_level("WARNING"):
+        by_engine = {
+            engine: aggregate_focos_file(*args, engine=engine, chunk_rows=4)[0] for engine in ("arrow", "pandas")
+        }
+
+    assert by_engine["arrow"].row_count == by_engine["pandas"].row_count == 13
+    pd.testing.assert_frame_equal(by_engine["arrow"].table(["state"]), by_engine["pandas"].table(["state"]))
+    assert by_engine["pandas"].table(["state"])["state"].tolist() == ["MATO GROSSO;X", "PARÁ"]
+    assert [r.getMessage() for r in caplog.records if "número de campos inválido" in r.getMessage()] == [
+        f"Linhas com número de campos inválido ignoradas em {csv_path}: 2 (engine={engine})"
+        for engine in ("arrow", "pandas")
+    ]
+
+
+def test_fold_errors_are_not_retried_under_other_encodings(tmp_path) -> None:
+    from forest_pipelines.reports.builders.bdqueimadas_incremental import _focos_csv_layout, _fold_focos_chunks
+
+    csv_path = tmp_path / "focos.csv"
+    csv_path.write_text("data_pas,estado,bioma\n2024-05-01 10:00:00,PARÁ,Amazônia\n", encoding="utf-8")
+    layout = _focos_csv_layout(csv_path, ["data_pas"], ["estado"], ["bioma"])
+    sinks: list[object] = []
+
+    class BrokenSink:
+        def __init__(self) -> None:
+            sinks.append(self)
+
+        def add(self, chunk: pd.DataFrame) -> None:
+            raise KeyError("coluna")
+
+    with pytest.raises(KeyError):
+        _fold_focos_chunks(layout, BrokenSink, reference_satellite=None, chunk_rows=10)
+    assert len(sinks) == 1
+
+
+def test_reference_satellite_filter_matches_rowwise_normalization() -> None:
+    import pyarrow as pa
+
+    labels = ["AQUA_M-T", "aqua m-t", "NOAA-20", None, "AQUA_M-T ", "TERRA_M-T", None, "Aqua-MT"]
+    frame = pd.DataFrame({"satelite": labels, "n": range(len(labels))})
+    expected = [i for i, label in enumerate(labels) if label is not None and _normalize_satellite_token(label) == "aquamt"]
+
+    for dtype in (object, "string", "category"):
+        typed = frame.astype({"satelite": dtype})
+        assert _filter_df_by_reference_satellite(typed, "satelite", "AQUA_M-T")["n"].tolist() == expected
+
+    batch = pa.RecordBatch.from_pandas(frame.astype({"satelite": "category"}), preserve_index=False)
+    assert _arrow_reference_satellite_filter(batch, "satelite", "AQUA_M-T").column("n").to_pylist() == expected
+    plain = pa.RecordBatch.from_pandas(frame, preserve_index=False)
+    assert _arrow_reference_satellite_filter(plain, "satelite", "AQUA_M-T").column("n").to_pylist() == expected
+
+
+def test_focos_datetime_fast_path_falls_back_per_row() -> None:
+    from forest_pipelines.reports.builders.bdqueimadas_incremental import _parse_focos_datetimes
+
+    iso = pd.Series(["2024-01-05 10:00:00", " 2024-02-29 23:59:59 ", "2024-03-01T08:00:00", "2024-02-30 10:00:00", None, ""])
+    parsed = _parse_focos_datetimes(iso, dayfirst=False)
+    assert parsed.dt.strftime("%Y-%m-%d").tolist()[:3] == ["2024-01-05", "2024-02-29", "2024-03-01"]
+    assert parsed.iloc[3:].isna().all()
+
+    #ISO detectado é lido como ISO mesmo quando a coluna pede dayfirst
+    assert _parse_focos_datetimes(pd.Series(["2024-01-05 10:00:00"]), dayfirst=True).dt.day.tolist() == [5]
+
+    br = pd.Series(["05/01/2024 10:00:00", "20/01/2024 11:00:00", "2024-03-01"])
+    assert _parse_focos_datetimes(br, dayfirst=True).dt.strftime("%Y-%m-%d").tolist() == [
+        "2024-01-05",
+        "2024-01-20",
+        "2024-03-01",
+    ]
+
+
+def test_month_caches_reaggregate_only_republished_months(tmp_path) -> None:
+    def write_month(month: int, rows: int) -> None:
+        lines = ["data_pas;estado;bioma;satelite"]
+        lines += [f"2026-{month:02d}-0{1 + i % 9} 10:00:00;PARÁ;Amazônia;AQUA_M-T" for i in range(rows)]
+        (tmp_path / f"focos_mensal_br_2026{month:02d}.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    write_month(1, 4)
+    write_month(2, 6)
+    fetched: list[int] = []
+
+    def fetch(month: int):
+        fetched.append(month)
+        return tmp_path / f"focos_mensal_br_2026{month:02d}.csv"
+
+    storage = FakeStorage({})
+    keys = {1: {"last_modified": "2026-02-01 10:00"}, 2: {"last_modified": "2026-03-01 10:00"}}
+
+    def run(source_keys):
+        return build_incremental_month_caches(
+            storage=storage,
+            cache_prefix="reports/test/_cache",
+            year=2026,
+            month_files={},
+            datetime_candidates=["data_pas"],
+            state_candidates=["estado"],
+            biome_candidates=["bioma"],
+            logger=NullLogger(),
+            source_keys=source_keys,
+            fetch=fetch,
+            satellite_candidates=["satelite"],
+        )
+
+    first = run(keys)
+    assert first["cache_stats"]["rebuilt_count"] == 2
+    assert {m: c.row_count for m, c in first["month_counts"].items()} == {1: 4, 2: 6}
+
+    fetched.clear()
+    second = run(keys)
+    assert fetched == []
+    assert second["cache_stats"]["reused_count"] == 2
+    assert second["month_counts"][2].table(["state"])["value"].tolist() == [6]
+
+    #fevereiro republicado com conteúdo igual: baixa, mas não reagrega; março é novo
+    write_month(3, 2)
+    third = run({**keys, 2: {"last_modified": "2026-03-05 09:00"}, 3: None})
+    assert fetched == [2, 3]
+    assert third["cache_stats"] == {
+        "cache_prefix": "reports/test/_cache",
+        "reused_count": 2,
+        "downloaded_count": 2,
+        "rebuilt_count": 1,
+    }
+
+    write_month(3, 5)
+    mensal = _load_mensal_counts_for_current_year(
+        mensal_dir=tmp_path,
+        current_year=2026,
+        datetime_candidates=["data_pas"],
+        state_candidates=["estado"],
+        biome_candidates=["bioma"],
+        satellite_candidates=["satelite"],
+        storage=storage,
+        cache_prefix="reports/test/_cache",
+        logger=NullLogger(),
+    )
+    assert mensal["national"] == {1: 4, 2: 6, 3: 5}
+    assert mensal["by_state"] == {"PARÁ": {1: 4, 2: 6, 3: 5}}
+    assert mensal["last_closed_month"] == 3
+
+
+def test_top_states_month_merged_has_no_nan_pct_change() -> None:
+    state_month_all_df = pd.DataFrame(
+        [
+            {"period": "2026-03", "year": 2026, "state": "ACRE", "value": 30},
+            {"period": "2026-03", "year": 2026, "state": "PARÁ", "value": 7},
+            {"period": "2025-03", "year": 2025, "state": "ACRE", "value": 20},
+        ]
+    )
+
+    rows = _build_top_states_month_merged(state_month_all_df, "2026-03", "2025-03")
+
+    assert rows == [
+        {"state": "ACRE", "current_month_total": 30, "previous_month_total": 20, "absolute_change": 10, "pct_change": 50.0},
+        {"state": "PARÁ", "current_month_total": 7, "previous_month_total": 0, "absolute_change": 7, "pct_change": None},
+    ]
+    assert json.loads(json.dumps(rows)) == rows
+
+
+def test_state_biome_series_prefers_mensal_for_current_year() -> None:
+    monthly_all_df = pd.DataFrame(
+        [
+            {"period": "2025-12", "year": 2025, "value": 5},
+            {"period": "2026-01", "year": 2026, "value": 1},
+        ]
+    )
+    state_month_by_biome_df = pd.DataFrame(
+        [{"period": "2026-01", "year": 2026, "state": "PARÁ", "biome": "AMAZÔNIA", "value": 1}]
+    )
+    mensal_counts = {
+        "national": {1: 40, 2: 50},
+        "by_biome": {},
+        "by_state": {"PARÁ": {1: 30}},
+        "by_state_biome": {("PARÁ", "AMAZÔNIA"): {1: 20, 2: 25}},
+    }
+
+    rows = _build_state_biome_monthly_series_records(
+        monthly_all_df=monthly_all_df,
+        monthly_by_biome_df=pd.DataFrame(),
+        state_month_all_df=pd.DataFrame(),
+        state_month_by_biome_df=state_month_by_biome_df,
+        mensal_counts=mensal_counts,
+        mensal_is_current=True,
+        calendar_year=2026,
+        max_month_in_current_year=1,
+    )
+
+    assert [(r["period"], r["state"], r["biome"], r["value"]) for r in rows] == [
+        ("2025-12", "__all__", "__all__", 5),
+        ("2026-01", "PARÁ", "AMAZÔNIA", 20),
+        ("2026-01", "PARÁ", "__all__", 30),
+        ("2026-01", "__all__", "__all__", 40),
+    ]
+    assert list(rows[0]) == ["period", "year", "value", "biome", "state"]
+
+
+def test_incremental_rebuild_uploads_year_caches_in_one_storage_batch(tmp_path) -> None:
+    class BatchingStorage(FakeStorage):
+        def __init__(self, objects: dict[str, bytes]) -> None:
+            super().__init__(objects)
+            self.batches: list[list[str]] = []
+
+        def upload_many(self, jobs, *, max_workers=None):
+            jobs = list(jobs)
+            self.batches.append([job.object_path for job in jobs])
+            return upload_many(self, jobs, max_workers=max_workers)
+
+    zips = []
+    for year in (2024, 2025):
+        zip_path = tmp_path / f"focos_br_ref_{year}.zip"
+        _write_focos_zip(zip_path, [(f"{year}-03-01 10:00:00", "PARÁ", "Amazônia")])
+        zips.append(zip_path)
+
+    storage = BatchingStorage({})
+    result = build_incremental_year_caches(
+        storage=storage,
+        cache_prefix="reports/test/_cache",
+        zip_files=zips,
+        datetime_candidates=["data_pas"],
+        state_candidates=["estado"],
+        biome_candidates=["bioma"],
+        logger=NullLogger(),
+        max_workers=2,
+    )
+
+    assert result["cache_stats"]["rebuilt_count"] == 2
+    assert [sorted(batch) for batch in storage.batches] == [
+        [f"reports/test/_cache/yearly/{year}.parquet" for year in (2024, 2025)]
+    ]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import logging
+
+from forest_pipelines.benchmarks.report_build import BENCHMARK_STAGES, compare_to_baseline, run_report_build_benchmark
+from forest_pipelines.benchmarks.synthetic_focos import SYNTHETIC_STATES, SyntheticFocosSpec
+from forest_pipelines.reports.builders.bdqueimadas_incremental import aggregate_focos_file
+
+
+def test_benchmark_runs_every_stage_on_synthetic_latin1_inputs(tmp_path) -> None:
+    spec = SyntheticFocosSpec(rows_per_year=3_000, years=2, mensal_rows_per_month=400, satellites=3, encoding="latin-1")
+
+    result = run_report_build_benchmark(
+        tmp_path, spec, chunk_rows=1_000, trace_memory=False, logger=logging.getLogger("test")
+    )
+
+    stages = result["stages"]
+    assert list(stages) == [*BENCHMARK_STAGES, "end_to_end"]
+    assert all(stage["seconds"] >= 0 and stage["peak_traced_bytes"] is None for stage in stages.values())
+    inputs = result["inputs"]
+    assert inputs["annual_rows"] == 6_000
+    #CSVs mensais chegam à normalização já filtrados no satélite de referência
+    assert stages["read"]["rows"] == inputs["annual_rows"] + inputs["mensal_reference_rows"]
+    assert stages["consolidate"]["rows"] == inputs["annual_rows"]
+    assert stages["assemble"]["cache"]["reused_count"] == spec.years
+    assert stages["serialize"]["bytes"] > 0
+
+    zip_path = next((tmp_path / "data").rglob("focos_br_ref_*.zip"))
+    counts, _ = aggregate_focos_file(zip_path, ["data_pas"], ["estado"], ["bioma"])
+    assert set(counts.table(["state"])["state"]) <= set(SYNTHETIC_STATES)
+    assert "MATA ATLÂNTICA" in counts.biomes
+
+
+def test_compare_to_baseline_flags_only_slower_stages_above_noise() -> None:
+    baseline = {"stages": {"read": {"seconds": 1.0}, "serialize": {"seconds": 0.01}, "assemble": {"seconds": 2.0}}}
+    result = {"stages": {"read": {"seconds": 1.5}, "serialize": {"seconds": 0.04}, "assemble": {"seconds": 2.2}}}
+
+    assert compare_to_baseline(result, baseline, max_regression=0.25) == ["read: 1.000s -> 1.500s"]
+    assert compare_to_baseline(result, baseline, max_regression=0.6) == []
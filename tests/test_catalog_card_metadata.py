@@ -80,3 +80,102 @@ reports:
     assert report["coverage"]["year_range"] == "2003-2026"
     assert report["excerpt"] == "Resumo em portugues para o card."
     assert report["excerpt_en"] == "English summary for the card."
+
+
+def test_open_data_catalog_prefetches_manifests_concurrently(tmp_path):
+    import threading
+    import time
+
+    entries = "".join(
+        f"""
+  - id: ds_{i}
+    category_title: C
+    subcategory_title: S
+    source_id: src
+    source_title: Src
+    slug: ds-{i}
+    title: "DS {i}"
+    description: "Dataset {i}"
+    manifest_path: ds/{i}/manifest.json
+    source_url: "https://example.test/{i}"
+"""
+        for i in range(8)
+    )
+    base_path = tmp_path / "open_data.yml"
+    base_path.write_text("datasets:" + entries, encoding="utf-8")
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def loader(path):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        if path == "ds/3/manifest.json":
+            raise RuntimeError("boom")
+        return {"generated_at": "2026-01-01T00:00:00Z"}
+
+    warnings: list[str] = []
+    env = build_open_data_catalog(
+        base_config_path=base_path,
+        warnings_bucket=warnings,
+        manifest_loader=loader,
+        max_workers=4,
+    )
+
+    assert state["peak"] > 1
+    assert env["datasets"][0]["generated_at"] == "2026-01-01T00:00:00Z"
+    assert "generated_at" not in env["datasets"][3]
+    assert len(warnings) == 1 and "ds/3/manifest.json" in warnings[0]
+
+
+def test_build_cache_reuses_entries_and_envelope_timestamp(tmp_path, monkeypatch):
+    from forest_pipelines.catalog import build as catalog_build
+    from forest_pipelines.catalog.build_cache import CatalogBuildCache
+
+    base_path = tmp_path / "open_data.yml"
+    base_path.write_text(
+        """
+datasets:
+  - id: ds_a
+    category_title: C
+    subcategory_title: S
+    source_id: src
+    source_title: Src
+    slug: ds-a
+    title: "DS A"
+    description: "Dataset A"
+    manifest_path: ds/a/manifest.json
+    source_url: "https://example.test/a"
+""".lstrip(),
+        encoding="utf-8",
+    )
+    manifests = {"ds/a/manifest.json": {"generated_at": "2026-01-01T00:00:00Z"}}
+    clock = iter(["2026-02-01T00:00:00Z", "2026-02-02T00:00:00Z", "2026-02-03T00:00:00Z"])
+    monkeypatch.setattr(catalog_build, "_now_iso", lambda: next(clock))
+
+    def build():
+        cache = CatalogBuildCache(tmp_path / "cache.json")
+        env = build_open_data_catalog(
+            base_config_path=base_path,
+            warnings_bucket=[],
+            manifest_loader=manifests.get,
+            build_cache=cache,
+        )
+        cache.save()
+        return env, cache
+
+    first, _ = build()
+    second, cache = build()
+    assert cache.stats == {"hits": 1, "misses": 0}
+    assert second == first
+    assert second["generated_at"] == "2026-02-01T00:00:00Z"
+
+    manifests["ds/a/manifest.json"] = {"generated_at": "2026-03-01T00:00:00Z"}
+    third, cache = build()
+    assert cache.stats == {"hits": 0, "misses": 1}
+    assert third["datasets"][0]["generated_at"] == "2026-03-01T00:00:00Z"
+    assert third["generated_at"] == "2026-02-03T00:00:00Z"
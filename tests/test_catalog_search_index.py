@@ -0,0 +1,57 @@
+from forest_pipelines.catalog.search_index import (
+    build_card_envelope,
+    build_search_index,
+    fold_text,
+    search,
+    tokenize,
+)
+
+
+def _envelope():
+    return {
+        "schema_version": "1.2",
+        "generated_at": "2026-01-01T00:00:00Z",
+        "datasets": [
+            {
+                "id": "inpe_focos",
+                "slug": "focos",
+                "title": "Focos de Queimadas na Região Amazônica",
+                "title_en": "Fire hotspots in the Amazon",
+                "description": "Longa descrição " * 20,
+                "source_title": "INPE",
+                "manifest_path": "inpe/focos/manifest.json",
+            },
+            {
+                "id": "anp_precos",
+                "slug": "precos",
+                "title": "Preços de combustíveis",
+                "description": "Série histórica da ANP",
+                "source_title": "ANP",
+                "manifest_path": "anp/precos/manifest.json",
+            },
+        ],
+    }
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert fold_text("Região Amazônica") == "regiao amazonica"
+    assert tokenize("Focos de Queimadas na Região") == ["focos", "queimadas", "regiao"]
+
+
+def test_search_index_maps_tokens_to_dataset_positions():
+    index = build_search_index(_envelope())
+
+    assert index["ids"] == ["inpe_focos", "anp_precos"]
+    assert index["tokens"]["amazonica"] == [0]
+    assert index["tokens"]["anp"] == [1]
+    assert search(index, "regiao amaz") == ["inpe_focos"]
+    assert search(index, "PREÇOS") == ["anp_precos"]
+    assert search(index, "de") == []
+
+
+def test_card_envelope_drops_long_fields():
+    cards = build_card_envelope(_envelope())
+
+    assert cards["catalog_id"] == "open_data_cards"
+    assert "description" not in cards["datasets"][0]
+    assert cards["datasets"][0]["manifest_path"] == "inpe/focos/manifest.json"
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+
+from forest_pipelines.utils import json_codec
+from forest_pipelines.utils.json_codec import canonical_bytes, dumps_bytes, loads, read_json, write_json
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "fast":
+        if not json_codec.fast_encoder_available():
+            pytest.skip("orjson não instalado")
+    else:
+        monkeypatch.setattr(json_codec, "_orjson", None)
+    return request.param
+
+
+def test_compact_and_pretty_match_stdlib(encoder) -> None:
+    payload = {"título": "Região", "items": [1, 2.5, None, True], "nested": {"b": [], "a": {}}}
+
+    assert dumps_bytes(payload) == json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert dumps_bytes(payload, pretty=True) == json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def test_canonical_bytes_ignore_key_order(encoder) -> None:
+    assert canonical_bytes({"b": 1, "a": [{"y": 2, "x": 1}]}) == canonical_bytes({"a": [{"x": 1, "y": 2}], "b": 1})
+    assert canonical_bytes({"b": 1, "a": 2}) == b'{"a":2,"b":1}'
+
+
+def test_default_and_out_of_range_ints_fall_back(encoder) -> None:
+    assert loads(dumps_bytes({"d": date(2024, 1, 2)}, default=str)) == {"d": "2024-01-02"}
+    assert loads(dumps_bytes({"big": 2**70})) == {"big": 2**70}
+
+
+def test_write_json_streams_atomically(encoder, tmp_path) -> None:
+    target = tmp_path / "state" / "big.json"
+    payload = {"rows": [{"id": i, "nome": f"área {i}"} for i in range(20_000)]}
+
+    write_json(target, payload)
+
+    assert read_json(target) == payload
+    assert [p.name for p in target.parent.iterdir()] == ["big.json"]
+
+
+def test_write_json_keeps_previous_file_on_failure(encoder, tmp_path) -> None:
+    target = tmp_path / "state.json"
+    write_json(target, {"ok": True})
+
+    with pytest.raises(TypeError):
+        write_json(target, {"bad": object()})
+
+    assert read_json(target) == {"ok": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from forest_pipelines.cli import _publish_dataset_manifest
+from forest_pipelines.manifests.build_manifest import build_manifest
+from forest_pipelines.manifests.delta import (
+    apply_manifest_delta,
+    build_manifest_delta,
+    next_delta_index,
+)
+from forest_pipelines.storage.local_storage import LocalStorage
+
+
+class NullLogger:
+    def info(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def warning(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+
+def _manifest(items: list[dict], revision: int | None = None) -> dict:
+    manifest = build_manifest(
+        dataset_id="d",
+        title="D",
+        source_dataset_url="https://example.test/d",
+        bucket_prefix="datasets/d",
+        items=items,
+        meta=None,
+    )
+    if revision is not None:
+        manifest["revision"] = revision
+    return manifest
+
+
+def test_delta_round_trips_added_changed_and_removed_items() -> None:
+    previous = _manifest(
+        [
+            {"source_url": "https://x/a", "size": 1},
+            {"source_url": "https://x/b", "size": 2},
+        ],
+        revision=4,
+    )
+    current = _manifest(
+        [
+            {"source_url": "https://x/b", "size": 20},
+            {"source_url": "https://x/c", "size": 3},
+        ],
+        revision=5,
+    )
+
+    delta = build_manifest_delta(previous, current)
+
+    assert [item["source_url"] for item in delta["added"]] == ["https://x/c"]
+    assert [item["source_url"] for item in delta["changed"]] == ["https://x/b"]
+    assert delta["removed"] == ["https://x/a"]
+    assert apply_manifest_delta(previous, delta) == current
+
+
+def test_apply_rejects_delta_for_other_base() -> None:
+    delta = build_manifest_delta(_manifest([], revision=1), _manifest([], revision=2))
+    with pytest.raises(ValueError):
+        apply_manifest_delta(_manifest([], revision=3), delta)
+
+
+def test_index_drops_old_deltas_and_restarts_on_broken_chain() -> None:
+    index = None
+    for revision in range(2, 6):
+        delta = build_manifest_delta(_manifest([], revision=revision - 1), _manifest([], revision=revision))
+        index, expired = next_delta_index(index, delta, delta_path=f"d/{revision}", manifest_path="m", keep=2)
+    assert [entry["revision"] for entry in index["deltas"]] == [4, 5]
+    assert index["oldest_base_revision"] == 3
+    assert expired == ["d/3"]
+
+    gap = build_manifest_delta(_manifest([], revision=9), _manifest([], revision=10))
+    index, expired = next_delta_index(index, gap, delta_path="d/10", manifest_path="m", keep=2)
+    assert [entry["revision"] for entry in index["deltas"]] == [10]
+    assert expired == ["d/4", "d/5"]
+
+
+def test_publisher_writes_revisioned_manifest_delta_and_index(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+    manifest_path = "datasets/d/manifest.json"
+
+    _publish_dataset_manifest(storage, manifest_path, _manifest([{"source_url": "https://x/a"}]), NullLogger())
+    assert storage.download_bytes("datasets/d/deltas/index.json") is None
+
+    _publish_dataset_manifest(
+        storage,
+        manifest_path,
+        _manifest([{"source_url": "https://x/a"}, {"source_url": "https://x/b"}]),
+        NullLogger(),
+    )
+
+    snapshot = json.loads(storage.download_bytes(manifest_path))
+    index = json.loads(storage.download_bytes("datasets/d/deltas/index.json"))
+    delta = json.loads(storage.download_bytes(index["deltas"][-1]["path"]))
+    assert snapshot["revision"] == 2
+    assert index["revision"] == 2
+    assert [item["source_url"] for item in delta["added"]] == ["https://x/b"]
+
+
+def test_unchanged_resync_keeps_revision_and_uploads_nothing(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+    manifest_path = "datasets/d/manifest.json"
+    _publish_dataset_manifest(storage, manifest_path, _manifest([{"source_url": "https://x/a"}]), NullLogger())
+    first = json.loads(storage.download_bytes(manifest_path))
+    written = storage.upload_stats["written"]
+
+    resync = _manifest([{"source_url": "https://x/a"}])
+    resync["generated_at"] = "2099-01-01T00:00:00Z"
+    _publish_dataset_manifest(storage, manifest_path, resync, NullLogger())
+
+    assert storage.upload_stats["written"] == written
+    assert resync["revision"] == 1
+    assert resync["generated_at"] == first["generated_at"]
+    assert storage.download_bytes("datasets/d/deltas/index.json") is None
+
+    _publish_dataset_manifest(
+        storage, manifest_path, _manifest([{"source_url": "https://x/a"}, {"source_url": "https://x/b"}]), NullLogger()
+    )
+    index = json.loads(storage.download_bytes("datasets/d/deltas/index.json"))
+    assert [(entry["base_revision"], entry["revision"]) for entry in index["deltas"]] == [(1, 2)]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+from forest_pipelines.cli import _fetch_existing_dataset_manifest, _publish_dataset_manifest
+from forest_pipelines.manifests.build_manifest import build_manifest
+from forest_pipelines.manifests.shards import hydrate_sharded_manifest, shard_key, split_manifest_into_shards
+from forest_pipelines.storage.local_storage import LocalStorage
+
+
+class NullLogger:
+    def info(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def warning(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+
+class CountingStorage(LocalStorage):
+    def upload_bytes(self, object_path, data, content_type, upsert=True, content_encoding=None, cache_control=None):
+        self.written = [*getattr(self, "written", []), object_path]
+        super().upload_bytes(object_path, data, content_type, upsert, content_encoding, cache_control)
+
+
+def _manifest(periods: list[str]) -> dict:
+    return build_manifest(
+        dataset_id="d",
+        title="D",
+        source_dataset_url="https://example.test/d",
+        bucket_prefix="focos/diario",
+        items=[{"source_url": f"https://x/{p}.csv", "period": p} for p in periods],
+        meta=None,
+        shard_by="month",
+    )
+
+
+def test_shard_key_by_month_and_year() -> None:
+    assert shard_key({"period": "2026-10-19 1200"}, "month") == "2026-10"
+    assert shard_key({"period": "2026-10-19"}, "year") == "2026"
+    assert shard_key({"period": "arquivo"}, "month") == "undated"
+
+
+def test_split_and_hydrate_round_trip() -> None:
+    manifest = _manifest(["2026-10-02", "2026-10-01", "2026-09-30", "leia-me"])
+
+    index, shards = split_manifest_into_shards(manifest)
+
+    assert index["items"] == []
+    assert index["item_count"] == 4
+    assert [entry["path"] for entry in index["shards"]] == [
+        "items/2026-10.json",
+        "items/2026-09.json",
+        "items/undated.json",
+    ]
+    hydrated, missing = hydrate_sharded_manifest(index, lambda rel: shards.get(rel))
+    assert missing == []
+    assert hydrated == manifest
+
+
+def test_publisher_rewrites_only_changed_shards(tmp_path) -> None:
+    storage = CountingStorage(root=tmp_path / "bucket")
+    manifest_path = "focos/diario/manifest.json"
+    _publish_dataset_manifest(storage, manifest_path, _manifest(["2026-09-30", "2026-10-01"]), NullLogger())
+    storage.written = []
+
+    _publish_dataset_manifest(
+        storage,
+        manifest_path,
+        _manifest(["2026-09-30", "2026-10-01", "2026-10-02"]),
+        NullLogger(),
+    )
+
+    assert "focos/diario/items/2026-10.json" in storage.written
+    assert "focos/diario/items/2026-09.json" not in storage.written
+    index = json.loads(storage.download_bytes(manifest_path))
+    assert index["revision"] == 2
+    assert index["item_count"] == 3
+
+    existing = _fetch_existing_dataset_manifest(storage, manifest_path, NullLogger())
+    assert len(existing["items"]) == 3
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+
+from forest_pipelines.reports.publish.supabase import publish_report_package
+from forest_pipelines.reports.shards import hydrate_report_shards, shard_report_package, split_report_into_shards
+from forest_pipelines.storage.local_storage import LocalStorage
+
+ALL = "__all__"
+
+
+class NullLogger:
+    def info(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def warning(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+
+def _report(states: list[str]) -> dict:
+    rows = []
+    for period in ("2025-01", "2025-02"):
+        for state in [ALL, *states]:
+            for biome in (ALL, "AMAZÔNIA", "CERRADO"):
+                rows.append({"period": period, "state": state, "biome": biome, "value": len(rows)})
+    return {
+        "report_id": "r",
+        "generated_at": "2026-01-01T00:00:00Z",
+        "sections": [
+            {"id": "top", "kind": "table", "filterable_by": [], "data": [{"state": "PARÁ", "value": 1}]},
+            {"id": "series", "kind": "timeseries", "filterable_by": ["period", "biome", "state"], "data": rows},
+        ],
+    }
+
+
+def _package(report: dict) -> dict:
+    return {
+        "report_id": "r",
+        "title": "R",
+        "bucket_prefix": "reports/r",
+        "generated_report": report,
+        "live_report": {**report, "sections": list(report["sections"]), "publication_status": "live"},
+        "auxiliary_json": [{"relative_path": "data/a.json", "payload": {"n": 1}}],
+    }
+
+
+def test_split_keeps_national_rows_in_core_and_round_trips() -> None:
+    report = _report(["PARÁ", "MATO GROSSO"])
+
+    core, shards = split_report_into_shards(report)
+
+    series = next(section for section in core["sections"] if section["id"] == "series")
+    assert {(row["state"], row["biome"]) for row in series["data"]} == {(ALL, ALL)}
+    assert core["sections"][0] == report["sections"][0]
+    assert sorted(shards) == [
+        "shards/biome/amazonia.json",
+        "shards/biome/cerrado.json",
+        "shards/state/mato-grosso.json",
+        "shards/state/para.json",
+    ]
+    assert {row["biome"] for row in shards["shards/state/para.json"]["sections"]["series"]} == {ALL, "AMAZÔNIA", "CERRADO"}
+    assert core["sharding"]["sections"] == ["series"]
+
+    hydrated, missing = hydrate_report_shards(core, shards.get)
+    assert missing == []
+    key = lambda row: (row["period"], row["state"], row["biome"])  # noqa: E731
+    assert sorted(hydrated["sections"][1]["data"], key=key) == sorted(report["sections"][1]["data"], key=key)
+    assert {k: v for k, v in hydrated.items() if k != "sections"} == {k: v for k, v in report.items() if k != "sections"}
+
+
+def test_live_sections_changed_by_overrides_stay_inline() -> None:
+    package = _package(_report(["PARÁ"]))
+    package["live_report"]["sections"][1] = {**package["live_report"]["sections"][1], "data": [{"state": ALL, "biome": ALL}]}
+
+    sharded = shard_report_package(package)
+
+    assert sharded["live_report"]["sections"][1]["data"] == [{"state": ALL, "biome": ALL}]
+    assert sharded["live_report"]["sharding"]["sections"] == []
+    assert sharded["generated_report"]["sharding"]["sections"] == ["series"]
+
+
+def test_hydrating_a_live_core_keeps_overridden_sections_as_published() -> None:
+    package = _package(_report(["PARÁ"]))
+    series = package["live_report"]["sections"][1]
+    override = [{**row, "value": row["value"] * 10} if row["state"] == "PARÁ" else row for row in series["data"]]
+    package["live_report"]["sections"][1] = {**series, "data": override}
+
+    sharded = shard_report_package(package)
+    shards = {item["relative_path"]: item["payload"] for item in sharded["auxiliary_json"]}
+    hydrated, missing = hydrate_report_shards(sharded["live_report"], shards.get)
+
+    assert missing == []
+    assert hydrated["sections"][1]["data"] == override
+    generated, _ = hydrate_report_shards(sharded["generated_report"], shards.get)
+    assert len(generated["sections"][1]["data"]) == len(override)
+
+
+def test_publish_lists_shards_and_removes_dropped_ones(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+
+    first = publish_report_package(storage, shard_report_package(_package(_report(["PARÁ", "ACRE"]))), NullLogger())
+    assert first["sharding"]["relative_paths"] == [
+        "shards/biome/amazonia.json",
+        "shards/biome/cerrado.json",
+        "shards/state/acre.json",
+        "shards/state/para.json",
+    ]
+    assert "shards/state/acre.json" in first["public_urls"]
+    live = json.loads((tmp_path / "bucket/reports/r/live/report.json").read_bytes())
+    assert live["sharding"]["shards"][0]["path"] == "shards/biome/amazonia.json"
+    versioned = json.loads((tmp_path / "bucket" / first["versioned_paths"]["live/report.json"]).read_bytes())
+    version_prefix = f"versions/{first['version']}"
+    assert [entry["path"] for entry in versioned["sharding"]["shards"]] == [
+        f"{version_prefix}/{rel}" for rel in first["sharding"]["relative_paths"]
+    ]
+    assert all((tmp_path / "bucket/reports/r" / entry["path"]).exists() for entry in versioned["sharding"]["shards"])
+
+    second = publish_report_package(storage, shard_report_package(_package(_report(["PARÁ"]))), NullLogger())
+    assert "shards/state/acre.json" not in second["sharding"]["relative_paths"]
+    assert not (tmp_path / "bucket/reports/r/shards/state/acre.json").exists()
+    assert (tmp_path / "bucket/reports/r/shards/state/para.json").exists()
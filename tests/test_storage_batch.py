@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from forest_pipelines.reports.publish.supabase import publish_report_package
+from forest_pipelines.storage.batch import UploadJob, delete_objects_best_effort, upload_jobs, upload_many
+
+
+class RecordingStorage:
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.order: list[str] = []
+        self.failing = failing or set()
+        self._lock = threading.Lock()
+
+    def upload_bytes(
+        self,
+        object_path: str,
+        data: bytes,
+        content_type: str,
+        upsert: bool = True,
+        cache_control: str | None = None,
+    ) -> None:
+        if object_path in self.failing:
+            raise RuntimeError(f"boom {object_path}")
+        with self._lock:
+            self.objects[object_path] = data
+            self.order.append(object_path)
+
+    def upload_file(self, object_path: str, local_path: str, content_type: str, upsert: bool = True) -> None:
+        with open(local_path, "rb") as f:
+            self.upload_bytes(object_path, f.read(), content_type, upsert)
+
+    def download_bytes(self, object_path: str) -> bytes | None:
+        return self.objects.get(object_path)
+
+    def public_url(self, object_path: str) -> str:
+        return f"https://example.test/{object_path}"
+
+
+class NullLogger:
+    def info(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def warning(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+
+def test_upload_many_collects_successes_and_failures(tmp_path) -> None:
+    local = tmp_path / "a.bin"
+    local.write_bytes(b"file")
+    storage = RecordingStorage(failing={"x/bad.json"})
+
+    result = upload_many(
+        storage,
+        [
+            UploadJob(object_path="x/a.bin", local_path=str(local), content_type="application/octet-stream"),
+            UploadJob(object_path="x/b.json", data=b"{}", content_type="application/json"),
+            UploadJob(object_path="x/bad.json", data=b"{}", content_type="application/json"),
+        ],
+        max_workers=3,
+        logger=NullLogger(),
+    )
+
+    assert sorted(result.uploaded) == ["x/a.bin", "x/b.json"]
+    assert list(result.failed) == ["x/bad.json"]
+    assert result.summary()["failed_count"] == 1
+    assert storage.objects["x/a.bin"] == b"file"
+    with pytest.raises(RuntimeError):
+        result.raise_for_failures()
+
+
+def test_upload_job_requires_exactly_one_source() -> None:
+    with pytest.raises(ValueError):
+        UploadJob(object_path="x", content_type="application/json")
+    with pytest.raises(ValueError):
+        UploadJob(object_path="x", content_type="application/json", data=b"", local_path="y")
+
+
+def test_publish_report_package_writes_manifest_after_report_files() -> None:
+    storage = RecordingStorage()
+    package = {
+        "report_id": "r",
+        "title": "R",
+        "bucket_prefix": "reports/r/",
+        "generated_report": {"generated_at": "2026-01-01T00:00:00Z"},
+        "live_report": {"generated_at": "2026-01-01T00:00:00Z"},
+        "auxiliary_json": [{"relative_path": "data/a.json", "payload": {"a": 1}}],
+    }
+
+    manifest = publish_report_package(storage, package, NullLogger())
+
+    version_prefix = f"reports/r/versions/{manifest['version']}"
+    assert storage.order[-1] == "reports/r/manifest.json"
+    assert set(storage.order[:-1]) == {
+        "reports/r/generated/report.json",
+        "reports/r/live/report.json",
+        "reports/r/report.json",
+        "reports/r/data/a.json",
+        f"{version_prefix}/generated/report.json",
+        f"{version_prefix}/live/report.json",
+        f"{version_prefix}/data/a.json",
+    }
+    assert manifest["paths"]["data/a.json"] == "reports/r/data/a.json"
+    assert manifest["versioned_paths"]["data/a.json"] == f"{version_prefix}/data/a.json"
+
+
+def test_publish_report_package_does_not_write_manifest_on_failure() -> None:
+    storage = RecordingStorage(failing={"reports/r/live/report.json"})
+    package = {
+        "report_id": "r",
+        "title": "R",
+        "bucket_prefix": "reports/r",
+        "generated_report": {},
+        "live_report": {},
+    }
+
+    with pytest.raises(RuntimeError):
+        publish_report_package(storage, package, NullLogger())
+    assert "reports/r/manifest.json" not in storage.objects
+
+
+def test_upload_jobs_prefers_the_storage_upload_many() -> None:
+    class BatchingStorage(RecordingStorage):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: list[list[str]] = []
+
+        def upload_many(self, jobs, max_workers=None):  # noqa: ANN001
+            job_list = list(jobs)
+            self.batches.append([job.object_path for job in job_list])
+            return upload_many(self, job_list, max_workers=max_workers)
+
+    storage = BatchingStorage()
+    jobs = [UploadJob(object_path="x/a.json", data=b"{}", content_type="application/json")]
+
+    assert upload_jobs(storage, jobs).uploaded == ["x/a.json"]
+    assert storage.batches == [["x/a.json"]]
+    assert upload_jobs(RecordingStorage(), jobs).uploaded == ["x/a.json"]
+
+
+def test_delete_objects_best_effort_never_raises() -> None:
+    class Logger(NullLogger):
+        def __init__(self) -> None:
+            self.warnings: list[str] = []
+
+        def warning(self, message: str, *args: object) -> None:
+            self.warnings.append(message % args)
+
+    class FailingDeletes(RecordingStorage):
+        def delete_objects(self, object_paths: list[str]) -> None:
+            raise RuntimeError("403")
+
+    logger = Logger()
+    delete_objects_best_effort(FailingDeletes(), ["a/x.json", "a/x.json"], logger, what="cache(s) legado(s)")
+    delete_objects_best_effort(RecordingStorage(), ["a/x.json"], logger)
+
+    assert logger.warnings == ["Falha ao remover 1 cache(s) legado(s): 403"]
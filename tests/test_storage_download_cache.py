@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from typing import Any
+
+from forest_pipelines.storage.download_cache import DownloadCache
+from forest_pipelines.storage.supabase_storage import SupabaseStorage
+
+
+class FakeBucket:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.downloads: list[str] = []
+
+    def upload(self, file: Any, path: str, file_options: dict[str, Any]) -> dict[str, str]:
+        self.objects[path] = file if isinstance(file, bytes) else file.read()
+        return {"Key": path}
+
+    def download(self, path: str) -> bytes:
+        self.downloads.append(path)
+        if path not in self.objects:
+            raise RuntimeError("not found")
+        return self.objects[path]
+
+
+class FakeClient:
+    def __init__(self, bucket: FakeBucket) -> None:
+        self.bucket = bucket
+        self.storage = self
+
+    def from_(self, _name: str) -> FakeBucket:
+        return self.bucket
+
+
+def _storage(cache: DownloadCache | None) -> tuple[SupabaseStorage, FakeBucket]:
+    bucket = FakeBucket()
+    storage = SupabaseStorage(
+        supabase_url="https://example.test/",
+        service_role_key="secret",
+        download_cache=cache,
+    )
+    storage.__dict__["client"] = FakeClient(bucket)
+    return storage, bucket
+
+
+def test_repeated_downloads_hit_the_network_once() -> None:
+    storage, bucket = _storage(DownloadCache())
+    bucket.objects["a/manifest.json"] = b'{"a":1}'
+
+    assert storage.download_bytes("a/manifest.json") == b'{"a":1}'
+    assert storage.download_bytes("a/manifest.json") == b'{"a":1}'
+
+    assert bucket.downloads == ["a/manifest.json"]
+    assert storage.download_cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_own_uploads_refresh_the_cache() -> None:
+    storage, bucket = _storage(DownloadCache())
+    bucket.objects["a/manifest.json"] = b'{"a":1}'
+    storage.download_bytes("a/manifest.json")
+
+    storage.upload_bytes("a/manifest.json", gzip.compress(b'{"a":2}'), "application/json", content_encoding="gzip")
+
+    assert storage.download_bytes("a/manifest.json") == b'{"a":2}'
+    assert bucket.downloads == ["a/manifest.json"]
+
+
+def test_upload_file_invalidates_cached_entry(tmp_path) -> None:
+    storage, bucket = _storage(DownloadCache())
+    bucket.objects["a/x.json"] = b"old"
+    storage.download_bytes("a/x.json")
+    local = tmp_path / "x.json"
+    local.write_bytes(b"new")
+
+    storage.upload_file("a/x.json", str(local), "application/json")
+
+    assert storage.download_bytes("a/x.json") == b"new"
+    assert bucket.downloads == ["a/x.json", "a/x.json"]
+
+
+def test_missing_objects_are_not_cached() -> None:
+    storage, bucket = _storage(DownloadCache())
+
+    assert storage.download_bytes("a/missing.json") is None
+    assert storage.download_bytes("a/missing.json") is None
+    assert bucket.downloads == ["a/missing.json", "a/missing.json"]
+
+
+def test_memory_tier_evicts_least_recently_used() -> None:
+    cache = DownloadCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"12345"
+
+
+def test_disk_tier_survives_new_instance_until_ttl(tmp_path) -> None:
+    DownloadCache(disk_dir=tmp_path, disk_ttl_seconds=60).put("a/x.json", b"{}")
+
+    fresh = DownloadCache(disk_dir=tmp_path, disk_ttl_seconds=60)
+    assert fresh.get("a/x.json") == b"{}"
+
+    stale = DownloadCache(disk_dir=tmp_path, disk_ttl_seconds=60)
+    for path in tmp_path.rglob("*.bin"):
+        old = time.time() - 120
+        os.utime(path, (old, old))
+    assert stale.get("a/x.json") is None
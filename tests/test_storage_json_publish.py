@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import types
+import zlib
+
+import pytest
+
+from forest_pipelines.storage.batch import upload_jobs
+from forest_pipelines.storage.json_publish import (
+    json_upload_jobs,
+    maybe_decompress,
+    needs_content_encoding,
+    normalize_json_compression,
+)
+from forest_pipelines.storage.local_storage import LocalStorage
+from forest_pipelines.storage.staged_publish import load_pointer
+
+
+class Storage:
+    def __init__(self, json_compression: str | None = None, json_debug_copy: bool = False) -> None:
+        self.json_compression = json_compression
+        self.json_debug_copy = json_debug_copy
+
+
+def test_default_jobs_are_compact_uncompressed_json() -> None:
+    jobs = json_upload_jobs(object(), "a/report.json", {"título": [1, 2]})
+
+    assert len(jobs) == 1
+    assert jobs[0].data == '{"título":[1,2]}'.encode("utf-8")
+    assert jobs[0].content_encoding is None
+
+
+def test_gzip_jobs_are_deterministic_and_round_trip() -> None:
+    storage = Storage(json_compression="gzip")
+    first = json_upload_jobs(storage, "a/report.json", {"a": 1})[0]
+    second = json_upload_jobs(storage, "a/report.json", {"a": 1})[0]
+
+    assert first.content_encoding == "gzip"
+    assert first.data == second.data
+    assert json.loads(gzip.decompress(first.data)) == {"a": 1}
+    assert maybe_decompress(first.data) == b'{"a":1}'
+    assert maybe_decompress(b'{"a":1}') == b'{"a":1}'
+
+
+def test_debug_copy_is_pretty_and_uncompressed() -> None:
+    storage = Storage(json_compression="gzip", json_debug_copy=True)
+    jobs = json_upload_jobs(storage, "catalog/open_data_catalog.json", {"a": 1})
+
+    assert [job.object_path for job in jobs] == [
+        "catalog/open_data_catalog.json",
+        "catalog/open_data_catalog.debug.json",
+    ]
+    assert jobs[1].content_encoding is None
+    assert jobs[1].data == b'{\n  "a": 1\n}'
+
+
+def test_normalize_json_compression() -> None:
+    assert normalize_json_compression("") is None
+    assert normalize_json_compression("GZIP") == "gzip"
+    assert normalize_json_compression("brotli") == "br"
+    with pytest.raises(ValueError):
+        normalize_json_compression("zstd")
+
+
+class FakeBrotli(types.ModuleType):
+    """Stand-in for the optional brotli package (no magic bytes, like the real format)."""
+
+    def __init__(self) -> None:
+        super().__init__("brotli")
+
+    @staticmethod
+    def compress(data: bytes, quality: int = 11) -> bytes:
+        return b"\x8b" + zlib.compress(data)
+
+    @staticmethod
+    def decompress(data: bytes) -> bytes:
+        if data[:1] != b"\x8b":
+            raise ValueError("not br")
+        return zlib.decompress(data[1:])
+
+
+def test_brotli_objects_are_read_back_through_their_content_encoding(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "brotli", FakeBrotli())
+    storage = LocalStorage(root=tmp_path / "bucket", json_compression="br")
+    upload_jobs(storage, json_upload_jobs(storage, "a/pointer.json", {"version": "v1"})).raise_for_failures()
+
+    assert storage.object_meta("a/pointer.json")["content_encoding"] == "br"
+    assert load_pointer(storage, "a/pointer.json") == {"version": "v1"}
+    assert maybe_decompress(b'{"a":1}', "br") == b'{"a":1}'
+    assert not needs_content_encoding("a/x.json", b' {"a":1}')
+    assert not needs_content_encoding("a/x.parquet", b"PAR1")
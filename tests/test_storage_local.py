@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from forest_pipelines.catalog.build import publish_catalogs
+from forest_pipelines.settings import load_settings
+from forest_pipelines.storage.local_storage import LocalStorage, push_local_storage
+
+
+class RecordingStorage:
+    def __init__(self) -> None:
+        self.calls: dict[str, dict[str, object]] = {}
+
+    def upload_file(
+        self,
+        object_path: str,
+        local_path: str,
+        content_type: str,
+        upsert: bool = True,
+        content_encoding: str | None = None,
+        cache_control: str | None = None,
+    ) -> None:
+        with open(local_path, "rb") as f:
+            data = f.read()
+        self.calls[object_path] = {
+            "data": data,
+            "content_type": content_type,
+            "content_encoding": content_encoding,
+            "cache_control": cache_control,
+        }
+
+
+def test_local_storage_round_trip_and_missing_object(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+    storage.upload_bytes("a/b/manifest.json", b'{"a":1}', "application/json")
+
+    assert storage.download_bytes("a/b/manifest.json") == b'{"a":1}'
+    assert storage.download_bytes("a/b/missing.json") is None
+    assert storage.iter_object_paths() == ["a/b/manifest.json"]
+    assert storage.public_url("a/b/manifest.json").startswith("file://")
+    assert storage.upload_stats["written"] == 1
+
+
+def test_local_storage_rejects_paths_outside_root(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+    with pytest.raises(ValueError):
+        storage.upload_bytes("../escape.json", b"{}", "application/json")
+
+
+def test_publish_catalogs_to_local_storage_then_push(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket", json_compression="gzip")
+    publish_catalogs(
+        storage,
+        open_data_envelope={"datasets": []},
+        reports_envelope={"reports": []},
+    )
+
+    assert storage.download_bytes("catalog/open_data_catalog.json") == b'{"datasets":[]}'
+
+    target = RecordingStorage()
+    result = push_local_storage(storage, target, prefix="catalog")
+
+    assert result.ok
+    pushed = target.calls["catalog/reports_catalog.json"]
+    assert pushed["content_encoding"] == "gzip"
+    assert pushed["content_type"] == "application/json; charset=utf-8"
+    assert gzip.decompress(pushed["data"]) == b'{"reports":[]}'
+    assert any(
+        call["cache_control"] for path, call in target.calls.items() if "/versions/" in path
+    )
+
+
+def test_settings_select_local_backend_from_env(tmp_path, monkeypatch) -> None:
+    config_dir = tmp_path / "configs"
+    config_dir.mkdir()
+    config = config_dir / "app.yml"
+    config.write_text(
+        "app:\n  data_dir: data\n  logs_dir: logs\n"
+        "supabase:\n  bucket_open_data_env: TEST_BUCKET_ENV\n"
+        "datasets_dir: configs/datasets\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("FP_STORAGE_BACKEND", "local")
+    monkeypatch.delenv("FP_LOCAL_STORAGE_DIR", raising=False)
+
+    settings = load_settings(str(config))
+
+    assert settings.storage_backend == "local"
+    assert settings.local_storage_dir == (tmp_path / "data" / "_local_storage").resolve()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any
+
+import requests
+
+from forest_pipelines.storage.resumable import ResumableUploader
+from forest_pipelines.storage.supabase_storage import SupabaseStorage
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+
+class FakeTusServer:
+    """Minimal in-memory TUS endpoint; can drop one PATCH to simulate a network error."""
+
+    def __init__(self, fail_on_patch: int | None = None) -> None:
+        self.uploads: dict[str, dict[str, Any]] = {}
+        self.created: list[dict[str, str]] = []
+        self.patches: list[int] = []
+        self.fail_on_patch = fail_on_patch
+
+    def post(self, url: str, headers: dict[str, str], timeout: float) -> FakeResponse:
+        upload_id = f"u{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"length": int(headers["Upload-Length"]), "data": bytearray()}
+        self.created.append(headers)
+        return FakeResponse(201, {"Location": f"/storage/v1/upload/resumable/{upload_id}"})
+
+    def head(self, url: str, headers: dict[str, str], timeout: float) -> FakeResponse:
+        upload = self.uploads.get(url.rsplit("/", 1)[-1])
+        if upload is None:
+            return FakeResponse(404)
+        return FakeResponse(200, {"Upload-Offset": str(len(upload["data"]))})
+
+    def patch(self, url: str, data: bytes, headers: dict[str, str], timeout: float) -> FakeResponse:
+        self.patches.append(int(headers["Upload-Offset"]))
+        if self.fail_on_patch == len(self.patches):
+            raise requests.ConnectionError("connection reset")
+        upload = self.uploads[url.rsplit("/", 1)[-1]]
+        if int(headers["Upload-Offset"]) != len(upload["data"]):
+            return FakeResponse(409)
+        upload["data"].extend(data)
+        return FakeResponse(204, {"Upload-Offset": str(len(upload["data"]))})
+
+
+def _uploader(server: FakeTusServer, **kwargs: Any) -> ResumableUploader:
+    return ResumableUploader(
+        endpoint="https://example.test/storage/v1/upload/resumable",
+        auth_headers={"authorization": "Bearer secret"},
+        chunk_size=4,
+        max_chunk_retries=2,
+        session=server,
+        **kwargs,
+    )
+
+
+def test_failed_chunk_resumes_from_server_offset(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("forest_pipelines.storage.resumable.time.sleep", lambda _s: None)
+    local = tmp_path / "big.bin"
+    local.write_bytes(b"0123456789")
+    server = FakeTusServer(fail_on_patch=2)
+
+    _uploader(server).upload(local, bucket="open-data", object_path="raw/big.bin", content_type="application/octet-stream")
+
+    assert bytes(server.uploads["u1"]["data"]) == b"0123456789"
+    assert server.patches == [0, 4, 4, 8]
+    assert len(server.created) == 1
+
+
+def test_state_file_lets_a_new_process_resume(tmp_path) -> None:
+    local = tmp_path / "big.bin"
+    local.write_bytes(b"0123456789")
+    state_path = tmp_path / "state.json"
+    server = FakeTusServer(fail_on_patch=2)
+
+    first = _uploader(server, state_path=state_path)
+    first.max_chunk_retries = 0
+    try:
+        first.upload(local, bucket="open-data", object_path="raw/big.bin", content_type="application/octet-stream")
+    except RuntimeError:
+        pass
+
+    _uploader(server, state_path=state_path).upload(
+        local,
+        bucket="open-data",
+        object_path="raw/big.bin",
+        content_type="application/octet-stream",
+    )
+
+    assert bytes(server.uploads["u1"]["data"]) == b"0123456789"
+    assert len(server.created) == 1
+    assert state_path.read_text(encoding="utf-8") == "{}"
+
+
+def test_supabase_storage_routes_large_files_through_tus(tmp_path) -> None:
+    server = FakeTusServer()
+    storage = SupabaseStorage(
+        supabase_url="https://example.test/",
+        service_role_key="secret",
+        resumable_threshold_bytes=8,
+    )
+    storage.__dict__["resumable_uploader"] = _uploader(server)
+    storage.__dict__["client"] = object()
+    local = tmp_path / "big.bin"
+    local.write_bytes(b"0123456789")
+
+    storage.upload_file("raw/big.bin", str(local), "application/octet-stream")
+
+    assert bytes(server.uploads["u1"]["data"]) == b"0123456789"
+    assert storage.upload_stats["written"] == 1
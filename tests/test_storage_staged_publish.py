@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+from forest_pipelines.catalog.build import publish_catalogs
+from forest_pipelines.reports.publish.supabase import publish_report_package
+from forest_pipelines.storage.local_storage import LocalStorage
+from forest_pipelines.storage.staged_publish import VERSIONS_DIRNAME
+
+
+class NullLogger:
+    def info(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def warning(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+
+def _package(n: int) -> dict:
+    return {
+        "report_id": "r",
+        "title": "R",
+        "bucket_prefix": "reports/r",
+        "generated_report": {"generated_at": f"2026-01-0{n}T00:00:00Z"},
+        "live_report": {"generated_at": f"2026-01-0{n}T00:00:00Z"},
+        "auxiliary_json": [{"relative_path": "data/a.json", "payload": {"n": n}}],
+    }
+
+
+def _version_dirs(storage: LocalStorage, prefix: str) -> set[str]:
+    return {
+        path.split("/")[3]
+        for path in storage.iter_object_paths(f"{prefix}/{VERSIONS_DIRNAME}")
+    }
+
+
+def test_manifest_points_at_consistent_version_and_old_versions_are_collected(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+
+    manifests = [publish_report_package(storage, _package(n), NullLogger(), keep_versions=2) for n in (1, 2, 3)]
+
+    latest = json.loads(storage.download_bytes("reports/r/manifest.json"))
+    assert latest["version"] == manifests[-1]["version"]
+    assert [entry["version"] for entry in latest["version_history"]] == [
+        manifests[2]["version"],
+        manifests[1]["version"],
+    ]
+    assert _version_dirs(storage, "reports/r") == {manifests[2]["version"], manifests[1]["version"]}
+    aux = json.loads(storage.download_bytes(latest["versioned_paths"]["data/a.json"]))
+    assert aux == {"n": 3}
+
+
+def test_republishing_identical_content_reuses_the_version(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+
+    first = publish_report_package(storage, _package(1), NullLogger())
+    second = publish_report_package(storage, _package(1), NullLogger())
+
+    assert first["version"] == second["version"]
+    assert len(second["version_history"]) == 1
+
+
+def test_catalog_pointer_is_written_with_versioned_envelopes(tmp_path) -> None:
+    storage = LocalStorage(root=tmp_path / "bucket")
+
+    result = publish_catalogs(
+        storage,
+        open_data_envelope={"datasets": [1]},
+        reports_envelope={"reports": [2]},
+    )
+
+    pointer = json.loads(storage.download_bytes("catalog/current.json"))
+    assert pointer["version"] == result["version"]
+    assert json.loads(storage.download_bytes(pointer["paths"]["reports_catalog"])) == {"reports": [2]}
+    assert storage.object_meta(pointer["paths"]["open_data_catalog"])["cache_control"]
+    assert set(pointer["paths"]) == {
+        "open_data_catalog",
+        "reports_catalog",
+        "open_data_cards",
+        "open_data_search_index",
+    }
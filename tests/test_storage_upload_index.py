@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+import types
+import zlib
+from typing import Any
+
+from forest_pipelines.storage.batch import UploadJob
+from forest_pipelines.storage.supabase_storage import SupabaseStorage
+from forest_pipelines.storage.upload_index import UploadIndex, sha256_bytes
+
+
+class FakeBucket:
+    def __init__(self) -> None:
+        self.uploads: list[tuple[str, dict[str, Any]]] = []
+        self.remote_meta: dict[str, dict[str, Any]] = {}
+
+    def upload(self, file: Any, path: str, file_options: dict[str, Any]) -> dict[str, str]:
+        self.uploads.append((path, file_options))
+        self.remote_meta[path] = dict(file_options.get("metadata") or {})
+        return {"Key": path}
+
+    def info(self, path: str) -> dict[str, Any]:
+        return {"metadata": self.remote_meta.get(path, {})}
+
+
+class FakeClient:
+    def __init__(self, bucket: FakeBucket) -> None:
+        self.bucket = bucket
+        self.storage = self
+
+    def from_(self, _name: str) -> FakeBucket:
+        return self.bucket
+
+
+def _storage(tmp_path, **kwargs: Any) -> tuple[SupabaseStorage, FakeBucket]:
+    bucket = FakeBucket()
+    storage = SupabaseStorage(
+        supabase_url="https://example.test/",
+        service_role_key="secret",
+        upload_index=UploadIndex(tmp_path / "index.json"),
+        **kwargs,
+    )
+    storage.__dict__["client"] = FakeClient(bucket)
+    return storage, bucket
+
+
+def test_identical_bytes_are_uploaded_once(tmp_path) -> None:
+    storage, bucket = _storage(tmp_path)
+
+    storage.upload_bytes("a/manifest.json", b'{"a":1}', "application/json")
+    storage.upload_bytes("a/manifest.json", b'{"a":1}', "application/json")
+    storage.upload_bytes("a/manifest.json", b'{"a":2}', "application/json")
+
+    assert [path for path, _ in bucket.uploads] == ["a/manifest.json", "a/manifest.json"]
+    assert bucket.uploads[0][1]["metadata"] == {"sha256": sha256_bytes(b'{"a":1}')}
+    assert storage.upload_stats == {"written": 2, "skipped": 1}
+
+
+def test_index_persists_across_instances(tmp_path) -> None:
+    first, _ = _storage(tmp_path)
+    first.upload_bytes("a/x.json", b"{}", "application/json")
+
+    second, bucket = _storage(tmp_path)
+    second.upload_bytes("a/x.json", b"{}", "application/json")
+
+    assert bucket.uploads == []
+    assert second.upload_stats["skipped"] == 1
+
+
+def test_remote_verification_reuploads_when_metadata_differs(tmp_path) -> None:
+    storage, bucket = _storage(tmp_path, verify_remote_hash=True)
+    storage.upload_bytes("a/x.json", b"{}", "application/json")
+    bucket.remote_meta["a/x.json"] = {"sha256": "someone-else"}
+
+    storage.upload_bytes("a/x.json", b"{}", "application/json")
+
+    assert len(bucket.uploads) == 2
+    assert storage.upload_stats == {"written": 2, "skipped": 0}
+
+
+def test_batched_uploads_write_the_index_once_per_flush(tmp_path, monkeypatch) -> None:
+    storage, _ = _storage(tmp_path)
+    storage.upload_index.flush_every = 3
+    saves: list[int] = []
+    original = UploadIndex._save_locked
+    monkeypatch.setattr(
+        UploadIndex, "_save_locked", lambda self, entries: (saves.append(len(entries)), original(self, entries))
+    )
+
+    result = storage.upload_many(
+        [UploadJob(object_path=f"a/{i}.json", data=b"{%d}" % i, content_type="application/json") for i in range(7)],
+        max_workers=4,
+    )
+
+    assert result.ok
+    #2 flushes pelo limite (3 e 6 entradas) + 1 no fim do lote
+    assert saves == [3, 6, 7]
+    assert len(UploadIndex(tmp_path / "index.json").get("a/6.json") or "") == 64
+
+
+def test_download_decodes_brotli_using_the_recorded_encoding(tmp_path, monkeypatch) -> None:
+    #stand-in do pacote opcional brotli
+    fake_brotli = types.SimpleNamespace(
+        compress=lambda data, quality=11: b"\x8b" + zlib.compress(data),
+        decompress=lambda data: zlib.decompress(data[1:]),
+    )
+    monkeypatch.setitem(sys.modules, "brotli", fake_brotli)
+    storage, bucket = _storage(tmp_path)
+    stored: dict[str, bytes] = {}
+    bucket.download = stored.__getitem__
+    data = fake_brotli.compress(b'{"revision":3}')
+    stored["a/manifest.json"] = data
+
+    storage.upload_bytes("a/manifest.json", data, "application/json", content_encoding="br")
+
+    assert bucket.uploads[0][1]["metadata"]["content_encoding"] == "br"
+    storage.download_cache = None
+    assert storage.download_bytes("a/manifest.json") == b'{"revision":3}'